@@ -0,0 +1,110 @@
+# ==========================================
+#  시군구 여러 곳 단계 일괄 실행 (시군구별 작업 폴더 분리)
+# ==========================================
+
+# [목적]
+# - districts/<코드>.toml 이 있는 시군구마다 같은 단계 스크립트(44250 폴더)를 실행
+#   (시군 추가 = 설정 파일 + <work_dir>/1.data/in 원본, 스크립트 복사 없음)
+# - 시군구끼리는 서로 독립 → 프로세스 풀로 동시 실행, 시군구 안에서는 기존처럼 변경된 단계만
+# - 출력·상태 파일·로그는 시군구 작업 폴더(<work_dir>/1.data/out)에만 기록 → 서로 섞이지 않음
+
+# [출력 파일]  (시군구마다)
+# - <work_dir>/1.data/out/...                 : 단계 출력 (0.파이프라인_실행과 같음)
+# - <work_dir>/1.data/out/.pipeline_state.json : 단계별 지문/파일 해시
+# - <work_dir>/1.data/out/log/_pipeline.log    : 시군구 실행 요약 (콘솔에는 시군구별 결과만)
+# - <work_dir>/1.data/out/log/<단계>.log       : 단계별 실행 로그
+
+# [실행 방법]
+# > python 0.시군구_일괄실행.py                         # 설정 파일이 있는 전체 시군구
+# > python 0.시군구_일괄실행.py 44200 44250 --dry-run
+# > python 0.시군구_일괄실행.py --stage 9 --force       # DB 적재 포함, 모두 다시 실행
+# > python 0.시군구_일괄실행.py --low-memory            # 메모리 절감 모드 (단계 로그에 최대 메모리)
+#   * --districts-jobs: 동시 실행 시군구 수 (기본 2), --jobs: 시군구 안 동시 실행 단계 수 (기본 2)
+
+# [주의]
+# - 8/9 DB 적재는 시군구와 무관하게 같은 DB(LANDMOVE_DB_URL 또는 MySQL landmove)·테이블을 덮어씀
+#   → --stage 8 9 는 시군구를 하나씩 지정해 실행
+
+import os
+import sys
+import time
+import argparse
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))  # land_data (공통 모듈)
+from landmove.pipeline import run_pipeline
+from landmove.district import SCRIPT_DIR, load_district, list_districts, district_stages
+from landmove.memory import ENV_VAR as MEMORY_ENV
+
+
+def run_district(code: str, period, targets, jobs, force, dry_run) -> tuple[str, bool, float]:
+    """시군구 하나 실행 (작업 프로세스). 진행 출력은 작업 폴더 log/_pipeline.log 로"""
+    t0 = time.perf_counter()
+    d = load_district(code)
+    log_path = d.out_dir / "log" / "_pipeline.log"
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_path, "w", encoding="utf-8") as log, contextlib.redirect_stdout(log):
+        print(f"[INFO] 시군구: {d.code} {d.name} (작업 폴더: {d.work_dir})")
+        ok = run_pipeline(
+            district_stages(d, period), d.work_dir,
+            targets=targets, jobs=jobs, force=force, dry_run=dry_run,
+            script_dir=SCRIPT_DIR, env=d.env(),
+        )
+    return code, ok, time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser(description="시군구 여러 곳 단계 일괄 실행")
+    ap.add_argument("districts", nargs="*", help="시군구 코드 (기본: districts/*.toml 전체)")
+    ap.add_argument("--stage", nargs="*", default=[], help="실행할 단계명 (기본: 8/9 제외 전체)")
+    ap.add_argument("--start", default=None, help="3단계 시작일(YYYYMMDD, 기본: 시군구 설정)")
+    ap.add_argument("--end", default=None, help="3단계 종료일(YYYYMMDD, 기본: 시군구 설정)")
+    ap.add_argument("--districts-jobs", type=int, default=2, help="동시 실행 시군구 수")
+    ap.add_argument("--jobs", type=int, default=2, help="시군구 안 동시 실행 단계 수")
+    ap.add_argument("--force", action="store_true", help="변경 여부와 무관하게 모두 실행")
+    ap.add_argument("--dry-run", action="store_true", help="실행하지 않고 실행 예정 단계만 출력(로그에 기록)")
+    ap.add_argument("--low-memory", action="store_true", help="메모리 절감 모드로 단계 실행 (범주형/Arrow 문자열)")
+    args = ap.parse_args()
+    if args.low_memory:
+        os.environ[MEMORY_ENV] = "1"  # 단계 프로세스가 물려받음 (landmove.memory)
+
+    codes = args.districts or list_districts()
+    if not codes:
+        print("[WARN] 시군구 설정 파일이 없습니다: districts/*.toml")
+        sys.exit(1)
+    for code in codes:
+        load_district(code)  # 설정 오류는 시작 전에
+    if (args.start is None) != (args.end is None):
+        ap.error("--start 와 --end 는 함께 지정하세요.")
+    period = (args.start, args.end) if args.start else None
+
+    print(f"[INFO] 시군구 {len(codes)}곳: {', '.join(codes)} (동시 {args.districts_jobs})")
+    t0 = time.perf_counter()
+    failed = []
+    with ProcessPoolExecutor(max_workers=max(1, args.districts_jobs)) as pool:
+        futs = {
+            pool.submit(run_district, code, period, args.stage, args.jobs, args.force, args.dry_run): code
+            for code in codes
+        }
+        for fut in as_completed(futs):
+            code = futs[fut]
+            log_path = load_district(code).out_dir / "log" / "_pipeline.log"
+            try:
+                _, ok, sec = fut.result()
+            except Exception as e:
+                ok, sec = False, 0.0
+                print(f"[오류] {code}: {e}")
+            if ok:
+                print(f"[OK] {code}: {sec:.1f}s (로그: {log_path})")
+            else:
+                failed.append(code)
+                print(f"[실패] {code}: 로그 확인 → {log_path}")
+
+    print(f"[INFO] 완료: 성공 {len(codes) - len(failed)} / 실패 {len(failed)} ({time.perf_counter() - t0:.1f}s)")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,17 @@
 ==========================================
 
 [목적]
-- 세 개의 CSV 파일을 로드하여 병합
-- 필지코드(19자리) 생성
+- 1.data/in 의 추출본 CSV(월/반기별)를 찾아 프로세스 풀에서 동시에 로드, 한 번에 병합
+  (행마다 원본파일 = 추출본 파일명 → 3_중복데이터제거에서 최신 추출본 우선)
+- 필지코드(19자리) 생성 (필수 컬럼은 원본 레이아웃 등록부 landmove.layout 으로 확인,
+  정제 후 삭제할 컬럼은 처음부터 읽지 않음)
 - 지목, 소유구분, 이동종목 등의 값 정제
 - 지정한 기간(20240102~20250630) 기준으로 기간내/기간외 자료 분리
+  (정제 결과는 정리일자 연월 파티션으로 저장 → 원본이 그대로면 기간만 바꿔 재실행 시 CSV 재정제 없이
+   해당 연월 파티션만 읽음)
 - 모든 셀을 텍스트 서식으로 지정한 Excel 파일로 저장
 
-[입력 파일]-경로지정
+[입력 파일]-시군구 설정(districts/44200.toml [inputs] move) 또는 --pattern / --since / --until
 ./1.data/in/토지이동정리현황(소유권포함)(2024_01).csv
 ./1.data/in/토지이동정리현황(소유권포함)(2024_07).csv
 ./1.data/in/토지이동정리현황(소유권포함)(2025_01).csv
@@ -18,155 +22,133 @@
 [출력 파일]-경로지정
 ./1.data/out/20240102_20250630_이동정리현황_기간내.xlsx
 ./1.data/out/20240102_20250630_이동정리현황_기간외.xlsx
+./1.data/out/44200_이동정리현황.parts/ (정리일자 연월 파티션)
 
 [실행 방법]
 터미널에서 실행:
     python 1_pnu코드정제.py
+    python 1_pnu코드정제.py --since 202401 --until 202512 --jobs 4   # 추출 시점(파일명 YYYY_MM) 범위
+    python 1_pnu코드정제.py --pattern "토지이동정리현황*(20*).csv"
+  * 시군구 코드·기간·삭제 컬럼·이동종목 코드는 districts/44200.toml (실행 폴더 무관)
 
 """
 
+import sys
+import argparse
 from pathlib import Path
-import re
 import pandas as pd
-from openpyxl import Workbook
-from openpyxl.utils.dataframe import dataframe_to_rows
-from openpyxl.styles import numbers
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # land_data (공통 모듈)
+from landmove.normalize import make_pnu, code_only, code2, map_codes
+from landmove.ingest import discover_extracts, read_csv_many
+from landmove.store import save_table
+from landmove.partition import pq, source_sig, is_current, write_partitions, read_period, split_frame
+from landmove.district import current
+from landmove.layout import resolve, source_columns, usecols_without, MOVE
+from landmove.memory import compact, track
 
 # -----------------------------
 # 경로/입출력 설정
 # -----------------------------
-BASE = Path("./1.data/in").resolve()
-IN_FILES = [
-    BASE / "토지이동정리현황(소유권포함)(2024_01).csv",
-    BASE / "토지이동정리현황(소유권포함)(2024_07).csv",
-    BASE / "토지이동정리현황(소유권포함)(2025_01).csv",
-]
-OUT_DIR = BASE / "../out"
+D = current("44200")  # 시군구 설정 (LANDMOVE_DISTRICT 가 있으면 그 설정)
+IN_PATTERN = D.inputs.get("move", "토지이동정리현황(소유권포함)(*).csv")  # 1.data/in 기준 glob
+OUT_DIR = D.out_dir
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 # 시군구코드
-DISTRICT_CODE = "44200"
+DISTRICT_CODE = D.code
 #기간
-DATE_START = "20240102"
-DATE_END   = "20250630"
+DATE_START, DATE_END = D.period
 PERIOD_TAG = f"{DATE_START}_{DATE_END}"
 
 OUT_IN   = OUT_DIR / f"{DISTRICT_CODE}_기간내_자료.xlsx"
 OUT_OUT  = OUT_DIR / f"{DISTRICT_CODE}_기간외_자료.xlsx"
+PARTS    = OUT_DIR / f"{DISTRICT_CODE}_이동정리현황.parts"  # 정제 결과 정리일자 연월 파티션 (landmove.partition)
+DATE_COL = "정리일자"
 
-# 필수 컬럼
-REQUIRED_COLS = [
+# 필수 컬럼 (landmove.layout 표준명)
+REQUIRED_FIELDS = [
     "지역코드", "대장구분",
     "이동전_지번", "이동후_지번",
     "이동전_지목", "이동후_지목",
-    "현재_소유구분",
-    "토지이동종목",
-    "정리일자",
+    "소유구분",
+    "이동종목",
+    "이동일자",
 ]
 
-# 삭제 대상
-DROP_COLS = [
-    "일련번호", "지역코드", "대장구분", "이동전_지번", "이동후_지번",
-    "신청_소유구분", "신청_소유자명", "신청_소유자주소",
-    "공시지가", "공시지가_수시", "전년지가", "전년지가_수시",
-    "2년전지가", "2년전지가_수시", "3년전지가", "3년전지가_수시",
-    "4년전지가", "4년전지가_수시",
-]
-
-MOVE_MAP = {
-    "분할(임야대장)": "20",
-    "분할(토지대장)": "20",
-    "합병(토지대장)": "30",
-    "지목변경(토지대장)": "40",
-    "등록사항정정(토지대장)": "10",
-}
+# 삭제 대상 / 토지이동종목 → 코드 (시군구 설정 [move] drop_cols / [move_codes])
+DROP_COLS = D.drop_cols
+MOVE_MAP = D.move_codes
 
 # -----------------------------
 # 유틸
 # -----------------------------
-def digits_only(s: str) -> str:
-    return re.sub(r"\D", "", "" if s is None else str(s)) #숫자만추출(이동전_지목, 이동후_지목, 현재_소유구분)
-
-def norm_date8(s: str) -> str:  #날짜 8자리
-    ss = digits_only(s)
-    return ss if len(ss) == 8 else ""
-
-def make_pnu(region: str, ledger: str, jibun: str) -> str: #PNU 19자리 생성
-    reg = digits_only(region).zfill(10)
-    led = ("" if ledger is None else str(ledger))[:1]
-    jbn = digits_only(jibun).zfill(8)
-    return reg + led + jbn
-
-def to2digits(s: str) -> str: #현재_소유구분(숫자코드 2자리)
-    )    d = digits_only(s)
-    return d.zfill(2)[-2:] if d else ""
-
 def save_excel(df: pd.DataFrame, path: Path, sheetname="Sheet1"):
-    wb = Workbook()
-    ws = wb.active
-    ws.title = sheetname
-    for row in dataframe_to_rows(df, index=False, header=True):
-        ws.append(row)
-    for r in ws.iter_rows(min_row=1, max_row=ws.max_row, min_col=1, max_col=ws.max_column):
-        for cell in r:
-            cell.number_format = numbers.FORMAT_TEXT
-    for col_cells in ws.columns:
-        col_letter = col_cells[0].column_letter
-        width = max(10, min(80, max(len(str(c.value)) if c.value else 0 for c in col_cells) + 2))
-        ws.column_dimensions[col_letter].width = width
-    wb.save(path)
+    save_table(df, path, sheet_name=sheetname)  # xlsx + 다음 단계용 .parquet
     print(f"[OK] 저장 완료: {path}")
 
-# -----------------------------
-# 1) CSV 로딩/병합
-# -----------------------------
-def read_csv_keep_strings(path: Path) -> pd.DataFrame:
-    for enc in ("utf-8"):
-        try:
-            return pd.read_csv(path, dtype=str, encoding=enc)
-        except Exception:
-            continue
-    raise RuntimeError(f"CSV 인코딩 실패: {path}")
-
-dfs = [read_csv_keep_strings(p) for p in IN_FILES]
-df = pd.concat(dfs, ignore_index=True)
-
-# -----------------------------
-# 2) 컬럼 검증
-# -----------------------------
-missing = [c for c in REQUIRED_COLS if c not in df.columns]
-if missing:
-    raise ValueError(f"필수 컬럼이 없습니다: {missing}")
-
-# -----------------------------
-# 3) 정제
-# -----------------------------
-df["이동전_필지코드"] = df.apply(lambda r: make_pnu(r["지역코드"], r["대장구분"], r["이동전_지번"]), axis=1)
-df["이동후_필지코드"] = df.apply(lambda r: make_pnu(r["지역코드"], r["대장구분"], r["이동후_지번"]), axis=1)
-df["이동전_지목"] = df["이동전_지목"].map(to2digits)
-df["이동후_지목"] = df["이동후_지목"].map(to2digits)
-df["현재_소유구분"] = df["현재_소유구분"].map(lambda s: digits_only(s).lstrip("0") if s else "")
-df["토지이동종목"] = df["토지이동종목"].map(lambda s: MOVE_MAP.get(str(s).strip(), digits_only(str(s)) or "")).astype(str)
-
-df["_DATE8_"] = df["정리일자"].map(norm_date8)
-df_in  = df[(df["_DATE8_"] >= DATE_START) & (df["_DATE8_"] <= DATE_END)].copy()
-df_out = df.drop(df_in.index).copy()
-df_in.drop(columns=["_DATE8_"], inplace=True)
-df_out.drop(columns=["_DATE8_"], inplace=True)
-
-drop_now = [c for c in DROP_COLS if c in df.columns]
-df_in.drop(columns=drop_now, inplace=True, errors="ignore")
-df_out.drop(columns=drop_now, inplace=True, errors="ignore")
-
-front = ["이동전_필지코드", "이동후_필지코드"]
-df_in  = df_in.reindex(columns=front + [c for c in df_in.columns if c not in front])
-df_out = df_out.reindex(columns=front + [c for c in df_out.columns if c not in front])
-
-for c in df_in.columns:  df_in[c]  = df_in[c].astype(str)
-for c in df_out.columns: df_out[c] = df_out[c].astype(str)
-
-# -----------------------------
-# 4) 저장
-# -----------------------------
-save_excel(df_in, OUT_IN,  "44200_240101-250631_기간내_자료.xlsx")
-save_excel(df_out, OUT_OUT, "44200_240101-250631_기간외_자료.xlsx")
+def clean_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    3) 정제: 필지코드 생성, 지목/소유구분/이동종목 코드화, 삭제 컬럼 제거, 텍스트화
+    """
+    df["이동전_필지코드"] = make_pnu(df["지역코드"], df["대장구분"], df["이동전_지번"]) #PNU 19자리 생성
+    df["이동후_필지코드"] = make_pnu(df["지역코드"], df["대장구분"], df["이동후_지번"])
+    df["이동전_지목"] = code2(df["이동전_지목"]) #지목(숫자코드 2자리)
+    df["이동후_지목"] = code2(df["이동후_지목"])
+    df["현재_소유구분"] = code_only(df["현재_소유구분"]).str.lstrip("0")
+    df["토지이동종목"] = map_codes(df["토지이동종목"], MOVE_MAP)
+
+    df = df.drop(columns=[c for c in DROP_COLS if c in df.columns])
+    front = ["이동전_필지코드", "이동후_필지코드"]
+    df = df.reindex(columns=front + [c for c in df.columns if c not in front])
+    df = df.fillna("nan")  # 결측 → "nan" 텍스트 (값별 astype(str) 과 같은 결과, Arrow 문자열은 형식 유지)
+    return df
+
+def main():
+    ap = argparse.ArgumentParser(description="토지이동정리현황 CSV 정제 (추출본 여러 개)")
+    ap.add_argument("--pattern", default=IN_PATTERN, help="1.data/in 기준 추출본 glob")
+    ap.add_argument("--since", default=None, help="추출 시점 시작(YYYYMM, 파일명 태그 기준)")
+    ap.add_argument("--until", default=None, help="추출 시점 종료(YYYYMM)")
+    ap.add_argument("--jobs", type=int, default=None, help="동시 파싱 프로세스 수 (기본: CPU 수)")
+    ap.add_argument("--rebuild", action="store_true", help="정제 파티션을 무시하고 CSV부터 다시 정제")
+    args = ap.parse_args()
+    track()  # 종료 시 최대 메모리 출력 (LANDMOVE_MEMORY=1 이면 절감 모드)
+
+    # -----------------------------
+    # 1) CSV 로딩/병합 (원본·설정·스크립트가 그대로면 정제된 연월 파티션 재사용)
+    # -----------------------------
+    in_files = discover_extracts(D.in_dir, args.pattern, args.since, args.until)
+    if not in_files:
+        raise FileNotFoundError(f"원본 CSV가 없습니다: {D.in_dir / args.pattern} (since={args.since}, until={args.until})")
+    for p in in_files:
+        print(f"[INFO] 입력: {p.name}")
+        resolve(source_columns(p), MOVE).require(*REQUIRED_FIELDS)  # 2) 컬럼 검증 (머리행만)
+    sig = source_sig([*in_files, *D.config_files, Path(__file__)])
+
+    if pq is not None and not args.rebuild and is_current(PARTS, sig, DATE_COL):
+        print(f"[INFO] 정제 파티션 최신 → CSV 로딩/정제 생략 ({PARTS.name})")
+    else:
+        skip = set(DROP_COLS) - {MOVE.fields[f][0] for f in REQUIRED_FIELDS}  # 정제에 쓰고 지울 컬럼은 읽음
+        df = read_csv_many(in_files, jobs=args.jobs, usecols=usecols_without(in_files, skip))
+        df = compact(clean_frame(df), label="정제 결과")  # + 원본파일 컬럼, 추출 시점 순
+        if pq is None:  # pyarrow 미설치: 파티션 없이 바로 분리
+            df_in, df_out = split_frame(df, DATE_COL, DATE_START, DATE_END, strict=True)
+        else:
+            write_partitions(df, DATE_COL, PARTS, sig, strict=True)
+            del df
+
+    # -----------------------------
+    # 4) 기간내/기간외 분리: 기간 연월 파티션만 통째로, 경계 월은 이진 탐색
+    # -----------------------------
+    if pq is not None:
+        df_in, df_out, _ = read_period(PARTS, DATE_START, DATE_END)
+
+    # -----------------------------
+    # 5) 저장
+    # -----------------------------
+    save_excel(df_in, OUT_IN,  "44200_240101-250631_기간내_자료.xlsx")
+    save_excel(df_out, OUT_OUT, "44200_240101-250631_기간외_자료.xlsx")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,8 @@
   1) 토지이동연혁 관련 컬럼만 분리 저장
   2) 소유자변경이력 관련 컬럼만 분리 저장
 - 선행 0(문자열) 보존
+- 두 결과에 쓰는 컬럼만 읽음 (레이아웃 등록부 landmove.layout 표준명 → 실제 헤더, 나머지 컬럼은 읽지 않음)
+- 원본파일(추출본 파일명, 1_pnu코드정제) 컬럼은 두 결과에 모두 유지 → 3_중복데이터제거에서 사용
 
 [입력 파일]
 - ./1.data/out/44200_기간내_자료.xlsx
@@ -21,40 +23,47 @@
     python 2_이동연혁_소유분리.py
 """
 
+import sys
 from pathlib import Path
-import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # land_data (공통 모듈)
+from landmove.store import save_table, table_columns
+from landmove.district import current
+from landmove.layout import resolve, read_source
+from landmove.memory import compact, track
+
 #---------------------------------------------------
 # 경로
 #---------------------------------------------------
 
 # 입력/출력 경로
-INFILE = Path("./1.data/out/44200_기간내_자료.xlsx")  # 필요에 맞게 수정
-OUT1   = Path("./1.data/out/44200_20240102-20250630_토지이동연혁.xlsx")
-OUT2   = Path("./1.data/out/44200_24010102-20250630_소유자변경이력.xlsx")
-OUT1.parent.mkdir(parents=True, exist_ok=True)
-
-# 시군구
-DISTRICT_CODE = "44200"
+# 시군구 (설정: districts/44200.toml, 실행 폴더 무관)
+D = current("44200")
+track()  # 종료 시 최대 메모리 출력
+DISTRICT_CODE = D.code
 
-# 1) 로드: 모든 값을 문자열로 불러와 선행 0 보존
-df = pd.read_excel(INFILE, dtype=str)
+INFILE = D.out_dir / f"{DISTRICT_CODE}_기간내_자료.xlsx"
+OUT1   = D.out_dir / f"{DISTRICT_CODE}_20240102-20250630_토지이동연혁.xlsx"
+OUT2   = D.out_dir / f"{DISTRICT_CODE}_24010102-20250630_소유자변경이력.xlsx"
+OUT1.parent.mkdir(parents=True, exist_ok=True)
 
-# 2) 컬럼 선택 (파일에 실제 존재하는 컬럼만 교집합으로 안전하게 선택)
-cols_set_1 = [
-    "이동전_필지코드","이동후_필지코드","토지이동종목","정리일자","신청구분","행정구역명",
-    "이동전_지목","이동전_면적","이동후_지목","이동후_면적","이동전지번수","이동후지번수"
+# 1) 컬럼 선택: 표준명(landmove.layout) → 파일에 실제 존재하는 헤더만
+fields_1 = [
+    "이동전_필지코드","이동후_필지코드","이동종목","이동일자","신청구분","행정구역명",
+    "이동전_지목","이동전_면적","이동후_지목","이동후_면적","이동전지번수","이동후지번수", "원본파일"
 ]
-cols_set_2 = ["현재_소유구분","현재_소유자명","현재_소유자주소"]
+fields_2 = ["소유구분","소유자명","소유자주소", "원본파일"]
+
+lay = resolve(table_columns(INFILE))
+pick1 = [c for c in map(lay.col, fields_1) if c]
+pick2 = [c for c in map(lay.col, fields_2) if c]
 
-pick1 = [c for c in cols_set_1 if c in df.columns]
-pick2 = [c for c in cols_set_2 if c in df.columns]
+# 2) 로드: 필요한 컬럼만, 모든 값을 문자열로 불러와 선행 0 보존 (.parquet 우선)
+df = compact(read_source(INFILE, fields_1 + fields_2), label=INFILE.name)
 
 df1 = df[pick1].copy()
 df2 = df[pick2].copy()
 
-# 3) 저장: pandas → openpyxl 엔진 (dtype=str로 로드했으므로 선행 0 그대로 보존)
-with pd.ExcelWriter(OUT1, engine="openpyxl") as w:
-    df1.to_excel(w, sheet_name="토지이동연혁", index=False)
-
-with pd.ExcelWriter(OUT2, engine="openpyxl") as w:
-    df2.to_excel(w, sheet_name="소유자변경이력", index=False)
+# 3) 저장: 텍스트 서식 xlsx + 다음 단계용 .parquet (선행 0 그대로 보존)
+save_table(df1, OUT1, sheet_name="토지이동연혁")
+save_table(df2, OUT2, sheet_name="소유자변경이력")
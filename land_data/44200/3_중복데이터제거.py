@@ -2,6 +2,9 @@
 토지이동연혁 / 소유자변경이력 엑셀 → 중복 제거 후 별도 저장
 - 파일명에서 행정구역(5자리)과 기간(YYMMDD-YYMMDD) 자동 추출 및 보정
 - 전체 셀 TEXT 서식으로 저장 (선행 0 보존)
+- 원본파일(추출본 파일명) 컬럼은 비교에서 빼고, 같은 행이 여러 추출본에 있으면 최신 추출본(뒤쪽) 행을 남김
+- 행 지문(64비트) 스트리밍 비교 → 자료가 메모리보다 커도 처리 (landmove.dedupe, 넘치면 디스크 분할)
+- 원본파일별 중복 건수 출력
 
 입력(예시):
   ./1.data/out/44200_20240102-20250630_토지이동연혁.xlsx
@@ -13,22 +16,29 @@
 
 실행:
   python 3. 중복데이터제거.py
+  python 3. 중복데이터제거.py --key 이동전_필지코드 이동후_필지코드 정리일자 --mem-rows 2000000
 """
 
+import sys
+import argparse
 from pathlib import Path
 import re
-import pandas as pd
-from openpyxl import Workbook
-from openpyxl.utils.dataframe import dataframe_to_rows
-from openpyxl.styles import numbers
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # land_data (공통 모듈)
+from landmove.store import save_table
+from landmove.dedupe import dedupe_table, MAX_ROWS, BATCH_ROWS
+from landmove.district import current
+from landmove.ingest import SOURCE_COL
+from landmove.memory import track
 
 # -----------------------------
 # 사용자 입력 경로
 # -----------------------------
-BASE = Path("./1.data/out").resolve()
+D = current("44200")  # 시군구 설정 (실행 폴더 무관)
+BASE = D.out_dir
 
-SRC_CORE  = BASE / "44200_20240102-20250630_토지이동연혁.xlsx"
-SRC_OWNER = BASE / "44200_24010102-20250630_소유자변경이력.xlsx"
+SRC_CORE  = BASE / f"{D.code}_20240102-20250630_토지이동연혁.xlsx"
+SRC_OWNER = BASE / f"{D.code}_24010102-20250630_소유자변경이력.xlsx"
 
 OUT_DIR = BASE
 OUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -73,56 +83,34 @@ def extract_code5_and_period(p: Path) -> tuple[str, str]:
     return code5, period
 
 # -----------------------------
-# 저장 유틸(모든 셀 TEXT)
-# -----------------------------
-def save_excel_text(df: pd.DataFrame, path: Path, sheetname="Sheet1"):
-    # 문자열화 + 좌우 공백 제거(중복 판단 정교화)
-    for c in df.columns:
-        df[c] = df[c].astype(str).str.strip()
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = sheetname
-
-    for row in dataframe_to_rows(df, index=False, header=True):
-        ws.append(row)
-
-    # 전체 셀 텍스트 서식
-    for r in ws.iter_rows(min_row=1, max_row=ws.max_row,
-                          min_col=1, max_col=ws.max_column):
-        for cell in r:
-            cell.number_format = numbers.FORMAT_TEXT
-
-    # 간단 열 너비 조정
-    for col_cells in ws.columns:
-        letter = col_cells[0].column_letter
-        width = max(10, min(80, max(len(str(c.value)) if c.value else 0 for c in col_cells) + 2))
-        ws.column_dimensions[letter].width = width
-
-    path.parent.mkdir(parents=True, exist_ok=True)
-    wb.save(path)
-    print(f"[OK] 저장 완료: {path}")
-
-# -----------------------------
-# 1) 토지이동연혁: 중복 제거 저장
-# -----------------------------
-df_core = pd.read_excel(SRC_CORE, dtype=str)
-for c in df_core.columns:
-    df_core[c] = df_core[c].astype(str).str.strip()
-df_core = df_core.drop_duplicates(keep="first").reset_index(drop=True)
-
-code5_core, period_core = extract_code5_and_period(SRC_CORE)
-out_core = OUT_DIR / f"{code5_core}_{period_core}_토지이동연혁_중복제거.xlsx"
-save_excel_text(df_core, out_core, sheetname="토지이동연혁")
-
-# -----------------------------
-# 2) 소유자변경이력: 중복 제거 저장
+# 중복 제거 저장: 지문 스트리밍(landmove.dedupe) → 청크 단위 TEXT 저장
 # -----------------------------
-df_owner = pd.read_excel(SRC_OWNER, dtype=str)
-for c in df_owner.columns:
-    df_owner[c] = df_owner[c].astype(str).str.strip()
-df_owner = df_owner.drop_duplicates(keep="first").reset_index(drop=True)
-
-code5_owner, period_owner = extract_code5_and_period(SRC_OWNER)
-out_owner = OUT_DIR / f"{code5_owner}_{period_owner}_소유자변경이력_중복제거.xlsx"
-save_excel_text(df_owner, out_owner, sheetname="소유자변경이력")
+def dedupe_save(src: Path, kind: str, args):
+    """src 중복 제거 → <code5>_<기간>_<kind>_중복제거.xlsx (+ .parquet)"""
+    res = dedupe_table(src, key_cols=args.key, keep=args.keep, tag_col=SOURCE_COL,
+                       max_rows=args.mem_rows, batch_rows=args.batch_rows)
+    code5, period = extract_code5_and_period(src)
+    out = OUT_DIR / f"{code5}_{period}_{kind}_중복제거.xlsx"
+    save_table(res.rows(), out, sheet_name=kind)
+    print(f"[INFO] {kind}: {res.n_rows:,}행 → {res.n_kept:,}행 (중복 {res.n_dup:,}행)")
+    for tag, cnt in res.dup_by_source.items():
+        print(f"  - {tag}: 중복 {cnt:,}행")
+    print(f"[OK] 저장 완료: {out}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="토지이동연혁 / 소유자변경이력 중복 제거")
+    ap.add_argument("--key", nargs="+", default=None, help="비교 컬럼 (기본: 원본파일을 뺀 전체)")
+    ap.add_argument("--keep", choices=["first", "last"], default="last",
+                    help="같은 행 중 유지할 행 (last: 최신 추출본, 기본)")
+    ap.add_argument("--mem-rows", type=int, default=MAX_ROWS, help="메모리에 둘 행 지문 수 (넘으면 디스크 분할)")
+    ap.add_argument("--batch-rows", type=int, default=BATCH_ROWS, help="한 번에 읽을 행 수")
+    args = ap.parse_args()
+    track()  # 종료 시 최대 메모리 출력 (배치 단위 처리)
+
+    dedupe_save(SRC_CORE, "토지이동연혁", args)     # 1) 토지이동연혁
+    dedupe_save(SRC_OWNER, "소유자변경이력", args)  # 2) 소유자변경이력
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,9 @@
 # ==============================================
 
 # [목적]
-# - 이동정리현황.xlsx 파일에서 '토지이동종목' 기준으로 특정 종목만 필터링
-# - 매핑된 코드(10, 20, 30, 40)에 따라 레코드 전체를 시트별로 저장
+# - 이동정리현황.xlsx 파일을 '토지이동종목' → 코드(10, 20, 30, 40 …)로 한 번에 묶어
+#   코드별 시트로 저장, 코드표에 없는 종목은 기타(미매핑) 시트 (landmove.category)
+#   * 코드표: 공통(districts/common/move_codes.toml) + 시군구 설정 [move_codes]
 
 # [입력 파일]
 # - ./1.data/out/이동정리현황.xlsx
@@ -16,41 +17,29 @@
 # pip install pandas openpyxl
 
 
+import sys
 from pathlib import Path
-import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # land_data (공통 모듈)
+from landmove.store import read_table
+from landmove.excel import save_text_excel_sheets
+from landmove.category import split_sheets
+from landmove.district import current
 
 # -------------------- 설정 --------------------
-INPUT_FILE = Path("./1.data/out/이동정리현황_기간내.xlsx")
+INPUT_FILE = Path(__file__).resolve().parent / "1.data" / "out" / "이동정리현황_기간내.xlsx"
 OUTPUT_FILE = INPUT_FILE.parent / "이동정리현황_종목별.xlsx"
 
-# 이동종목 매핑 (문자열 → 코드)
-CATEGORY_MAP = {
-    "등록사항정정(토지대장)": "10",
-    "분할(임야대장)": "20",
-    "분할(토지대장)": "20",
-    "합병(토지대장)": "30",
-    "지목변경(토지대장)": "40",
-}
+# 이동종목 매핑 (문자열 → 코드, 공통 코드표 + 시군구 설정)
+CATEGORY_MAP = current("44250").move_codes
 
 # -------------------- 실행 --------------------
 def main():
-    # 엑셀 읽기 (모든 셀 텍스트로 처리)
-    df = pd.read_excel(INPUT_FILE, dtype=str)
-
-    # 엑셀 저장 준비
-    with pd.ExcelWriter(OUTPUT_FILE, engine="openpyxl") as writer:
-        for name, code in CATEGORY_MAP.items():
-            # 조건 필터링
-            subset = df[df["토지이동종목"] == name].copy()
-            if subset.empty:
-                print(f"[건너뜀] {name} ({code}) → 레코드 없음")
-                continue
-
-            # 시트명 = 코드
-            sheet_name = f"{code}_{name[:4]}"  # 너무 길면 앞 4글자만
-            subset.to_excel(writer, sheet_name=sheet_name, index=False)
-
-            print(f"[저장됨] {name} ({code}) → {len(subset)}건")
+    # 기간내 자료 읽기 (.parquet 우선, 모든 셀 텍스트로 처리)
+    df = read_table(INPUT_FILE)
+
+    # 코드별 분할(한 번) → 시트별 스트리밍 저장
+    save_text_excel_sheets(split_sheets(df, "토지이동종목", CATEGORY_MAP), OUTPUT_FILE)
 
     print(f"\n완료! 결과 파일: {OUTPUT_FILE}")
 
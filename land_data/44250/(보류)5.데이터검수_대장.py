@@ -22,56 +22,39 @@
 # - 매칭 방식: exact(완전일치) / contains(부분일치) 중 선택 (기본 exact)
 
 # [비고]
-# - 이동사유/종목 컬럼 후보: ["이동사유","이동 사유","이동_사유","이동사유명","이동종목","이동 사유명"]
-# - PNU 컬럼 후보: ["필지코드","pnu","PNU","필지 코드"]
+# - 이동사유/종목·PNU 컬럼은 원본 레이아웃 등록부(landmove.layout)의 표준명(이동사유/이동종목, 필지코드)으로 찾음
 # - PNU 정규화: 숫자만 추출 후 19자리 zfill
 
 # [의존성]
 # - pandas, openpyxl
 
 import re
+import sys
 from pathlib import Path
 import pandas as pd
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # land_data (공통 모듈)
+from landmove.normalize import normalize_pnu
+from landmove.store import read_table
+from landmove.layout import resolve
+
 # -------------------------------
 # 경로/파일 지정
 # -------------------------------
-BASE_DIR  = Path("./1.data/out")
+BASE_DIR  = Path(__file__).resolve().parent / "1.data" / "out"
 SRC_FILE  = BASE_DIR / "토지(임야)기본_기간내.xlsx"
 SAVE_DIR  = BASE_DIR / "find"
 SAVE_DIR.mkdir(parents=True, exist_ok=True)
 
-# 컬럼명 후보
-REASON_COL_CANDIDATES = [
-    "이동사유", "이동 사유", "이동_사유", "이동사유명", "이동종목", "이동 사유명"
-]
-PNU_COL_CANDIDATES = ["필지코드", "pnu", "PNU", "필지 코드"]
-
-def normalize_pnu(x: str) -> str:
-    if x is None:
-        return ""
-    s = re.sub(r"\D", "", str(x))
-    return s.zfill(19) if s else ""
+# 표준 컬럼명 (landmove.layout)
+REASON_FIELDS = ["이동사유", "이동종목"]
+PNU_FIELDS = ["필지코드", "이동전_필지코드", "이동후_필지코드"]
 
 def load_excel(path: Path) -> pd.DataFrame:
-    df = pd.read_excel(path, dtype=str)  # 첫 시트, 선행0 보존
+    df = read_table(path)  # .parquet 우선, 선행0 보존 (결측은 NaN 그대로)
     df.columns = [str(c).strip() for c in df.columns]
-    for c in df.columns:
-        df[c] = df[c].astype(str)
     return df
 
-def pick_column(df: pd.DataFrame, candidates: list[str]) -> str | None:
-    for c in candidates:
-        if c in df.columns:
-            return c
-    # 느슨한 매칭(공백/대소문자 무시)
-    lowered = {c.lower().replace(" ", ""): c for c in df.columns}
-    for c in candidates:
-        key = c.lower().replace(" ", "")
-        if key in lowered:
-            return lowered[key]
-    return None
-
 def filter_by_reason(df: pd.DataFrame, reason_col: str, keyword: str, mode: str) -> pd.DataFrame:
     s = df[reason_col].fillna("")
     if mode == "exact":
@@ -110,19 +93,20 @@ if __name__ == "__main__":
     # 로딩
     df = load_excel(SRC_FILE)
 
-    # 컬럼 선택
-    reason_col = pick_column(df, REASON_COL_CANDIDATES)
+    # 컬럼 선택 (헤더 → 레이아웃 → 표준명별 실제 헤더)
+    lay = resolve(df.columns)
+    reason_col = lay.col(*REASON_FIELDS)
     if reason_col is None:
-        raise RuntimeError(f"이동사유 컬럼을 찾지 못했습니다. 후보: {REASON_COL_CANDIDATES}")
+        raise RuntimeError(f"이동사유 컬럼을 찾지 못했습니다. 레이아웃: {lay.name}, 표준명: {REASON_FIELDS}")
 
-    pnu_cols_found = [c for c in PNU_COL_CANDIDATES if c in df.columns]
+    pnu_cols_found = [c for c in map(lay.col, PNU_FIELDS) if c]
 
     # 필터
     matched = filter_by_reason(df, reason_col, keyword, mode)
 
     # PNU 정규화 부가 컬럼(있을 때만)
     for pcol in pnu_cols_found:
-        matched[f"{pcol}_정규화19"] = matched[pcol].map(normalize_pnu)
+        matched[f"{pcol}_정규화19"] = normalize_pnu(matched[pcol])
 
     # 출력
     title = f"토지(임야)기본_기간내.xlsx | 기준: {reason_col} | 모드: {mode}"
@@ -0,0 +1,76 @@
+# ==========================================
+#  44250 단계 일괄 실행 (변경된 단계만)
+# ==========================================
+
+# [목적]
+# - 1~9 단계 스크립트의 입력/출력을 선언해 의존 순서대로 실행
+# - 입력 내용(sha256)·스크립트·인자(DATE_RANGE 등)가 직전 실행과 같으면 건너뜀
+#   예) 토지이동정리현황 CSV만 바뀌면 2 → 3.move → 6 만 실행 (토지대장 1, 3.land 생략)
+# - 서로 독립인 단계(1/2/3.malso …)는 동시에 실행
+
+# [단계 구성]
+# - 1       : 토지(임야)기본 CSV → 토지(임야)기본_필지코드추가
+# - 2       : 토지이동정리현황 CSV → 토지이동정리현황_필지코드추가
+# - 3.land  : 1 결과 → 토지(임야)기본_기간내
+# - 3.move  : 2 결과 → 이동정리현황_기간내
+# - 3.malso : 일반용조서(말소용) CSV → 일반용조서(말소용)_기간내
+# - 6       : 이동정리현황_기간내 → 이동정리현황_종목별
+# - 8, 9    : DB 적재 (MySQL 필요, 이름을 지정했을 때만 실행)
+#   * 4/7/10/11 은 PNU 입력이 필요한 조회용이라 대상에서 제외
+#   * 단계 구성·원본 파일명은 시군구 설정(districts/<코드>.toml, landmove.district) 기준
+#     → 원본 설정이 없는 단계는 자동 제외
+
+# [출력 파일]
+# - ./1.data/out/.pipeline_state.json : 단계별 지문/파일 해시
+# - ./1.data/out/log/<단계>.log       : 단계별 실행 로그
+
+# [실행 방법]
+# > python 0.파이프라인_실행.py                          # 변경된 단계만 실행
+# > python 0.파이프라인_실행.py --start 20250701 --end 20251231
+# > python 0.파이프라인_실행.py 6 --dry-run               # 6과 선행 단계의 실행 여부만 확인
+# > python 0.파이프라인_실행.py 9 --force                 # DB 적재 포함, 모두 다시 실행
+# > python 0.파이프라인_실행.py --district 44200          # 다른 시군구 (여러 시군구 동시: ../0.시군구_일괄실행.py)
+# > python 0.파이프라인_실행.py --low-memory --force      # 메모리 절감 모드 (LANDMOVE_MEMORY=1, landmove.memory)
+#   * 단계 로그 끝의 "[메모리] <단계>: 최대 …MB" 로 기본 모드와 비교
+
+import os
+import sys
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # land_data (공통 모듈)
+from landmove.pipeline import run_pipeline
+from landmove.district import SCRIPT_DIR, current, load_district, district_stages
+from landmove.memory import ENV_VAR as MEMORY_ENV
+
+
+def main():
+    D = current("44250")
+    ap = argparse.ArgumentParser(description="시군구 단계 일괄 실행 (변경된 단계만)")
+    ap.add_argument("targets", nargs="*", help="실행할 단계명 (기본: 8/9 제외 전체, 선행 단계 자동 포함)")
+    ap.add_argument("--district", default=None, help=f"시군구 코드 또는 설정 파일 (기본: {D.code})")
+    ap.add_argument("--start", default=None, help="3단계 시작일(YYYYMMDD, 기본: 설정 [period])")
+    ap.add_argument("--end", default=None, help="3단계 종료일(YYYYMMDD, 기본: 설정 [period])")
+    ap.add_argument("--jobs", type=int, default=None, help="동시 실행 단계 수 (기본: CPU 수)")
+    ap.add_argument("--force", action="store_true", help="변경 여부와 무관하게 모두 실행")
+    ap.add_argument("--dry-run", action="store_true", help="실행하지 않고 실행 예정 단계만 출력")
+    ap.add_argument("--low-memory", action="store_true", help="메모리 절감 모드로 단계 실행 (범주형/Arrow 문자열)")
+    args = ap.parse_args()
+    if args.low_memory:
+        os.environ[MEMORY_ENV] = "1"  # 단계 프로세스가 물려받음 (landmove.memory)
+
+    if args.district:
+        D = load_district(args.district)
+    period = (args.start or D.period[0], args.end or D.period[1])
+    print(f"[INFO] 시군구: {D.code} {D.name} (작업 폴더: {D.work_dir})")
+
+    ok = run_pipeline(
+        district_stages(D, period), D.work_dir,
+        targets=args.targets, jobs=args.jobs, force=args.force, dry_run=args.dry_run,
+        script_dir=SCRIPT_DIR, env=D.env(),
+    )
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,77 +1,84 @@
 # ====================================================================================
-#  엑셀 → MySQL 업로드(재생성) → PNU 조회 → DevExpress Diagram XML 생성(타임라인)
+#  엑셀 → DB 업로드(재생성) → PNU 조회 → DevExpress Diagram XML 생성(타임라인)
 # ====================================================================================
 
 # [목적]
 # - 엑셀(이동정리현황_기간내.xlsx)을 로드해 지정 DB/테이블에 업로드(if_exists="replace")
+#   * --upsert: 재생성 대신 자연키 + 행 내용 해시로 신규·변경 행만 기록 (landmove.upsert)
+#     --tombstone: 엑셀에 없는 행 삭제표시(deleted_at) → PNU 조회에서 제외
+#   * 적재한 원본 지문(sha256·행 수·적재 시각)을 메타 테이블(_load_meta)에 기록,
+#     원본이 그대로면 업로드 생략 (landmove.loadmeta) → PNU 여러 개 실행해도 업로드는 1회
+#   * --no-upload: 업로드 없이 조회만, --force-upload: 지문이 같아도 업로드
+#   * --sqlite / --db-url sqlite:///...: MySQL 서버 없이 로컬 SQLite(WAL) 파일 사용 (landmove.storage)
 # - 입력한 PNU(19자리)로 DB에서 이동전/이동후 필지코드 매칭 행을 정리일자 오름차순 조회
+#   * 업로드 시 타입 지정(필지코드 CHAR(19), 정리일자 CHAR(8), 면적 DECIMAL) + 필지코드/정리일자 인덱스
+#     (landmove.schema), 조회는 UNION ALL 로 이동전/이동후 인덱스를 각각 사용 (landmove.history 공통 SQL)
 # - 조회 결과를 좌→우 타임라인으로 배치한 DevExpress Diagram XML(XtraSerializer) 생성
 #   * 라벨 3행: [토지이동종목 / 현재_소유자명 / 정리일자(YYYYMMDD)] — 줄바꿈은 &#xD;&#xA;
+#   * XML은 landmove.diagram 으로 파일에 바로 기록(트리 없이, 엔티티 1회 인코딩)
 
 # [입력]
-# - 기본 엑셀 경로: ./out/이동정리현황_기간내.xlsx
-#   * 없으면 대안 경로도 탐색: ./44250/out/이동정리현황_기간내.xlsx
+# - 기본 엑셀 경로: ./1.data/out/이동정리현황_기간내.xlsx (스크립트 위치 기준)
+#   * 지정 경로가 없으면 같은 파일명을 ./1.data/out 에서 탐색
 # - DB/테이블(업로드 및 조회 대상): 인자 --db, --table 로 지정 (기본 testdb.land_move_tb)
+#   * --sqlite: ./1.data/out/landmove.sqlite 의 --table 테이블 (--db 무시)
 
 # [출력]
-# - XML 파일: ./out/xml/diagram_<PNU>_<YYYYMMDD_HHMMSS>.xml
-# - 페이지/도형 배치 상수: PAGE_W/H, JIBUN_W/H, LABEL_W/H, ARROW_W, ROW_Y, START_X, LABEL_OFFSET_X
+# - XML 파일: ./1.data/out/xml/diagram_<PNU>_<YYYYMMDD_HHMMSS>.xml
+# - 페이지/도형 배치 상수: landmove.diagram 의 PAGE_W/H, JIBUN_W/H, LABEL_W/H, ARROW_W, ROW_Y, START_X, LABEL_OFFSET_X
 
 # [실행 방법]
 # > python <이파일이름>.py --pnu 4425031524100010003 \
-#     --excel ./out/이동정리현황_기간내.xlsx \
+#     --excel ./1.data/out/이동정리현황_기간내.xlsx \
 #     --host 127.0.0.1 --port 3307 --user root --password 1234 \
 #     --db testdb --table land_move_tb
+# > python <이파일이름>.py --pnu 4425031524100010003 --upsert --tombstone
+# > python <이파일이름>.py --pnu 4425031524100010003 --no-upload     # 조회만
+# > python <이파일이름>.py --pnu 4425031524100010003 --sqlite        # MySQL 없이 로컬 파일
 # 성공 시:
 # - 업로드/조회 로그 출력 후 "[OK] XML 생성 완료 → ..." 메시지 표기
 
 # [의존성]
 # - pandas
-# - SQLAlchemy (sqlalchemy)
-# - PyMySQL (pymysql)
-# - Python 표준 라이브러리: argparse, os, re, datetime, xml.etree.ElementTree
+# - PyMySQL (pymysql) — MySQL 사용 시, SQLite 는 표준 라이브러리 sqlite3
+# - Python 표준 라이브러리: argparse, os, re, datetime
 
 # [주의]
-# - 업로드는 if_exists="replace"로 테이블을 재생성(기존 데이터 삭제)합니다.
+# - 업로드는 테이블을 재생성(기존 데이터 삭제)합니다. (--upsert 가 아닐 때)
+# - 테이블을 DB에서 직접 고친 경우 지문이 같아 업로드가 생략되므로 --force-upload 사용
 # - 정리일자 포맷은 숫자만 추출하여 YYYYMMDD로 표기(불완전 값은 숫자열 그대로 유지).
 # - 좌/우 지번 박스 텍스트는 행정구역명에서 '리' 단위만 추출하여 표시합니다.
 
 import os
 import re
+import sys
 import argparse
 from datetime import datetime
+from pathlib import Path
 
-import pandas as pd
-from sqlalchemy import create_engine, text
-import xml.etree.ElementTree as ET
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # land_data (공통 모듈)
+from landmove.store import read_table
+from landmove.diagram import write_diagram
+from landmove.history import fetch_rows
+from landmove.storage import open_storage, mysql_url, resolve_url, add_storage_args
+from landmove.upsert import upsert_frame
+from landmove.schema import create_table, coerce_frame, ensure_indexes
+from landmove.loadmeta import source_fingerprint, is_loaded, last_load, record_load
+from landmove.district import current
 
-# -------- 화면/배치 상수 (대략치) --------
-PAGE_W, PAGE_H = 800, 600
-JIBUN_W, JIBUN_H = 130, 40
-LABEL_W, LABEL_H = 100, 40
-ARROW_W = 130
-ROW_Y = 30
-START_X = 0
-LABEL_OFFSET_X = 10  # 연결선 시작점에서 라벨 박스까지 x 오프셋
+OUT_DIR = str(current("44250").out_dir)  # 시군구 설정(기본 44250) 작업 폴더
 
 # -------- 유틸 --------
 def find_excel(path: str) -> str:
-    """지정 경로가 없으면 44250/out 밑에서도 찾아봄."""
+    """지정 경로가 없으면 44250/1.data/out 밑에서도 찾아봄."""
     abs1 = os.path.abspath(path)
     if os.path.exists(abs1):
         return abs1
-    alt = os.path.abspath(os.path.join("./44250", "out", os.path.basename(path)))
+    alt = os.path.join(OUT_DIR, os.path.basename(path))
     if os.path.exists(alt):
         return alt
     raise FileNotFoundError(f"엑셀 파일을 찾을 수 없습니다: {path} (대안: {alt})")
 
-def extract_ri(adm_name: str) -> str:
-    """행정구역명에서 '리' 단위만 추출 (없으면 원문)."""
-    if not isinstance(adm_name, str):
-        return ""
-    m = re.search(r'([가-힣A-Za-z0-9]+리)', adm_name)
-    return m.group(1) if m else adm_name
-
 def yyyymmdd(d: str) -> str:
     """정리일자를 YYYYMMDD(숫자만)로 정규화."""
     if not isinstance(d, str):
@@ -81,148 +88,45 @@ def yyyymmdd(d: str) -> str:
 def label_text(move_kind: str, owner: str, cre_ymd: str) -> str:
     """
     라벨 3줄: 토지이동종목, 현재_소유자명, 정리일자(YYYYMMDD)
-    XML 줄바꿈은 &#xD;&#xA; 사용
+    줄바꿈은 CRLF 문자 → 저장 시 XML 의 &#xD;&#xA; 로 기록
     """
-    return f"{(move_kind or '')}&#xD;&#xA;{(owner or '')}&#xD;&#xA;{yyyymmdd(cre_ymd)}"
+    return "\r\n".join([move_kind or "", owner or "", yyyymmdd(cre_ymd)])
 
-def xml_new(tag, **attrs):
-    el = ET.Element(tag)
-    for k, v in attrs.items():
-        el.set(k, str(v))
-    return el
+def diagram_label(r: dict) -> str:
+    """조회 레코드 → 라벨 텍스트"""
+    return label_text(r.get("land_move_kind", ""), r.get("owner_name", ""), r.get("cre_ymd", ""))
 
-def prettify_and_write(root: ET.Element, out_path: str):
-    """
-    VSCode에서 보기 좋게 들여쓰기 저장.
-    Python 3.9+ 은 ET.indent, 아니면 minidom fallback.
-    """
-    tree = ET.ElementTree(root)
-    try:
-        ET.indent(tree, space="  ", level=0)  # type: ignore[attr-defined]
-        tree.write(out_path, encoding="utf-8", xml_declaration=False)
-    except Exception:
-        import xml.dom.minidom as md
-        xml_bytes = ET.tostring(root, encoding="utf-8")
-        parsed = md.parseString(xml_bytes)
-        pretty_xml = parsed.toprettyxml(indent="  ", encoding="utf-8")
-        with open(out_path, "wb") as f:
-            f.write(pretty_xml)
-
-# -------- 1~2) 엑셀 로딩 → DB 업로드(테이블 재생성) --------
-def upload_excel_to_db(excel_path: str, engine, db: str, table: str):
+# -------- 1~2) 엑셀 로딩 → DB 업로드(테이블 재생성 또는 증분) --------
+def upload_excel_to_db(excel_path: str, st, conn, table: str, upsert: bool = False, tombstone: bool = False) -> int:
+    """엑셀 → DB 업로드. 반환: 엑셀 행 수"""
     print(f"[INFO] 엑셀 로딩: {excel_path}")
-    df = pd.read_excel(excel_path, dtype=str)  # 선행 0 보존을 위해 전체 문자열
+    df = coerce_frame(read_table(excel_path))  # .parquet 우선, 선행 0 보존을 위해 전체 문자열(면적만 숫자)
     print(f"[INFO] 로딩 완료: {df.shape}")
 
-    print(f"[INFO] DB 업로드 → {db}.{table} (기존 테이블 있으면 삭제 후 재생성)")
-    df.to_sql(table, con=engine, if_exists="replace", index=False)  # DROP/CREATE 효과
+    try:
+        if upsert:
+            print(f"[INFO] DB 증분 적재 → {table} (신규·변경 행만)")
+            create_table(st, conn, table, df)  # 없을 때만 생성
+            upsert_frame(st, conn, table, df, tombstone=tombstone)
+        else:
+            print(f"[INFO] DB 업로드 → {table} (기존 테이블 있으면 삭제 후 재생성)")
+            create_table(st, conn, table, df, replace=True)  # DROP/CREATE
+            st.load_rows(conn, table, df)
+        ensure_indexes(st, conn, table)  # 적재 후 인덱스 생성
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
     print(f"[INFO] 업로드 완료")
+    return len(df)
 
 # -------- 3~4) DB에서 PNU로 조회(이동전/이동후) --------
-def fetch_rows_by_pnu(engine, db: str, table: str, pnu: str):
-    sql = text(f"""
-        SELECT
-            `이동전_필지코드`   AS bf_pnu,
-            `이동후_필지코드`   AS af_pnu,
-            `토지이동종목`     AS land_move_kind,
-            `정리일자`         AS cre_ymd,
-            `현재_소유자명`     AS owner_name,
-            `행정구역명`       AS adm_name
-        FROM `{db}`.`{table}`
-        WHERE `이동전_필지코드` = :p OR `이동후_필지코드` = :p
-        ORDER BY `정리일자` ASC, `이동전_필지코드` ASC, `이동후_필지코드` ASC
-    """)
-    with engine.begin() as conn:
-        return [dict(r) for r in conn.execute(sql, {"p": pnu}).mappings()]
-
-# -------- 5~6) XML 빌드 --------
-def build_diagram(rows):
-    root = xml_new("XtraSerializer", version="23.2.3.0")
-    items = xml_new("Items")
-    root.append(items)
-
-    root_item = xml_new(
-        "Item1",
-        ItemKind="DiagramRoot",
-        PageSize=f"{PAGE_W},{PAGE_H}",
-        SelectedStencils="BasicShapes, BasicFlowchartShapes",
-    )
-    items.append(root_item)
-
-    children = xml_new("Children")
-    root_item.append(children)
-
-    if not rows:
-        return root
-
-    x = START_X
-    y = ROW_Y
-    item_id = 1
-
-    for r in rows:
-        jibun_left  = extract_ri(r.get("adm_name", ""))
-        jibun_right = extract_ri(r.get("adm_name", ""))
-
-        # 왼쪽 지번 박스
-        item_id += 1
-        children.append(xml_new(
-            f"Item{item_id}",
-            ItemKind="DiagramShape",
-            Position=f"{x},{y}",
-            Size=f"{JIBUN_W},{JIBUN_H}",
-            Content=jibun_left,
-        ))
-
-        # 연결선
-        begin_x = x + JIBUN_W
-        begin_y = y + JIBUN_H // 2
-        end_x   = begin_x + ARROW_W
-        end_y   = begin_y
-        item_id += 1
-        children.append(xml_new(
-            f"Item{item_id}",
-            ItemKind="DiagramConnector",
-            Points="(Empty)",
-            BeginPoint=f"{begin_x},{begin_y}",
-            EndPoint=f"{end_x},{end_y}",
-        ))
-
-        # 라벨 박스 (연결선 위쪽)
-        label_x = begin_x + LABEL_OFFSET_X
-        label_y = y - 30
-        item_id += 1
-        children.append(xml_new(
-            f"Item{item_id}",
-            ItemKind="DiagramShape",
-            Position=f"{label_x},{label_y}",
-            Size=f"{LABEL_W},{LABEL_H}",
-            FontSize="8",
-            ThemeStyleId="Variant2",
-            Content=label_text(
-                r.get("land_move_kind", ""),
-                r.get("owner_name", ""),
-                r.get("cre_ymd", ""),
-            ),
-        ))
-
-        # 오른쪽 지번 박스
-        item_id += 1
-        children.append(xml_new(
-            f"Item{item_id}",
-            ItemKind="DiagramShape",
-            Position=f"{x + JIBUN_W + ARROW_W},{y}",
-            Size=f"{JIBUN_W},{JIBUN_H}",
-            Content=jibun_right,
-        ))
-
-        x = x + (JIBUN_W + ARROW_W)
-
-    return root
+# landmove.history.fetch_rows: UNION ALL 로 가지마다 이동전/이동후 인덱스 사용, 삭제표시 행 제외
 
 # -------- 메인 --------
 def main():
     ap = argparse.ArgumentParser(description="엑셀→DB(testdb.land_move_tb) 업로드→PNU 조회→XML 생성")
-    ap.add_argument("--excel", default="./out/이동정리현황_기간내.xlsx")
+    ap.add_argument("--excel", default=os.path.join(OUT_DIR, "이동정리현황_기간내.xlsx"))
     ap.add_argument("--host", default="127.0.0.1")
     ap.add_argument("--port", type=int, default=3307)
     ap.add_argument("--user", default="root")
@@ -230,21 +134,40 @@ def main():
     ap.add_argument("--db", default="testdb")
     ap.add_argument("--table", default="land_move_tb")
     ap.add_argument("--pnu", required=True, help="검색할 19자리 필지코드")
+    ap.add_argument("--upsert", action="store_true", help="재생성 대신 신규·변경 행만 증분 적재")
+    ap.add_argument("--tombstone", action="store_true", help="--upsert 시 엑셀에 없는 행 삭제표시(deleted_at)")
+    ap.add_argument("--no-upload", action="store_true", help="업로드 없이 DB 조회만")
+    ap.add_argument("--force-upload", action="store_true", help="원본 지문이 같아도 업로드")
+    add_storage_args(ap)
     args = ap.parse_args()
-
-    excel_path = find_excel(args.excel)
-
-    # SQLAlchemy 엔진
-    engine = create_engine(
-        f"mysql+pymysql://{args.user}:{args.password}@{args.host}:{args.port}/{args.db}?charset=utf8mb4",
-        future=True,
-    )
-
-    # 1~2) 엑셀 로딩 → 업로드(재생성)
-    upload_excel_to_db(excel_path, engine, args.db, args.table)
-
-    # 3~4) 조회
-    rows = fetch_rows_by_pnu(engine, args.db, args.table, args.pnu)
+    if args.tombstone and not args.upsert:
+        ap.error("--tombstone 은 --upsert 와 함께 사용")
+    if args.no_upload and args.force_upload:
+        ap.error("--no-upload 와 --force-upload 는 함께 사용할 수 없음")
+
+    # DB 연결 (MySQL 또는 SQLite)
+    st = open_storage(resolve_url(args.db_url, args.sqlite, OUT_DIR,
+                                  mysql_url(args.user, args.password, args.host, args.port, args.db)))
+    print(f"[INFO] DB: {st.describe()}")
+    conn = st.connect()
+    try:
+        # 1~2) 엑셀 로딩 → 업로드(재생성) — 원본 지문이 마지막 적재와 같으면 생략
+        if args.no_upload:
+            print(f"[INFO] --no-upload: 업로드 생략, {args.table} 조회만")
+        else:
+            excel_path = find_excel(args.excel)
+            digest = source_fingerprint(excel_path)
+            if not args.force_upload and is_loaded(st, conn, args.table, digest):
+                meta = last_load(st, conn, args.table)
+                print(f"[INFO] 원본 변경 없음 → 업로드 생략 ({meta['n_rows']:,}행, 적재 {meta['loaded_at']})")
+            else:
+                n_rows = upload_excel_to_db(excel_path, st, conn, args.table, args.upsert, args.tombstone)
+                record_load(st, conn, args.table, excel_path, digest, n_rows)
+
+        # 3~4) 조회
+        rows = fetch_rows(st, conn, args.pnu, table=args.table)
+    finally:
+        conn.close()
     if not rows:
         print(f"[INFO] 검색 결과 없음: PNU={args.pnu}")
         return
@@ -260,12 +183,11 @@ def main():
         )
 
     # 5~6) XML 생성/저장
-    root = build_diagram(rows)
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-    out_dir = os.path.join(".", "out", "xml")
+    out_dir = os.path.join(OUT_DIR, "xml")
     os.makedirs(out_dir, exist_ok=True)
     out_path = os.path.join(out_dir, f"diagram_{args.pnu}_{ts}.xml")
-    prettify_and_write(root, out_path)
+    write_diagram(rows, out_path, diagram_label)
     print(f"[OK] XML 생성 완료 → {out_path}")
 
 if __name__ == "__main__":
@@ -0,0 +1,242 @@
+# =====================================================================
+#  PNU 이동 이력 → DevExpress Diagram XML 로컬 HTTP 서비스 (상주 프로세스)
+# =====================================================================
+
+# [목적]
+# - 10.토지이동흐름도_xml 을 PNU마다 실행하면 매번 Python 기동·모듈 import·DB 접속·
+#   SET NAMES 핸드셰이크 비용이 듦 → 한 번 띄워 두고 HTTP 로 XML 응답
+# - DB 연결 풀(SQLAlchemy QueuePool, 연결 생성은 landmove.storage) 유지, 이력 조회 SQL(history.pnu_sql)은
+#   기동 시·적재 지문이 바뀔 때만 만들어 요청마다 재사용
+#   (pymysql 은 서버측 prepared statement 미지원 → SQL 문자열·삭제표시 조건을 미리 구성)
+# - 최근 결과 LRU 캐시, 테이블 적재 지문(landmove.loadmeta, 8 단계가 기록)이 바뀌면 비움
+#   * 지문은 최대 --meta-interval 초마다 확인 (캐시 적중 시 DB 왕복 없음)
+#   * 조회 시작 때의 지문과 끝났을 때의 지문이 다르면 그 결과는 캐시에 넣지 않음
+
+# [API]
+# - GET /diagram/{pnu}  → 200 application/xml (10.토지이동흐름도_xml 단건 출력과 같은 내용)
+#                          404 이력 없음 / 400 PNU 형식 오류(경로 값이 숫자 19자리가 아님, 0 채움 없음)
+#   * 응답 헤더 X-Cache: HIT | MISS
+# - GET /health         → 200 application/json {"fingerprint", "cache_size", "hits", "misses"}
+
+# [입력]
+# - DB: landmove / Table: land_move (8.토지이동흐름도_db저장_all 적재)
+#   * --sqlite / --db-url sqlite:///...: 8 단계를 같은 옵션으로 적재한 로컬 SQLite(WAL) 파일
+
+# [실행 방법]
+# > python 12.토지이동흐름도_서비스.py --host 127.0.0.1 --port 3306 --user root --password 1234
+# > curl http://127.0.0.1:8765/diagram/4425031524100010003
+#   * --listen 127.0.0.1:8765 (기본), --pool-size 4, --cache-size 1024, --meta-interval 2.0
+# > python 12.토지이동흐름도_서비스.py --sqlite     # MySQL 없이 ./1.data/out/landmove.sqlite
+
+# [의존성]
+# - sqlalchemy(연결 풀), pymysql (SQLite 는 표준 라이브러리 sqlite3)
+# - Python 표준 라이브러리: http.server, threading, collections
+
+# [주의]
+# - 로컬 뷰어용(인증 없음) — 기본 바인드 주소는 127.0.0.1
+
+import sys
+import json
+import time
+import argparse
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote
+
+import sqlite3
+
+import pymysql
+from sqlalchemy.pool import QueuePool
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # land_data (공통 모듈)
+from landmove.normalize import PNU_LEN
+from landmove.diagram import diagram_text
+from landmove.history import TABLE, fetch_rows, label_content, pnu_sql
+from landmove.loadmeta import load_fingerprint
+from landmove.storage import open_storage, mysql_url, resolve_url, add_storage_args
+from landmove.upsert import live_filter
+from landmove.district import current
+
+OUT_DIR = current("44250").out_dir  # 시군구 설정(기본 44250) 작업 폴더
+
+
+# -------------------- LRU 캐시 --------------------
+class DiagramCache:
+    """PNU → XML(bytes) LRU. 적재 지문이 바뀌면 전체 비움"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.items: OrderedDict[str, bytes | None] = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, pnu: str):
+        with self.lock:
+            if pnu in self.items:
+                self.items.move_to_end(pnu)
+                self.hits += 1
+                return True, self.items[pnu]
+            self.misses += 1
+            return False, None
+
+    def put(self, pnu: str, body: bytes | None):
+        with self.lock:
+            self.items[pnu] = body
+            self.items.move_to_end(pnu)
+            while len(self.items) > self.size:
+                self.items.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+
+
+# -------------------- 서비스 --------------------
+class DiagramService:
+    """연결 풀 + 적재 지문 확인 + 캐시를 묶은 조회기 (스레드 안전)"""
+
+    def __init__(self, st, pool, cache_size: int, meta_interval: float):
+        self.st = st
+        self.pool = pool
+        self.cache = DiagramCache(cache_size)
+        self.meta_interval = meta_interval
+        self.lock = threading.Lock()
+        self.fingerprint = None
+        self.sql = ""
+        self.checked_at = 0.0
+        self.refresh(force=True)
+
+    def refresh(self, force: bool = False):
+        """적재 지문 확인(최대 meta_interval 초마다). 바뀌면 캐시 비우고 삭제표시 조건·조회 SQL 다시 만듦"""
+        now = time.monotonic()
+        if not force and now - self.checked_at < self.meta_interval:
+            return
+        with self.lock:
+            if not force and now - self.checked_at < self.meta_interval:
+                return
+            raw = self.pool.connect()
+            try:
+                fp = load_fingerprint(self.st, raw, TABLE)
+                if fp != self.fingerprint:
+                    with raw.cursor() as cur:
+                        self.sql = pnu_sql(self.st, live_filter(self.st, cur, TABLE))
+            finally:
+                raw.close()
+            if fp != self.fingerprint:
+                self.cache.clear()
+                if self.fingerprint is not None:
+                    print(f"[INFO] 적재 지문 변경 → 캐시 비움 ({fp})")
+                self.fingerprint = fp
+            self.checked_at = now
+
+    def diagram(self, pnu: str) -> tuple[bytes | None, bool]:
+        """PNU → (XML bytes 또는 None(이력 없음), 캐시 적중 여부)"""
+        self.refresh()
+        hit, body = self.cache.get(pnu)
+        if hit:
+            return body, True
+        with self.lock:
+            fp, sql = self.fingerprint, self.sql
+        raw = self.pool.connect()  # 풀에서 대여 → close() 시 반납
+        try:
+            rows = fetch_rows(self.st, raw, pnu, sql=sql)
+        finally:
+            raw.close()
+        body = diagram_text(rows, label_content).encode("utf-8") if rows else None
+        with self.lock:  # 조회 중 지문이 바뀌었으면(캐시 비움 이후) 옛 결과는 캐시에 넣지 않음
+            if self.fingerprint == fp:
+                self.cache.put(pnu, body)
+        return body, False
+
+
+def make_handler(service: DiagramService):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive: 뷰어 폴링 시 TCP 재연결 생략
+
+        def _send(self, status: int, body: bytes, ctype: str, cache: str | None = None):
+            self.send_response(status)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            if cache:
+                self.send_header("X-Cache", cache)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _text(self, status: int, msg: str):
+            self._send(status, msg.encode("utf-8"), "text/plain; charset=utf-8")
+
+        def do_GET(self):
+            t0 = time.perf_counter()
+            path = unquote(self.path.split("?", 1)[0]).rstrip("/")
+            try:
+                if path == "/health":
+                    service.refresh()
+                    info = {
+                        "fingerprint": service.fingerprint,
+                        "cache_size": len(service.cache.items),
+                        "hits": service.cache.hits,
+                        "misses": service.cache.misses,
+                    }
+                    self._send(200, json.dumps(info, ensure_ascii=False).encode("utf-8"), "application/json")
+                    return
+                if not path.startswith("/diagram/"):
+                    self._text(404, "GET /diagram/{pnu}")
+                    return
+
+                pnu = path[len("/diagram/"):]
+                if not (pnu.isascii() and pnu.isdigit() and len(pnu) == PNU_LEN):  # 자릿수 채움 없이 그대로 검사
+                    self._text(400, f"PNU 형식 오류(숫자 19자리): {path}")
+                    return
+                body, hit = service.diagram(pnu)
+                if body is None:
+                    self._text(404, f"검색 결과 없음: PNU={pnu}")
+                else:
+                    self._send(200, body, "application/xml; charset=utf-8", "HIT" if hit else "MISS")
+                print(f"[INFO] {path} {'HIT' if hit else 'MISS'} {(time.perf_counter() - t0) * 1000:.1f}ms")
+            except (pymysql.MySQLError, sqlite3.Error) as e:
+                self._text(503, f"DB 오류: {e}")
+
+        def log_message(self, format, *args):  # 기본 접근 로그(stderr) 대신 위 [INFO] 한 줄
+            pass
+
+    return Handler
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="PNU 이력 → Diagram XML HTTP 서비스")
+    ap.add_argument("--host", default="127.0.0.1", help="DB 호스트")
+    ap.add_argument("--port", type=int, default=3306, help="DB 포트")
+    ap.add_argument("--user", default="root", help="DB 사용자")
+    ap.add_argument("--password", default="1234", help="DB 비밀번호")
+    ap.add_argument("--listen", default="127.0.0.1:8765", help="HTTP 바인드 주소:포트")
+    ap.add_argument("--pool-size", type=int, default=4, help="DB 연결 풀 크기")
+    ap.add_argument("--cache-size", type=int, default=1024, help="LRU 캐시 PNU 수")
+    ap.add_argument("--meta-interval", type=float, default=2.0, help="적재 지문 확인 간격(초)")
+    add_storage_args(ap)
+    args = ap.parse_args()
+
+    # 연결 풀: 접속·SET NAMES 는 연결 생성 시 1회 (charset=utf8mb4), SQLite 는 WAL(읽기 동시 가능)
+    st = open_storage(resolve_url(args.db_url, args.sqlite, OUT_DIR,
+                                  mysql_url(args.user, args.password, args.host, args.port, "landmove")))
+    print(f"[INFO] DB: {st.describe()}")
+    pool = QueuePool(st.connect, pool_size=args.pool_size, max_overflow=args.pool_size, recycle=3600)
+    service = DiagramService(st, pool, args.cache_size, args.meta_interval)
+
+    bind_host, bind_port = args.listen.rsplit(":", 1)
+    server = ThreadingHTTPServer((bind_host, int(bind_port)), make_handler(service))
+    server.daemon_threads = True
+    print(f"[INFO] 적재 지문: {service.fingerprint}")
+    print(f"[OK] 서비스 시작 → http://{bind_host}:{bind_port}/diagram/{{pnu}}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("[INFO] 종료")
+    finally:
+        server.server_close()
+        pool.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,8 +5,13 @@
 # [목적]
 # - CSV 파일에서 이동전/이동후 지번을 이용하여 19자리 필지코드 생성
 # - 지목, 소유구분 등 값 정제
-# - 불필요한 컬럼 삭제
-# - openpyxl을 이용해 모든 셀을 텍스트 형식으로 지정하여 Excel로 저장
+# - 불필요한 컬럼 삭제 (일련번호는 DB 증분 적재 자연키로 쓰므로 유지)
+#   * 필지코드 생성에 쓰지 않는 삭제 컬럼(지가·신청 소유자 등)은 CSV 파싱 단계에서 제외(usecols)
+#   * 필수 컬럼은 원본 레이아웃 등록부(landmove.layout, 토지이동정리현황)로 머리행만 읽어 확인
+# - 원본 파일·삭제 컬럼·지목 자릿수·종목 코드 치환은 시군구 설정(landmove.district)을 따름
+#   * 원본이 여러 파일(예: 44200 반기별 CSV)이면 이름순으로 청크를 이어 붙여 기록
+# - 모든 셀을 텍스트 형식으로 지정하여 Excel로 저장 (landmove.excel, 청크 스트리밍)
+# - 다음 단계용 .parquet(같은 이름) 동시 저장
 
 # [실행파일]
 # 1-3.필지코드구성_이동정리_종목코드매핑.py
@@ -26,88 +31,63 @@
 #     pip install pandas openpyxl
 
 # (윈도우 PowerShell 환경)
-#     python -m pip install pandas openpyxlimport pandas as pd
+#     python -m pip install pandas openpyxl
 
+import sys
+import pandas as pd
 from pathlib import Path
-import re
-from openpyxl import Workbook
-from openpyxl.utils.dataframe import dataframe_to_rows
-from openpyxl.styles import numbers
-
-SRC = Path("./1.data/in/토지이동정리현황(소유권포함).csv")  # <- 업로드 파일 경로
-OUT = Path("./44250/1.data/out/토지이동정리현황_필지코드추가.xlsx")  # <- 저장 파일 경로
-DROP_COLS = [
-    "지역코드", "대장구분", "이동전_지번","이동후_지번",
-    "일련번호", "공시지가", "공시지가_수시", "전년지가", "전년지가_수시",
-    "2년전지가", "2년전지가_수시", "3년전지가", "3년전지가_수시",
-    "4년전지가", "4년전지가_수시",
-    "신청_소유구분", "신청_소유자명", "신청_소유자등록번호", "신청_소유자주소",
-]
-
-def read_csv_keep_strings(path: Path) -> pd.DataFrame:
-    encodings = ["utf-8-sig", "utf-8", "cp949"]
-    last_err = None
-    for enc in encodings:
-        try:
-            return pd.read_csv(path, dtype=str, encoding=enc)
-        except Exception as e:
-            last_err = e
-    raise last_err
-
-def digits_only(x) -> str:
-    if x is None:
-        return ""
-    return re.sub(r"\D", "", str(x))
-
-def mk_pnu(region, ledger, jibun) -> str:
-    reg = digits_only(region).zfill(10)
-    led = (str(ledger) if ledger is not None else "").strip()[:1].zfill(1)
-    jbn = digits_only(jibun).zfill(8)
-    return (reg + led + jbn).zfill(19)
-
-df = read_csv_keep_strings(SRC)
-
-# 필수 컬럼 확인
-need_cols = ["지역코드", "대장구분", "이동전_지번", "이동후_지번"]
-missing = [c for c in need_cols if c not in df.columns]
-if missing:
-    raise ValueError(f"필수 컬럼이 없습니다: {missing}")
-
-# 19자리 필지코드 생성
-df["이동전_필지코드"] = [mk_pnu(r, l, jb) for r, l, jb in zip(df["지역코드"], df["대장구분"], df["이동전_지번"])]
-df["이동후_필지코드"] = [mk_pnu(r, l, jb) for r, l, jb in zip(df["지역코드"], df["대장구분"], df["이동후_지번"])]
-
-# 지목 정제: 하이픈 제거 후 숫자만
-for col in ["이동전_지목", "이동후_지목"]:
-    if col in df.columns:
-        df[col] = (
-            df[col].fillna("").astype(str)
-            .str.replace("-", "", regex=False)
-            .apply(digits_only)
-        )
-
-# 현재_소유구분: 숫자만 + 선행 0 제거
-if "현재_소유구분" in df.columns:
-    cleaned = df["현재_소유구분"].fillna("").astype(str).apply(digits_only)
-    df["현재_소유구분"] = cleaned.apply(lambda s: s.lstrip("0") if s != "" else "")
-
-# 지정 컬럼 삭제
-df = df.drop(columns=[c for c in DROP_COLS if c in df.columns], errors="ignore")
-
-# PNU 컬럼을 맨 앞으로
-front = ["이동전_필지코드", "이동후_필지코드"]
-df = df[[c for c in front if c in df.columns] + [c for c in df.columns if c not in front]]
-
-# 엑셀(텍스트 서식) 저장
-OUT.parent.mkdir(parents=True, exist_ok=True)
-wb = Workbook()
-ws = wb.active
-ws.title = "data"
 
-for r_idx, row in enumerate(dataframe_to_rows(df, index=False, header=True), start=1):
-    ws.append(row)
-    for c_idx in range(1, len(row) + 1):
-        ws.cell(row=r_idx, column=c_idx).number_format = numbers.FORMAT_TEXT #텍스트 형식으로 저장
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # land_data (공통 모듈)
+from landmove.normalize import make_pnu, code_only, code2, map_codes
+from landmove.ingest import iter_csv
+from landmove.store import save_table
+from landmove.district import current
+from landmove.memory import track
+from landmove.layout import resolve, source_columns, usecols_without, MOVE
+
+D = current("44250")  # 시군구 설정 (기본 44250, 실행 폴더 무관)
+track()  # 종료 시 최대 메모리 출력 (청크 단위 처리)
+SRCS = D.input_files("move")  # <- 업로드 파일 경로 ([inputs] move)
+OUT = D.out_dir / "토지이동정리현황_필지코드추가.xlsx"  # <- 저장 파일 경로
+DROP_COLS = D.drop_cols
+
+NEED_FIELDS = ["지역코드", "대장구분", "이동전_지번", "이동후_지번"]  # landmove.layout 표준명
+SKIP_COLS = set(DROP_COLS) - {MOVE.fields[f][0] for f in NEED_FIELDS}  # 읽지 않을 컬럼
+
+def clean_chunk(df: pd.DataFrame) -> pd.DataFrame:
+    """청크 하나 정제: 필지코드 생성 · 지목/소유구분 정제 · 컬럼 삭제/정렬"""
+    # 19자리 필지코드 생성
+    df["이동전_필지코드"] = make_pnu(df["지역코드"], df["대장구분"], df["이동전_지번"])
+    df["이동후_필지코드"] = make_pnu(df["지역코드"], df["대장구분"], df["이동후_지번"])
+
+    # 지목 정제: "05-임야" → "05" (jimok_width=2: "5-전" → "05")
+    for col in ["이동전_지목", "이동후_지목"]:
+        if col in df.columns:
+            df[col] = code2(df[col]) if D.jimok_width == 2 else code_only(df[col])
+
+    # 현재_소유구분: 코드만 + 선행 0 제거
+    if "현재_소유구분" in df.columns:
+        df["현재_소유구분"] = code_only(df["현재_소유구분"]).str.lstrip("0")
+
+    # 토지이동종목 → 코드 (설정 map_kind, 코드표에 없는 종목은 명칭 그대로 → 6단계 기타 시트)
+    if D.map_kind and "토지이동종목" in df.columns:
+        df["토지이동종목"] = map_codes(df["토지이동종목"], D.move_codes, keep_unmapped=True)
+
+    # 지정 컬럼 삭제
+    df = df.drop(columns=[c for c in DROP_COLS if c in df.columns], errors="ignore")
+
+    # PNU 컬럼을 맨 앞으로
+    front = ["이동전_필지코드", "이동후_필지코드"]
+    return df[[c for c in front if c in df.columns] + [c for c in df.columns if c not in front]]
+
+if not SRCS:
+    raise FileNotFoundError(f"토지이동정리현황 CSV가 없습니다: {D.in_dir / D.inputs.get('move', '')}")
+for src in SRCS:  # 필수 컬럼 확인 (머리행만)
+    resolve(source_columns(src), MOVE).require(*NEED_FIELDS)
+OUT.parent.mkdir(parents=True, exist_ok=True)
 
-wb.save(OUT)
-print(f"Saved: {OUT}")
+# CSV 청크 단위 로딩·정제 → 엑셀(텍스트 서식) 저장
+# (인코딩은 파일마다 앞부분으로 1회 판별, 청크는 정제 즉시 시트에 기록)
+chunks = (clean_chunk(chunk) for src in SRCS for chunk in iter_csv(src, usecols=usecols_without([src], SKIP_COLS)))
+n_rows = save_table(chunks, OUT, sheet_name="data")
+print(f"Saved: {OUT} ({n_rows}행)")
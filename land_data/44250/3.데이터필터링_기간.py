@@ -5,155 +5,167 @@
 # [목적]
 # - 3개 원본(엑셀 2개 + CSV 1개)을 읽어 공통 날짜 컬럼으로
 #   기간내/기간외 분리하고, 기간외 존재 여부 출력
+#   (날짜·사유/종목 컬럼은 원본 레이아웃 등록부 landmove.layout 의 표준명으로 찾음)
 # - 토지(임야)기본/이동정리현황: 기간내 데이터에 대해 이동사유(우선) 또는
 #   이동종목 기준 집계표를 콘솔에 출력
 # - 각 파일의 기간내/기간외 데이터를 모두 텍스트 서식(@)으로 엑셀 저장
+# - 토지(임야)기본/이동정리현황: 전체 이력의 집계 큐브(이동사유/종목 × 연월 × 법정동 × 신청구분,
+#   건수·필지수·면적 합)를 원본이 바뀌었을 때만 다시 만들어 저장 (landmove.cube)
+#   → 월별·리별 등 보고용 집계는 3.집계큐브_조회.py 로 큐브만 읽어 계산
 
-# [입력 파일]  (스크립트와 동일 루트 기준)
+# [입력 파일]  (스크립트 위치 기준, 실행 폴더 무관)
 # - ./1.data/out/토지(임야)기본_필지코드추가.xlsx
-# - .
-# /1.data/out/토지이동정리현황_필지코드추가.xlsx
-# - ./44250/1.data/in/일반용조서(말소용).csv
-
-# [출력 파일]  (없으면 생성, 기존 파일 있으면 타임스탬프 부여 저장)
-# - 44250/1.data/out/토지(임야)기본_기간내.xlsx
-# - 44250/1.data/out/토지(임야)기본_기간외.xlsx
-# - 44250/1.data/out/이동정리현황_기간내.xlsx
-# - 44250/1.data/out/이동정리현황_기간외.xlsx
-# - 44250/1.data/out/일반용조서(말소용)_기간내.xlsx
-# - 44250/1.data/out/일반용조서(말소용)_기간외.xlsx
+# - ./1.data/out/토지이동정리현황_필지코드추가.xlsx
+# - ./1.data/in/일반용조서(말소용).csv
+#   * 엑셀 입력은 같은 이름의 .parquet 가 있으면 그것을 우선 사용
+#   * 작업 폴더·기본 기간·말소용 CSV 는 시군구 설정(landmove.district)을 따름
+
+# [출력 파일]  (없으면 생성, 기존 파일 있으면 타임스탬프 부여 저장 / --overwrite 시 덮어쓰기)
+# - ./1.data/out/토지(임야)기본_기간내.xlsx
+# - ./1.data/out/토지(임야)기본_기간외.xlsx
+# - ./1.data/out/이동정리현황_기간내.xlsx
+# - ./1.data/out/이동정리현황_기간외.xlsx
+# - ./1.data/out/일반용조서(말소용)_기간내.xlsx
+# - ./1.data/out/일반용조서(말소용)_기간외.xlsx
+#   * 다음 단계용 .parquet 는 타임스탬프 없이 같은 이름으로 저장
+# - ./1.data/out/토지(임야)기본_필지코드추가.parts/, 토지이동정리현황_필지코드추가.parts/
+#   * 토지이동일자/정리일자 연월별 파티션(landmove.partition). 원본이 바뀐 뒤 첫 실행에서만 만들고,
+#     이후 기간 조회는 해당 연월 파티션만 읽음 (경계 월은 이진 탐색)
+# - ./1.data/out/집계큐브/토지(임야)기본.cube/, 이동정리현황.cube/ (+ <이름>_집계큐브.xlsx)
+#   * 기간과 무관하게 전체 이력 기준 (연월 차원으로 기간을 나눔)
 
 # [실행 방법]
 # > python 3.데이터필터링_기간.py
+# > python 3.데이터필터링_기간.py --start 20250101 --end 20250630 --only move --overwrite
+#   * --only: land(토지대장) / move(이동정리현황) / malso(말소용) 중 일부만 처리
+#     (0.파이프라인_실행.py 가 입력이 바뀐 원본만 다시 처리할 때 사용)
+#   * --in-only: 기간외 엑셀 저장 생략 → 기간 밖 파티션은 읽지 않음(건수만 출력)
+# > python 3.데이터필터링_기간.py --by quarter --start 20240101 --end 20251231   # 분기별
+# > python 3.데이터필터링_기간.py --periods 20250101-20250331 20250401-20250630 --jobs 4
+#   * 여러 기간 모드: 원본마다 전체 기간 범위를 한 번만 읽어 행마다 기간(구간)을 한 번에 배정,
+#     구간별 기간내 엑셀을 동시에 저장 → ./1.data/out/기간별/<원본>_<구간>.xlsx
+#     구간별 이동사유/종목 집계는 하나의 표로 모아 ./1.data/out/기간별/기간별_집계.xlsx
+#     (기간외 파일은 만들지 않음)
+# > set LANDMOVE_MEMORY=1  → 메모리 절감 모드(범주형/Arrow 문자열/숫자 면적, landmove.memory), 종료 시 최대 메모리 출력
 # -모듈설치: pandas, openpyxl
 
+import sys
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
-import re
+import numpy as np
 import pandas as pd
-from openpyxl.styles import numbers
-from openpyxl.utils.dataframe import dataframe_to_rows
-from openpyxl import Workbook
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # land_data (공통 모듈)
+from landmove.normalize import yyyymmdd
+from landmove.ingest import read_csv_text
+from landmove.store import save_table, table_columns
+from landmove.partition import split_frame, period_split
+from landmove.cube import CubeSpec, ensure_cube
+from landmove.layout import resolve
+from landmove.memory import compact, track
+from landmove.district import current
 
 # -----------------------------
 # 공통 설정
 # -----------------------------
-BASE = Path("44250").resolve()
-DATE_RANGE = ("20250101", "20250630")  # [시작, 종료] (YYYYMMDD)
+D = current("44250")   # 시군구 설정 (기본 44250)
+BASE = D.work_dir
+DATE_RANGE = D.period  # [시작, 종료] (YYYYMMDD)
 
 # 파일 경로
 P_LAND_BASIC  = BASE /"1.data"/ "out" / "토지(임야)기본_필지코드추가.xlsx"
 P_MOVE_STATUS = BASE /"1.data"/ "out" / "토지이동정리현황_필지코드추가.xlsx"
-P_MALSO_CSV   = BASE /"1.data"/"in"/ "일반용조서(말소용).csv"
+P_MALSO_CSVS  = D.input_files("malso")
+PERIOD_DIR    = BASE /"1.data"/ "out" / "기간별"   # 여러 기간 모드 출력
+CUBE_DIR      = BASE /"1.data"/ "out" / "집계큐브"  # 집계 큐브 (landmove.cube)
 
 # -----------------------------
 # 공통 유틸
 # -----------------------------
-def _strip_digits(s: str) -> str:
-    """숫자만 남기기"""
-    return re.sub(r"\D+", "", str(s)) if pd.notna(s) else ""
-
-def _normalize_yyyymmdd(s: str) -> str:
-    """
-    날짜 문자열에서 숫자만 추출 → 8자리(YYYYMMDD)만 사용.
-    잘리거나 부족하면 빈문자.
-    """
-    ds = _strip_digits(s)
-    return ds[:8] if len(ds) >= 8 else ""
-
-def _find_first_col(df: pd.DataFrame, candidates: list[str]) -> str | None:
-    """후보 리스트에서 처음으로 존재하는 컬럼명을 반환(대소문자 무시)"""
-    lower_map = {c.lower(): c for c in df.columns}
-    for cand in candidates:
-        if cand.lower() in lower_map:
-            return lower_map[cand.lower()]
-    return None
-
-def _read_excel_all_text(path: Path) -> pd.DataFrame:
-    return pd.read_excel(path, dtype=str, engine="openpyxl")
-
-def _read_csv_guess_encoding(path: Path) -> pd.DataFrame:
-    for enc in ["utf-8", "utf-8-sig", "cp949"]:
-        try:
-            return pd.read_csv(path, dtype=str, encoding=enc)
-        except Exception:
-            continue
-    return pd.read_csv(path, dtype=str)
+def _reason_col(columns) -> str | None:
+    """사유 우선, 없으면 종목 (landmove.layout 표준명 이동사유/이동종목)"""
+    return resolve(columns).col("이동사유", "이동종목")
 
 def _filter_by_date(df: pd.DataFrame, date_col: str):
     """
-    date_col 기준으로 기간 내/외 분리
+    date_col 기준으로 기간 내/외 분리 (CSV 원본 등 메모리 자료)
     return: (기간내_df, 기간외_df, 기간외_존재여부)
     """
-    tmp = df.copy()
-    tmp["_YMD"] = tmp[date_col].map(_normalize_yyyymmdd)
+    in_df, out_df = split_frame(df, date_col, *DATE_RANGE)
+    return in_df, out_df, len(out_df) > 0
 
-    in_mask = (tmp["_YMD"] >= DATE_RANGE[0]) & (tmp["_YMD"] <= DATE_RANGE[1])
-    in_df = tmp.loc[in_mask].drop(columns=["_YMD"])
-    out_df = tmp.loc[~in_mask].drop(columns=["_YMD"])
-    has_out = len(out_df) > 0
-    return in_df, out_df, has_out
+def _split_table(path: Path):
+    """
+    단계 결과를 날짜 파티션으로 기간 내/외 분리 (기간 밖 파티션은 필요할 때만 읽음)
+    return: (기간내_df, 기간외_df | None, 기간외_건수)
+    """
+    date_col, = resolve(table_columns(path)).require("이동일자")
+    in_df, out_df, n_out = period_split(path, date_col, *DATE_RANGE, outside=not IN_ONLY)
+    return compact(in_df, label=f"{path.stem} 기간내"), (None if out_df is None else compact(out_df)), n_out
 
 def _groupby_count(df: pd.DataFrame, by_col: str, label: str) -> pd.DataFrame:
-    g = df.groupby(by_col, dropna=False).size().reset_index(name="건수")
+    g = df.groupby(by_col, dropna=False, observed=True).size().reset_index(name="건수")
     g = g.rename(columns={by_col: label})
-    g[label] = g[label].fillna("(미기재)")
+    g[label] = g[label].astype(object).fillna("(미기재)")
     return g.sort_values("건수", ascending=False)
 
+def _update_cube(path: Path, name: str):
+    """단계 결과의 집계 큐브를 최신으로 (원본이 그대로면 건너뜀). 없는 차원 컬럼은 "(미기재)" """
+    lay = resolve(table_columns(path))
+    spec = CubeSpec(
+        name,
+        kind_col=lay.col("이동사유", "이동종목"),
+        date_col=lay.col("이동일자"),
+        pnu_cols=[c for c in map(lay.col, ["이동후_필지코드", "이동전_필지코드", "필지코드"]) if c],
+        area_cols=[c for c in map(lay.col, ["이동전_면적", "이동후_면적", "면적"]) if c],
+        name_col=lay.col("행정구역명"),
+        apply_col=lay.col("신청구분"),
+    )
+    if not spec.kind_col:
+        print("[경고] 이동사유/종목 컬럼이 없어 집계 큐브를 만들지 않습니다.")
+        return
+    out_dir = ensure_cube(path, spec, CUBE_DIR)
+    if out_dir is not None:
+        print(f"- 집계 큐브: {out_dir}")
+
 def _print_section(title: str):
     print("\n" + "="*70)
     print(f"[{title}]")
     print("="*70)
 
+OVERWRITE = False  # True: 기존 엑셀을 타임스탬프 없이 덮어씀 (--overwrite)
+IN_ONLY = False    # True: 기간외 엑셀 저장 생략 (--in-only)
+
 def _save_excel_all_text(df: pd.DataFrame, out_path: Path):
     """
     DataFrame을 모든 셀 텍스트 서식(@)으로 엑셀 저장
-    (엑셀이 열 때 선행 0 보존)
+    (엑셀이 열 때 선행 0 보존) + 다음 단계용 .parquet 는 항상 원래 이름으로 저장
     """
-    target = out_path
-    if target.exists():  # 파일 잠금/중복 대비 타임스탬프 부여
-        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        target = out_path.with_name(out_path.stem + f"_{ts}" + out_path.suffix)
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "기간_데이터"
-
-    for row in dataframe_to_rows(df, index=False, header=True):
-        ws.append(row)
-
-    # 모든 셀 텍스트 서식 적용
-    for col in ws.iter_cols(min_row=1, max_row=ws.max_row, min_col=1, max_col=ws.max_column):
-        for cell in col:
-            cell.number_format = numbers.FORMAT_TEXT  # "@"
-            if cell.value is None:
-                cell.value = ""  # 빈칸 통일
-
-    target.parent.mkdir(parents=True, exist_ok=True)
-    wb.save(target)
+    target = _target_path(out_path)
+    save_table(df, out_path, sheet_name="기간_데이터", excel_path=target)
     print(f"[저장] {target}")
 
+def _target_path(out_path: Path) -> Path:
+    """기존 파일이 있으면(덮어쓰기 아님) 타임스탬프 붙인 이름 — 파일 잠금/중복 대비"""
+    if out_path.exists() and not OVERWRITE:
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return out_path.with_name(out_path.stem + f"_{ts}" + out_path.suffix)
+    return out_path
+
 # -----------------------------
 # 개별 파일 처리
 # -----------------------------
 def process_land_basic():
     _print_section("토지(임야)기본 — 기간외 여부/집계/엑셀 저장")
-    df = _read_excel_all_text(P_LAND_BASIC)
-
-    # 날짜/사유 후보 (파일별 명칭 편차 흡수)
-    date_candidates = ["토지이동일자", "정리일자", "cre_ymd"]
-    reason_candidates = ["토지이동사유", "토지이동종목", "land_mov_rsn"]
-
-    date_col = _find_first_col(df, date_candidates)
-    if not date_col:
-        raise ValueError(f"[오류] 날짜열을 찾을 수 없습니다. 후보={date_candidates}\n현재 열: {list(df.columns)}")
-
-    in_df, out_df, has_out = _filter_by_date(df, date_col)
-    print(f"- 기간 외 자료 존재 여부: {'예' if has_out else '아니오'} (전체 {len(df):,}건 / 기간내 {len(in_df):,}건 / 기간외 {len(out_df):,}건)")
+    # 날짜/사유 컬럼은 레이아웃 등록부(landmove.layout)로 찾음
+    in_df, out_df, n_out = _split_table(P_LAND_BASIC)
+    has_out = n_out > 0
+    print(f"- 기간 외 자료 존재 여부: {'예' if has_out else '아니오'} (전체 {len(in_df) + n_out:,}건 / 기간내 {len(in_df):,}건 / 기간외 {n_out:,}건)")
 
     # 사유 우선, 없으면 종목 대체
-    reason_col = _find_first_col(in_df, ["토지이동사유", "land_mov_rsn"]) \
-                 or _find_first_col(in_df, ["토지이동종목", "land_mov_type"])
+    reason_col = _reason_col(in_df.columns)
     if reason_col:
         agg = _groupby_count(in_df, reason_col, "이동사유/종목")
         print("\n[이동사유/종목별 집계]")
@@ -165,26 +177,18 @@ def process_land_basic():
     out_in  = BASE / "1.data/out" / "토지(임야)기본_기간내.xlsx"
     out_out = BASE / "1.data/out" / "토지(임야)기본_기간외.xlsx"
     _save_excel_all_text(in_df, out_in)
-    if has_out:
+    if out_df is not None and has_out:
         _save_excel_all_text(out_df, out_out)
+    _update_cube(P_LAND_BASIC, "토지(임야)기본")
 
 def process_move_status():
     _print_section("이동정리현황 — 기간외 여부/집계/엑셀 저장")
-    df = _read_excel_all_text(P_MOVE_STATUS)
+    in_df, out_df, n_out = _split_table(P_MOVE_STATUS)
+    has_out = n_out > 0
+    print(f"- 기간 외 자료 존재 여부: {'예' if has_out else '아니오'} (전체 {len(in_df) + n_out:,}건 / 기간내 {len(in_df):,}건 / 기간외 {n_out:,}건)")
 
-    date_candidates = ["정리일자", "토지이동일자", "cre_ymd"]
     # 사유 우선, 없으면 종목
-    reason_candidates = ["토지이동사유", "land_mov_rsn", "토지이동종목", "land_mov_type"]
-
-    date_col = _find_first_col(df, date_candidates)
-    if not date_col:
-        raise ValueError(f"[오류] 날짜열을 찾을 수 없습니다. 후보={date_candidates}\n현재 열: {list(df.columns)}")
-
-    in_df, out_df, has_out = _filter_by_date(df, date_col)
-    print(f"- 기간 외 자료 존재 여부: {'예' if has_out else '아니오'} (전체 {len(df):,}건 / 기간내 {len(in_df):,}건 / 기간외 {len(out_df):,}건)")
-
-    reason_col = _find_first_col(in_df, ["토지이동사유", "land_mov_rsn"]) \
-                 or _find_first_col(in_df, ["토지이동종목", "land_mov_type"])
+    reason_col = _reason_col(in_df.columns)
     if reason_col:
         agg = _groupby_count(in_df, reason_col, "이동사유/종목")
         print("\n[이동사유/종목별 집계]")
@@ -196,8 +200,9 @@ def process_move_status():
     out_in  = BASE /"1.data"/ "out" / "이동정리현황_기간내.xlsx"
     out_out = BASE /"1.data"/ "out" / "이동정리현황_기간외.xlsx"
     _save_excel_all_text(in_df, out_in)
-    if has_out:
+    if out_df is not None and has_out:
         _save_excel_all_text(out_df, out_out)
+    _update_cube(P_MOVE_STATUS, "이동정리현황")
 
 def process_malso_csv():
     """
@@ -205,13 +210,12 @@ def process_malso_csv():
     - 기간 외 여부, 기간내/기간외 데이터 저장(집계 없음)
     """
     _print_section("일반용조서(말소용) — 기간외 여부/엑셀 저장")
-    df = _read_csv_guess_encoding(P_MALSO_CSV)
-
-    date_candidates = ["토지이동일자", "정리일자", "cre_ymd"]
-    date_col = _find_first_col(df, date_candidates)
-    if not date_col:
-        raise ValueError(f"[오류] 날짜열을 찾을 수 없습니다. 후보={date_candidates}\n현재 열: {list(df.columns)}")
+    if not P_MALSO_CSVS:
+        raise FileNotFoundError(f"일반용조서(말소용) CSV가 없습니다: {D.in_dir / D.inputs.get('malso', '')}")
+    df = pd.concat([read_csv_text(p) for p in P_MALSO_CSVS], ignore_index=True)
+    df = compact(df, label="일반용조서(말소용)")
 
+    date_col, = resolve(df.columns).require("이동일자")
     in_df, out_df, has_out = _filter_by_date(df, date_col)
     print(f"- 기간 외 자료 존재 여부: {'예' if has_out else '아니오'} (전체 {len(df):,}건 / 기간내 {len(in_df):,}건 / 기간외 {len(out_df):,}건)")
 
@@ -222,18 +226,170 @@ def process_malso_csv():
     if has_out:
         _save_excel_all_text(out_df, out_out)
 
+# -----------------------------
+# 여러 기간(구간) 모드
+# -----------------------------
+MULTI_SOURCES = {  # key: (출력 이름, 사유/종목 집계 여부)
+    "land": ("토지(임야)기본", True),
+    "move": ("이동정리현황", True),
+    "malso": ("일반용조서(말소용)", False),
+}
+
+def make_periods(start: str, end: str, by: str) -> list[tuple[str, str, str]]:
+    """[start, end] 를 월(month)/분기(quarter) 구간으로 나눔 → [(이름, 시작, 종료)] (양끝은 start/end 로 자름)
+    - start > end 이거나 구간이 하나도 없으면 오류 (단일 기간 모드로 넘어가 결과를 빈 표로 덮지 않도록)
+    """
+    if start > end:
+        raise ValueError(f"[오류] 시작일이 종료일보다 늦습니다: {start} > {end}")
+    freq = {"month": "M", "quarter": "Q"}[by]
+    periods = []
+    for p in pd.period_range(pd.Timestamp(start), pd.Timestamp(end), freq=freq):
+        label = f"{p.year}Q{p.quarter}" if by == "quarter" else f"{p.year}{p.month:02d}"
+        s = max(p.start_time.strftime("%Y%m%d"), start)
+        e = min(p.end_time.strftime("%Y%m%d"), end)
+        periods.append((label, s, e))
+    if not periods:
+        raise ValueError(f"[오류] 나눌 구간이 없습니다: {start} ~ {end} ({by})")
+    return periods
+
+def parse_periods(specs: list[str]) -> list[tuple[str, str, str]]:
+    """"YYYYMMDD-YYYYMMDD" 목록 → [(이름, 시작, 종료)] (시작일 순, 겹치면 오류)"""
+    periods = []
+    for spec in specs:
+        parts = spec.replace("~", "-").split("-", 1)
+        s, e = (yyyymmdd(x.strip()) for x in parts) if len(parts) == 2 else ("", "")
+        if len(s) != 8 or len(e) != 8 or s > e:
+            raise ValueError(f"[오류] 기간 형식(YYYYMMDD-YYYYMMDD) 확인: {spec}")
+        periods.append((f"{s}-{e}", s, e))
+    periods.sort(key=lambda p: p[1])
+    for (l1, _, e1), (l2, s2, _) in zip(periods, periods[1:]):
+        if s2 <= e1:
+            raise ValueError(f"[오류] 기간이 겹칩니다: {l1} / {l2}")
+    return periods
+
+def assign_buckets(dates: pd.Series, periods: list[tuple[str, str, str]]) -> np.ndarray:
+    """날짜 → 구간 번호(periods 순서, 어느 구간에도 없으면 -1). 정수 비교 + 이진 탐색 한 번"""
+    ymd = pd.to_numeric(yyyymmdd(dates), errors="coerce").fillna(0).to_numpy(dtype=np.int64)
+    starts = np.array([int(s) for _, s, _ in periods], dtype=np.int64)
+    ends = np.array([int(e) for _, _, e in periods], dtype=np.int64)
+    idx = np.searchsorted(starts, ymd, side="right") - 1
+    ok = (idx >= 0) & (ymd <= ends[np.clip(idx, 0, None)])
+    return np.where(ok, idx, -1)
+
+def _load_span(key: str, start: str, end: str):
+    """원본 하나를 [start, end] 범위만 읽음 (land/move: 날짜 파티션, malso: CSV). 반환: (df, 날짜열)"""
+    if key == "malso":
+        if not P_MALSO_CSVS:
+            raise FileNotFoundError(f"일반용조서(말소용) CSV가 없습니다: {D.in_dir / D.inputs.get('malso', '')}")
+        df = pd.concat([read_csv_text(p) for p in P_MALSO_CSVS], ignore_index=True)
+        date_col, = resolve(df.columns).require("이동일자")
+        return compact(df, label="일반용조서(말소용)"), date_col
+    path = P_LAND_BASIC if key == "land" else P_MOVE_STATUS
+    date_col, = resolve(table_columns(path)).require("이동일자")
+    df, _, _ = period_split(path, date_col, start, end, outside=False)
+    return compact(df, label=f"{path.stem} {start}~{end}"), date_col
+
+def process_periods(keys: list[str], periods: list[tuple[str, str, str]], jobs: int | None):
+    """원본별 1회 로딩 → 구간 배정 1회 → 구간별 엑셀 동시 저장 + 집계 한 표"""
+    _print_section(f"여러 기간 — {len(periods)}개 구간 ({periods[0][1]} ~ {periods[-1][2]})")
+    PERIOD_DIR.mkdir(parents=True, exist_ok=True)
+    span = (periods[0][1], max(e for _, _, e in periods))
+    n_rows, agg_parts, jobs_list = [], [], []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for key in keys:
+            name, with_reason = MULTI_SOURCES[key]
+            df, date_col = _load_span(key, *span)
+            bucket = assign_buckets(df[date_col], periods)
+            reason_col = _reason_col(df.columns) if with_reason else None
+
+            groups = dict(tuple(df.groupby(bucket, sort=True)))
+            for i, (label, _, _) in enumerate(periods):
+                grp = groups.get(i)
+                n_rows.append({"원본": name, "기간": label, "건수": 0 if grp is None else len(grp)})
+                if grp is None:
+                    continue
+                out = PERIOD_DIR / f"{name}_{label}.xlsx"
+                target = _target_path(out)
+                jobs_list.append((target, pool.submit(save_table, grp, out, "기간_데이터", target)))
+                if reason_col:
+                    g = _groupby_count(grp, reason_col, "이동사유/종목")
+                    g.insert(0, "기간", label)
+                    g.insert(0, "원본", name)
+                    agg_parts.append(g)
+            print(f"- {name}: 범위 내 {len(df):,}건 → 구간 배정 {int((bucket >= 0).sum()):,}건")
+
+        for target, fut in jobs_list:
+            fut.result()
+            print(f"[저장] {target}")
+
+    counts = pd.DataFrame(n_rows).pivot(index="원본", columns="기간", values="건수")
+    print("\n[구간별 건수]")
+    print(counts[[p[0] for p in periods]].to_string())
+    if agg_parts:
+        summary = pd.concat(agg_parts, ignore_index=True)
+        table = (summary.pivot_table(index=["원본", "이동사유/종목"], columns="기간", values="건수",
+                                     aggfunc="sum", fill_value=0)
+                 .reindex(columns=[p[0] for p in periods], fill_value=0))
+        print("\n[구간별 이동사유/종목 집계]")
+        print(table.to_string())
+        out = PERIOD_DIR / "기간별_집계.xlsx"
+        target = _target_path(out)
+        save_table(table.reset_index(), out, sheet_name="기간별_집계", excel_path=target)
+        print(f"[저장] {target}")
+
 # -----------------------------
 # 실행
 # -----------------------------
+PROCESSORS = {
+    "land": process_land_basic,
+    "move": process_move_status,
+    "malso": process_malso_csv,
+}
+
 def main():
+    global DATE_RANGE, OVERWRITE, IN_ONLY
+    ap = argparse.ArgumentParser(description="기간 필터링 · 집계 · 엑셀저장")
+    ap.add_argument("--start", default=DATE_RANGE[0], help="시작일(YYYYMMDD)")
+    ap.add_argument("--end", default=DATE_RANGE[1], help="종료일(YYYYMMDD)")
+    ap.add_argument("--only", nargs="+", choices=list(PROCESSORS), default=list(PROCESSORS),
+                    help="처리할 원본 (기본: 전체)")
+    ap.add_argument("--overwrite", action="store_true", help="기존 엑셀 덮어쓰기(타임스탬프 미부여)")
+    ap.add_argument("--in-only", action="store_true", help="기간외 엑셀 저장 생략(기간 밖 파티션 미조회)")
+    multi = ap.add_mutually_exclusive_group()
+    multi.add_argument("--periods", nargs="+", default=None, help="여러 기간 YYYYMMDD-YYYYMMDD (구간별 저장)")
+    multi.add_argument("--by", choices=["month", "quarter"], default=None, help="--start~--end 를 월/분기 구간으로")
+    ap.add_argument("--jobs", type=int, default=None, help="여러 기간 모드 동시 저장 프로세스 수 (기본: CPU 수)")
+    args = ap.parse_args()
+    # 기간 경계: 숫자만 남긴 8자리(YYYYMMDD) — "2025-01-01" 도 허용, 정리일자와 같은 형식으로 비교
+    start, end = yyyymmdd(args.start, strict=True), yyyymmdd(args.end, strict=True)
+    if not start or not end:
+        ap.error(f"--start/--end 형식(YYYYMMDD) 확인: {args.start} / {args.end}")
+    if start > end:
+        ap.error(f"--start 가 --end 보다 늦습니다: {start} > {end}")
+    args.start, args.end = start, end
+    periods = None
+    if args.periods or args.by:
+        try:
+            periods = parse_periods(args.periods) if args.periods else make_periods(args.start, args.end, args.by)
+        except ValueError as e:  # 형식 오류·겹치는 기간 → 사용법과 함께 종료
+            ap.error(str(e).removeprefix("[오류] "))
+    track()  # 종료 시 최대 메모리 출력 (LANDMOVE_MEMORY=1 이면 절감 모드)
+    DATE_RANGE = (args.start, args.end)
+    OVERWRITE = args.overwrite
+    IN_ONLY = args.in_only
+
     print("[INFO] 입력 파일")
     print(" - 토지(임야)기본:", P_LAND_BASIC)
     print(" - 이동정리현황  :", P_MOVE_STATUS)
-    print(" - 일반용조서(CSV):", P_MALSO_CSV)
-
-    process_land_basic()
-    process_move_status()
-    process_malso_csv()
+    print(" - 일반용조서(CSV):", ", ".join(str(p) for p in P_MALSO_CSVS) or "(없음)")
+    if periods is not None:
+        print(f"[INFO] 기간: {len(periods)}개 구간 — {', '.join(p[0] for p in periods)}")
+        process_periods(args.only, periods, args.jobs)
+        return
+    print(f"[INFO] 기간: {DATE_RANGE[0]} ~ {DATE_RANGE[1]}")
+
+    for key in args.only:
+        PROCESSORS[key]()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,84 @@
+# =========================================================
+#  집계 큐브 조회 (롤업/슬라이스 — 행 단위 자료 미사용)
+# =========================================================
+
+# [목적]
+# - 3.데이터필터링_기간.py 가 저장한 집계 큐브(landmove.cube)만 읽어
+#   원하는 차원으로 합친 보고용 집계표를 출력/저장
+#   (월별·리별·신청구분별 보고를 위해 전체 자료를 다시 읽지 않음)
+
+# [입력 파일]
+# - ./1.data/out/집계큐브/토지(임야)기본.cube/, 이동정리현황.cube/
+
+# [출력 파일]  (--out 지정 시)
+# - 지정한 경로의 엑셀(텍스트 서식)
+
+# [실행 방법]
+# > python 3.집계큐브_조회.py --by 연월 신청구분
+# > python 3.집계큐브_조회.py --source land --by 연도 이동사유/종목 --where 연월=200301~202412
+# > python 3.집계큐브_조회.py --by 행정구역명 --where 신청구분=직권,대위신청 --out 1.data/out/리별_집계.xlsx
+#   * 차원: 이동사유/종목, 연월, 법정동코드, 행정구역명, 신청구분 (+ 파생: 연도, 읍면동코드)
+#   * --where: 차원=값 / 차원=값1,값2 / 차원=시작~끝 (양끝 포함)
+#   * --by 생략 시 전체 합계
+
+import sys
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # land_data (공통 모듈)
+from landmove.cube import DIMS, DERIVED, load_cube, query
+from landmove.store import save_table
+from landmove.district import current
+
+D = current("44250")   # 시군구 설정 (기본 44250)
+CUBE_DIR = D.out_dir / "집계큐브"
+SOURCES = {"land": "토지(임야)기본", "move": "이동정리현황"}
+
+
+def parse_where(specs: list[str]) -> dict:
+    """["차원=값", "차원=a,b", "차원=시작~끝"] → query 의 where (형식 오류·차원 아닌 이름은 ValueError)"""
+    where = {}
+    for spec in specs:
+        name, _, value = spec.partition("=")
+        if not value:
+            raise ValueError(f"[오류] --where 형식(차원=값) 확인: {spec}")
+        if name.strip() not in DIMS + list(DERIVED):
+            raise ValueError(f"[오류] --where 차원이 아닙니다: {name.strip()} (가능: {DIMS + list(DERIVED)})")
+        if "~" in value:
+            lo, hi = value.split("~", 1)
+            where[name.strip()] = (lo.strip() or None, hi.strip() or None)
+        elif "," in value:
+            where[name.strip()] = [v.strip() for v in value.split(",")]
+        else:
+            where[name.strip()] = value.strip()
+    return where
+
+
+def main():
+    ap = argparse.ArgumentParser(description="집계 큐브 조회 (롤업/슬라이스)")
+    ap.add_argument("--source", choices=list(SOURCES), default="move", help="큐브 원본 (기본: move)")
+    ap.add_argument("--by", nargs="*", default=[], choices=DIMS + list(DERIVED), help="합칠 차원")
+    ap.add_argument("--where", nargs="*", default=[], help="조건 (차원=값 / 값1,값2 / 시작~끝)")
+    ap.add_argument("--out", default=None, help="결과 엑셀 경로 (생략 시 콘솔만)")
+    args = ap.parse_args()
+    try:
+        where = parse_where(args.where)
+    except ValueError as e:  # 형식 오류·차원 아닌 이름 → 사용법과 함께 종료
+        ap.error(str(e).removeprefix("[오류] "))
+
+    cube_dir = CUBE_DIR / f"{SOURCES[args.source]}.cube"
+    if not (cube_dir / "cells.parquet").is_file():
+        print(f"[오류] 집계 큐브가 없습니다: {cube_dir} (3.데이터필터링_기간.py 를 먼저 실행)")
+        sys.exit(1)
+
+    cube = load_cube(cube_dir)
+    table = query(cube, by=args.by, where=where)
+    print(f"[INFO] 큐브: {cube_dir.name} ({len(cube.cells):,}개 셀) → {len(table):,}행")
+    print(table.to_string(index=False))
+    if args.out:
+        save_table(table, Path(args.out), sheet_name="큐브_조회")
+        print(f"[저장] {args.out}")
+
+
+if __name__ == "__main__":
+    main()
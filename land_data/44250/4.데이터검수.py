@@ -7,6 +7,10 @@
 #   다음 엑셀 파일들에서 컬럼(이동전_필지코드/이동후_필지코드/필지코드/PNU)
 #   중 존재하는 항목을 대상으로 행 단위 매칭 검색
 # - 매칭 결과를 콘솔에 출력하고, 파일별로 결과 엑셀을 저장
+# - PNU 역색인(SQLite)을 데이터 버전별로 한 번만 구축해 재사용
+#   → 검색마다 엑셀 전체를 다시 읽거나 PNU 컬럼을 스캔하지 않음
+#   * PNU 는 정수 키로 색인·조인(landmove.pnukey), 19자리 문자열은 결과를 보여줄 때만
+# - --pnu-file 로 PNU 수천 건을 한 번에 조회(원본별로 결과 묶음)
 
 # [입력 파일]  (BASE_DIR = ./1.data/out)
 # - ./1.data/out/이동정리현황_기간내.xlsx
@@ -17,24 +21,39 @@
 # - ./1.data/out/find/검색결과_이동정리현황_기간내.xlsx
 # - ./1.data/out/find/검색결과_일반용조서(말소용)_기간내.xlsx
 # - ./1.data/out/find/검색결과_토지(임야)기본_기간내.xlsx
+# - ./1.data/out/find/검색결과_<원본>_일괄.xlsx   (--pnu-file, 검색_PNU/매칭_컬럼 추가)
+# - ./1.data/out/.pnu_index.sqlite                (PNU 역색인, 원본이 바뀌면 자동 갱신)
 #   * 대상 파일이 없으면 건너뜀
 #   * 매칭 결과가 없으면 파일 저장 생략
 
 # [실행 방법]
-# > python 3-1데이터검수.py
+# > python 4.데이터검수.py
 # 입력 프롬프트에 검색할 PNU를 입력 (예: 4425031524100010003)
+# > python 4.데이터검수.py --pnu-file pnu목록.txt     # 한 줄에 PNU 1개
+# > python 4.데이터검수.py --rebuild                  # 색인 강제 재구축
 
 # [의존성]
 # - pandas, openpyxl
 
-import re
+import sys
+import argparse
 from pathlib import Path
+import numpy as np
 import pandas as pd
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # land_data (공통 모듈)
+from landmove.normalize import normalize_pnu
+from landmove.store import read_table
+from landmove.memory import compact, track
+from landmove.ingest import read_pnu_list
+from landmove.pnuindex import open_index, refresh_index, source_info, lookup, PNU_COL, MATCH_COL
+from landmove.pnukey import encode
+from landmove.district import current
+
 # -------------------------------
 # 경로 및 파일 지정
 # -------------------------------
-BASE_DIR = Path("./1.data/out")             # 원본 파일 폴더
+BASE_DIR = current("44250").out_dir  # 원본 파일 폴더 (시군구 설정, 기본 44250)
 TARGET_FILES = [
     "이동정리현황_기간내.xlsx",
     "일반용조서(말소용)_기간내.xlsx",
@@ -47,43 +66,35 @@ TARGET_COLS = ["이동전_필지코드", "이동후_필지코드", "필지코드
 SAVE_DIR = BASE_DIR / "find"
 SAVE_DIR.mkdir(parents=True, exist_ok=True)
 
+# PNU 역색인
+INDEX_DB = BASE_DIR / ".pnu_index.sqlite"
+
 
 # -------------------------------
 # 유틸 함수
 # -------------------------------
-def normalize_pnu(x: str) -> str:
-    """숫자만 남기고 19자리 zfill. None/NaN은 빈 문자열."""
-    if x is None:
-        return ""
-    s = re.sub(r"\D", "", str(x))
-    return s.zfill(19) if s else ""
-
-
 def load_excel(path: Path) -> pd.DataFrame:
-    """엑셀 첫 시트를 dtype=str로 로딩"""
-    df = pd.read_excel(path, dtype=str)
+    """단계 결과(.parquet 우선, 없으면 엑셀 첫 시트)를 문자열로 로딩 (결측은 NaN 그대로 — 색인에는 빈 값)
+    - 메모리 절감 모드(LANDMOVE_MEMORY=1)면 범주형/Arrow 문자열로 (landmove.memory)
+    """
+    df = read_table(path)
     df.columns = [str(c).strip() for c in df.columns]
-    for c in df.columns:
-        df[c] = df[c].astype(str)
-    return df
+    return compact(df, label=Path(path).name)
 
 
-def find_matches(df: pd.DataFrame, pnu_norm: str) -> tuple[pd.DataFrame, list[str]]:
-    """이동전_필지, 이동후_필지, 필지코드, pnu 중 존재하는 컬럼에서 검색"""
-    cols = [c for c in TARGET_COLS if c in df.columns]
-    if not cols:
-        return df.iloc[0:0], []
+def load_index(rebuild: bool = False):
+    """PNU 역색인 열기: 원본(.parquet/xlsx) 내용이 바뀐 파일만 다시 색인"""
+    if rebuild and INDEX_DB.exists():
+        INDEX_DB.unlink()
+    conn = open_index(INDEX_DB)
+    sources = {f: BASE_DIR / f for f in TARGET_FILES if (BASE_DIR / f).exists()}
+    rebuilt = refresh_index(conn, sources, TARGET_COLS, load_excel)
+    if rebuilt:
+        print(f"[INFO] PNU 색인 갱신: {rebuilt}")
+    return conn
 
-    mask = None
-    for c in cols:
-        norm = df[c].map(normalize_pnu)
-        m = (norm == pnu_norm)
-        mask = m if mask is None else (mask | m)
 
-    return df.loc[mask].copy(), cols
-
-
-def print_and_save(title: str, df: pd.DataFrame, used_cols, save_path: Path):
+def print_and_save(title: str, df: pd.DataFrame, used_cols, save_path: Path, show: bool = True):
     print("=" * 90)
     print(f"[{title}] 검색 사용 컬럼: {used_cols}")
     print(f"[{title}] 매칭 건수: {len(df)}")
@@ -93,10 +104,11 @@ def print_and_save(title: str, df: pd.DataFrame, used_cols, save_path: Path):
         return
 
     # 화면 출력
-    with pd.option_context("display.max_rows", None,
-                           "display.max_columns", None,
-                           "display.width", 240):
-        print(df.to_string(index=False))
+    if show:
+        with pd.option_context("display.max_rows", None,
+                               "display.max_columns", None,
+                               "display.width", 240):
+            print(df.to_string(index=False))
 
     # 엑셀 저장
     try:
@@ -107,33 +119,76 @@ def print_and_save(title: str, df: pd.DataFrame, used_cols, save_path: Path):
 
 
 # -------------------------------
-# 메인
+# 검색
 # -------------------------------
-if __name__ == "__main__":
-    # 검색할 필지코드 입력
-    target_pnu = input("검색할 필지코드를 입력하세요: ").strip()
-    pnu_norm = normalize_pnu(target_pnu)
-
-    print(f"[INFO] 검색 PNU(정규화): {pnu_norm}")
-    print(f"[INFO] 원본 경로: {BASE_DIR}")
-    print(f"[INFO] 결과 저장 경로: {SAVE_DIR}")
-
+def search_one(conn, pnu_norm: str):
+    """PNU 1건: 파일별 매칭 행 출력/저장 (기존 출력 형식 유지)"""
+    found = lookup(conn, [pnu_norm])
+    info = source_info(conn)
     for fname in TARGET_FILES:
         fpath = BASE_DIR / fname
-        if not fpath.exists():
+        if fname not in info:
             print("=" * 90)
             print(f"[{fname}] 파일 없음: {fpath}")
             continue
 
-        try:
-            df = load_excel(fpath)
-            matched, used_cols = find_matches(df, pnu_norm)
+        matched = found[fname].drop(columns=[PNU_COL, MATCH_COL])
+        save_path = SAVE_DIR / f"검색결과_{Path(fname).stem}.xlsx"
+        print_and_save(fname, matched, info[fname]["pnu_cols"], save_path)
 
-            save_name = f"검색결과_{Path(fname).stem}.xlsx"
-            save_path = SAVE_DIR / save_name
 
-            print_and_save(fname, matched, used_cols, save_path)
-
-        except Exception as e:
+def search_batch(conn, pnus: list[str]):
+    """PNU 여러 건: 원본별로 묶어 건수 출력 + 결과 저장, 미매칭 PNU 보고"""
+    found = lookup(conn, pnus)
+    info = source_info(conn)
+    hits = []
+    for fname in TARGET_FILES:
+        if fname not in info:
             print("=" * 90)
-            print(f"[{fname}] 처리 오류: {e}")
+            print(f"[{fname}] 파일 없음: {BASE_DIR / fname}")
+            continue
+
+        matched = found[fname]
+        hits.append(encode(matched[PNU_COL]))
+        save_path = SAVE_DIR / f"검색결과_{Path(fname).stem}_일괄.xlsx"
+        print_and_save(fname, matched, info[fname]["pnu_cols"], save_path, show=False)
+        if len(matched):
+            print(f"[{fname}] 매칭 PNU 수: {matched[PNU_COL].nunique()}")
+
+    found_keys = np.concatenate(hits) if hits else np.empty(0, dtype=np.uint64)
+    missing = [p for p, m in zip(pnus, np.isin(encode(pnus), found_keys, invert=True)) if m]
+    print("=" * 90)
+    print(f"[INFO] 조회 PNU {len(pnus)}건 / 매칭 {len(pnus) - len(missing)}건 / 미매칭 {len(missing)}건")
+    for p in missing[:20]:
+        print(f"  - {p}")
+    if len(missing) > 20:
+        print(f"  ... 외 {len(missing) - 20}건")
+
+
+# -------------------------------
+# 메인
+# -------------------------------
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="PNU 검색기 (역색인)")
+    ap.add_argument("--pnu-file", help="PNU 목록 파일(한 줄에 1개) — 일괄 조회")
+    ap.add_argument("--rebuild", action="store_true", help="PNU 색인 강제 재구축")
+    args = ap.parse_args()
+    track()  # 종료 시 최대 메모리 출력
+
+    print(f"[INFO] 원본 경로: {BASE_DIR}")
+    print(f"[INFO] 결과 저장 경로: {SAVE_DIR}")
+    conn = load_index(args.rebuild)
+
+    try:
+        if args.pnu_file:
+            pnus = read_pnu_list(Path(args.pnu_file))
+            print(f"[INFO] 일괄 조회: {args.pnu_file} ({len(pnus)}건)")
+            search_batch(conn, pnus)
+        else:
+            # 검색할 필지코드 입력
+            target_pnu = input("검색할 필지코드를 입력하세요: ").strip()
+            pnu_norm = normalize_pnu(target_pnu)
+            print(f"[INFO] 검색 PNU(정규화): {pnu_norm}")
+            search_one(conn, pnu_norm)
+    finally:
+        conn.close()
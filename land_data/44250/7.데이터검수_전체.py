@@ -8,6 +8,11 @@
 #   전체에서 OR 매칭하여 연결된 레코드를 너비우선탐색(BFS)으로 확장
 # - 매칭된 각 행에 최소 hop(연결 깊이)을 기록해 콘솔 출력 및 파일별 결과 저장
 # - MAX_DEPTH로 탐색 깊이 제한 가능(기본: 무제한, 신규 PNU가 없을 때 종료)
+# - PNU 연계 그래프(CSR + union-find)를 데이터 버전별로 한 번만 구축해 재사용
+#   → 깊이마다 파일 전체를 isin 으로 다시 스캔하지 않음 (landmove.lineage)
+#   * 행 내용은 4.데이터검수 와 같은 PNU 색인(.pnu_index.sqlite)에서 꺼냄
+#   * PNU 는 정수 키로 보관·탐색(landmove.pnukey), 19자리 문자열은 결과를 내보낼 때만
+# - --components: 기간내 전체 PNU의 연계 구성(노드/간선 목록) 저장
 
 # [입력 파일]  (BASE_DIR = ./1.data/out)
 # - ./1.data/out/이동정리현황_기간내.xlsx
@@ -18,10 +23,15 @@
 # - ./1.data/out/out/find/검색결과_이동정리현황_기간내_연계.xlsx
 # - ./1.data/out/out/find/검색결과_일반용조서(말소용)_기간내_연계.xlsx
 # - ./1.data/out/out/find/검색결과_토지(임야)기본_기간내_연계.xlsx
+# - ./1.data/out/out/find/연계그래프_노드.xlsx  (--components: PNU, 연계ID, 연계_PNU수)
+# - ./1.data/out/out/find/연계그래프_간선.xlsx  (--components: PNU_A, PNU_B, 연계ID, 원본, 행위치)
+# - ./1.data/out/.pnu_index.sqlite, ./1.data/out/.pnu_graph.npz (색인/그래프, 원본이 바뀌면 자동 갱신)
 #   * 파일이 없거나 PNU 후보 컬럼이 없으면 해당 파일은 건너뜀
 
 # [실행 방법]
 # > python <이파일이름>.py
+# > python <이파일이름>.py --components     # 전체 연계 구성 저장
+# > python <이파일이름>.py --rebuild        # 색인/그래프 강제 재구축
 # 프롬프트:
 # - 시작 PNU 입력 (예: 4425031524100010003)
 # 출력:
@@ -43,15 +53,24 @@
 #   "./1.data/out/out/find"가 됩니다. 일반적으로 "./1.data/out/find"를 원한다면
 #   코드에서 SAVE_DIR = BASE_DIR/"find" 로 수정하세요.
 
-import re
+import sys
+import argparse
 from pathlib import Path
 import pandas as pd
-from collections import defaultdict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # land_data (공통 모듈)
+from landmove.normalize import normalize_pnu
+from landmove.store import read_table
+from landmove.memory import compact, track
+from landmove.excel import save_text_excel
+from landmove.pnuindex import open_index, refresh_index, source_info, fetch_rows
+from landmove.lineage import load_graph
+from landmove.district import current
 
 # -------------------------------
 # 경로 및 파일 지정
 # -------------------------------
-BASE_DIR = Path("./1.data/out")             # 원본 파일 폴더
+BASE_DIR = current("44250").out_dir  # 원본 파일 폴더 (시군구 설정, 기본 44250)
 TARGET_FILES = [
     "이동정리현황_기간내.xlsx",
     "일반용조서(말소용)_기간내.xlsx",
@@ -68,107 +87,47 @@ SAVE_DIR.mkdir(parents=True, exist_ok=True)
 # 연계 탐색 깊이 (None 이면 신규 PNU가 더 안 나올 때까지)
 MAX_DEPTH = None  # 예: 5 로 제한하려면 5로 설정
 
+# PNU 색인(4.데이터검수 와 공유) / 연계 그래프
+INDEX_DB = BASE_DIR / ".pnu_index.sqlite"
+GRAPH_FILE = BASE_DIR / ".pnu_graph.npz"
+
 
 # -------------------------------
 # 유틸 함수
 # -------------------------------
-def normalize_pnu(x: str) -> str:
-    """숫자만 남기고 19자리 zfill. None/NaN은 빈 문자열."""
-    if x is None:
-        return ""
-    s = re.sub(r"\D", "", str(x))
-    return s.zfill(19) if s else ""
-
-
 def load_excel(path: Path) -> pd.DataFrame:
-    """엑셀 첫 시트를 dtype=str로 로딩"""
-    df = pd.read_excel(path, dtype=str)
+    """단계 결과(.parquet 우선, 없으면 엑셀 첫 시트)를 문자열로 로딩 (결측은 NaN 그대로 — 색인에는 빈 값)
+    - 메모리 절감 모드(LANDMOVE_MEMORY=1)면 범주형/Arrow 문자열로 (landmove.memory)
+    """
+    df = read_table(path)
     df.columns = [str(c).strip() for c in df.columns]
-    for c in df.columns:
-        df[c] = df[c].astype(str)
-    return df
+    return compact(df, label=Path(path).name)
 
 
-def pnu_cols_in(df: pd.DataFrame) -> list[str]:
-    """데이터프레임에 존재하는 PNU 후보 컬럼 반환"""
-    return [c for c in TARGET_COLS if c in df.columns]
+def load_graph_index(rebuild: bool = False):
+    """PNU 색인 갱신(바뀐 원본만) 후 연계 그래프 로딩(색인이 같으면 저장본 재사용)"""
+    if rebuild:
+        for f in (INDEX_DB, GRAPH_FILE):
+            if f.exists():
+                f.unlink()
+    conn = open_index(INDEX_DB)
+    sources = {f: BASE_DIR / f for f in TARGET_FILES if (BASE_DIR / f).exists()}
+    rebuilt = refresh_index(conn, sources, TARGET_COLS, load_excel)
+    if rebuilt:
+        print(f"[INFO] PNU 색인 갱신: {rebuilt}")
+    return conn, load_graph(conn, GRAPH_FILE, TARGET_COLS)
 
 
-def add_norm_columns(df: pd.DataFrame, cols: list[str]) -> list[str]:
-    """cols 각각에 대해 정규화 컬럼을 추가하고, 생성된 정규화 컬럼명을 반환"""
-    norm_cols = []
-    for c in cols:
-        nc = f"__norm__{c}"
-        if nc not in df.columns:
-            df[nc] = df[c].map(normalize_pnu)
-        norm_cols.append(nc)
-    return norm_cols
+def matched_rows(conn, fname: str, used_cols: list[str], row_hops: dict[int, int]) -> pd.DataFrame:
+    """매칭 행 + 정규화 컬럼(__norm__*) + hop (기존 결과 형식)"""
+    out = fetch_rows(conn, fname, sorted(row_hops))
+    for c in used_cols:
+        out[f"__norm__{c}"] = normalize_pnu(out[c])
+    out["__hop__"] = [row_hops[i] for i in out.index]
+    return out
 
 
-def extract_pnus_from_rows(df: pd.DataFrame, rows_idx, norm_cols: list[str]) -> set[str]:
-    """선택된 행들에서 norm_cols의 PNU들을 모두 추출하여 집합으로 반환"""
-    if len(rows_idx) == 0:
-        return set()
-    sub = df.loc[rows_idx, norm_cols]
-    vals = set()
-    for c in norm_cols:
-        vals.update(sub[c].dropna().tolist())
-    vals.discard("")  # 빈값 제거
-    return vals
-
-
-# -------------------------------
-# BFS (모든 파일 전역 확장)
-# -------------------------------
-def bfs_expand(all_dfs: dict, start_pnu: str) -> tuple[dict, set[str]]:
-    """
-    all_dfs: {fname: (df, norm_cols, used_cols)}
-    start_pnu: 시작 PNU(정규화)
-    반환:
-      - per_file_matches: {fname: {row_index: hop}}  # 발견 행의 최소 hop
-      - discovered_pnus: set[str]  # 최종 발견된 모든 PNU
-    """
-    discovered = set([start_pnu])
-    frontier = set([start_pnu])
-    per_file_matches = {fname: dict() for fname in all_dfs.keys()}  # row_index -> hop
-
-    depth = 0
-    while frontier and (MAX_DEPTH is None or depth <= MAX_DEPTH):
-        next_frontier = set()
-        # 각 파일에서 frontier와 매칭되는 행 찾기
-        for fname, (df, norm_cols, _) in all_dfs.items():
-            # 행 매칭 (OR)
-            mask = None
-            for nc in norm_cols:
-                m = df[nc].isin(frontier)
-                mask = m if mask is None else (mask | m)
-            matched_idx = df.index[mask] if mask is not None else []
-
-            # 행 hop 기록(최소 hop만 유지)
-            for ridx in matched_idx:
-                if ridx not in per_file_matches[fname]:
-                    per_file_matches[fname][ridx] = depth
-
-            # 매칭된 행에서 신규 PNU 추출
-            new_pnus = extract_pnus_from_rows(df, matched_idx, norm_cols)
-            # 아직 발견되지 않았던 것만 다음 frontier로
-            for p in new_pnus:
-                if p and p not in discovered:
-                    next_frontier.add(p)
-
-        # frontier 갱신
-        discovered |= next_frontier
-        frontier = next_frontier
-        depth += 1
-
-        # 깊이 제한 체크 (depth는 0부터 시작하므로, MAX_DEPTH가 0이면 시작 PNU만)
-        if MAX_DEPTH is not None and depth > MAX_DEPTH:
-            break
-
-    return per_file_matches, discovered
-
-
-def print_and_save(fname: str, df: pd.DataFrame, used_cols: list[str], row_hops: dict[int, int], save_dir: Path):
+def print_and_save(fname: str, conn, used_cols: list[str], row_hops: dict[int, int], save_dir: Path):
     print("=" * 96)
     print(f"[{fname}] 사용 PNU 컬럼: {used_cols or '없음'} / 매칭 행: {len(row_hops)}")
     if len(row_hops) == 0:
@@ -176,9 +135,7 @@ def print_and_save(fname: str, df: pd.DataFrame, used_cols: list[str], row_hops:
         return
 
     # 매칭된 행만 추출 + hop 정보 추가
-    rows = sorted(row_hops.keys())
-    out = df.loc[rows].copy()
-    out["__hop__"] = [row_hops[i] for i in rows]
+    out = matched_rows(conn, fname, used_cols, row_hops)
 
     with pd.option_context("display.max_rows", None,
                            "display.max_columns", None,
@@ -194,10 +151,48 @@ def print_and_save(fname: str, df: pd.DataFrame, used_cols: list[str], row_hops:
         print(f"[{fname}] 저장 실패: {e}")
 
 
+# -------------------------------
+# 일괄: 연계 구성
+# -------------------------------
+def save_components(graph, save_dir: Path):
+    """기간내 전체 PNU의 연계 구성(노드/간선 목록) 저장"""
+    nodes, edges = graph.node_edge_lists()
+    print(f"[SUMMARY] PNU {len(nodes):,}개 / 연계 {nodes['연계ID'].nunique():,}개 / 간선 {len(edges):,}개")
+    for name, df in (("연계그래프_노드.xlsx", nodes), ("연계그래프_간선.xlsx", edges)):
+        save_text_excel(df, save_dir / name, sheet_name=Path(name).stem)
+        print(f"[저장] {save_dir / name}")
+
+
 # -------------------------------
 # 메인
 # -------------------------------
 if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="BFS 연계 탐색 (연계 그래프)")
+    ap.add_argument("--components", action="store_true", help="전체 연계 구성(노드/간선) 저장")
+    ap.add_argument("--rebuild", action="store_true", help="PNU 색인/연계 그래프 강제 재구축")
+    args = ap.parse_args()
+    track()  # 종료 시 최대 메모리 출력
+
+    # 1) PNU 색인 / 연계 그래프 준비 (원본이 바뀐 경우에만 재구축)
+    conn, graph = load_graph_index(args.rebuild)
+    info = source_info(conn)
+    for fname in TARGET_FILES:
+        fpath = BASE_DIR / fname
+        if fname not in info:
+            print("=" * 96)
+            print(f"[{fname}] 파일 없음: {fpath}")
+        elif not info[fname]["pnu_cols"]:
+            print("=" * 96)
+            print(f"[{fname}] 참고: PNU 후보 컬럼이 없습니다. ({TARGET_COLS})")
+    used = {f: m["pnu_cols"] for f, m in info.items() if m["pnu_cols"]}  # 연계에 기여하는 파일만
+
+    if not used:
+        raise SystemExit("[ERROR] 로딩 가능한 파일이 없습니다.")
+
+    if args.components:
+        save_components(graph, SAVE_DIR)
+        raise SystemExit(0)
+
     # 검색할 필지코드 입력
     target_pnu = input("검색할 필지코드를 입력하세요: ").strip()
     pnu_norm = normalize_pnu(target_pnu)
@@ -207,33 +202,8 @@ if __name__ == "__main__":
     print(f"[INFO] 결과 저장 경로  : {SAVE_DIR}")
     print(f"[INFO] 깊이 제한       : {'무제한' if MAX_DEPTH is None else MAX_DEPTH}")
 
-    # 1) 파일 로딩 및 정규화 컬럼 준비
-    all_dfs = {}  # fname -> (df, norm_cols, used_cols)
-    for fname in TARGET_FILES:
-        fpath = BASE_DIR / fname
-        if not fpath.exists():
-            print("=" * 96)
-            print(f"[{fname}] 파일 없음: {fpath}")
-            continue
-        try:
-            df = load_excel(fpath)
-            used_cols = pnu_cols_in(df)
-            if not used_cols:
-                print("=" * 96)
-                print(f"[{fname}] 참고: PNU 후보 컬럼이 없습니다. ({TARGET_COLS})")
-                # 그래도 all_dfs에는 넣지 않음(연계에 기여하지 못함)
-                continue
-            norm_cols = add_norm_columns(df, used_cols)
-            all_dfs[fname] = (df, norm_cols, used_cols)
-        except Exception as e:
-            print("=" * 96)
-            print(f"[{fname}] 로딩 실패: {e}")
-
-    if not all_dfs:
-        raise SystemExit("[ERROR] 로딩 가능한 파일이 없습니다.")
-
-    # 2) BFS로 모든 파일을 가로질러 연계 확장
-    per_file_matches, discovered_pnus = bfs_expand(all_dfs, pnu_norm)
+    # 2) 연계 그래프에서 hop 별 확장
+    per_file_matches, discovered_pnus = graph.expand(pnu_norm, MAX_DEPTH)
 
     print("=" * 96)
     print(f"[SUMMARY] 발견된 PNU 개수: {len(discovered_pnus)}")
@@ -241,6 +211,7 @@ if __name__ == "__main__":
     # print(sorted(discovered_pnus))
 
     # 3) 파일별 출력/저장
-    for fname, (df, norm_cols, used_cols) in all_dfs.items():
-        row_hops = per_file_matches.get(fname, {})
-        print_and_save(fname, df, used_cols, row_hops, SAVE_DIR)
+    for fname in TARGET_FILES:
+        if fname in used:
+            print_and_save(fname, conn, used[fname], per_file_matches.get(fname, {}), SAVE_DIR)
+    conn.close()
@@ -1,66 +1,98 @@
 # =========================================================
-#  이동정리현황_기간내.xlsx → MySQL 테이블 업로드 스크립트
+#  이동정리현황_기간내.xlsx → MySQL(또는 SQLite) 테이블 업로드 스크립트
 # =========================================================
 
 # [목적]
 # - 기간내 엑셀 파일(이동정리현황_기간내.xlsx)을 읽어
 #   모든 컬럼을 문자열(VARCHAR)로 변환하여 MySQL DB에 적재
-# - 선행 0 보존을 위해 dtype=str 로 로딩, VARCHAR(255) 매핑
+# - 선행 0 보존을 위해 dtype=str 로 로딩
+# - 컬럼 타입(landmove.schema): 필지코드 CHAR(19), 정리일자 CHAR(8), 면적 DECIMAL(15,2), 그 외 VARCHAR(255)
+# - 보조 인덱스: 이동전_필지코드, 이동후_필지코드, 정리일자 (적재 후 생성)
+# - 적재한 원본 지문을 landmove._load_meta 에 기록 (landmove.loadmeta)
 # - 문자셋/콜레이션은 utf8mb4_general_ci 로 강제 설정
+# - --bulk: LOAD DATA LOCAL INFILE 대량 적재(불가하면 다중행 INSERT 로 대체), 경로별 rows/sec 출력
+# - --upsert: DROP/재생성 대신 자연키 + 행 내용 해시로 신규·변경 행만 기록 (landmove.upsert)
+#   --tombstone: 추출본에 없는 행 삭제표시(deleted_at) → 10.토지이동흐름도_xml 조회에서 제외
+# - --sqlite / --db-url: MySQL 서버 없이 로컬 SQLite(WAL) 파일에 같은 스키마로 적재 (landmove.storage)
 
 # [입력 파일]
 # - ./1.data/out/이동정리현황_기간내.xlsx
 
 # [출력 대상 (DB)]
-# - DB: landmove
+# - DB: landmove (--sqlite: ./1.data/out/landmove.sqlite)
 # - Table: land_move
-# - 컬럼 타입: VARCHAR(255)
+# - 컬럼 타입: CHAR(19) / CHAR(8) / DECIMAL(15,2) / VARCHAR(255)
 
 # [실행 방법]
 # > python <이파일이름>.py
+# > python <이파일이름>.py --bulk      # LOAD DATA LOCAL INFILE (서버 local_infile=ON 필요)
+# > python <이파일이름>.py --upsert --tombstone   # 증분 적재 + 사라진 행 삭제표시
+# > python <이파일이름>.py --sqlite    # 로컬 SQLite 파일 (--db-url sqlite:///경로 로 위치 지정)
 # 성공 시: "[OK] landmove.land_move 적재 완료" 출력
 
 # [의존성]
 # - pandas
-# - sqlalchemy
-# - pymysql (MySQL 드라이버)
+# - pymysql (MySQL 드라이버, SQLite 는 표준 라이브러리 sqlite3)
 
 # [주의]
 # - DB_USER, DB_PASS, DB_HOST, DB_PORT, DB_NAME, TABLE 값을
-#   실제 환경에 맞게 수정해야 함
-# - 테이블이 기존에 존재하면 if_exists="replace" 로 DROP 후 재생성됨
+#   실제 환경에 맞게 수정해야 함 (또는 --db-url / 환경변수 LANDMOVE_DB_URL)
+# - 테이블이 기존에 존재하면 DROP 후 재생성됨 (--upsert 가 아닐 때)
+#   (스키마는 landmove.schema.create_table, 행은 백엔드별 대량 적재 경로로 적재)
 
 import re
-import pandas as pd
-from sqlalchemy import create_engine, text
-from sqlalchemy.types import String
+import sys
+import argparse
+from pathlib import Path
 
-EXCEL_PATH = "./1.data/out/이동정리현황_기간내.xlsx"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # land_data (공통 모듈)
+from landmove.store import read_table
+from landmove.storage import open_storage, mysql_url, resolve_url, add_storage_args
+from landmove.upsert import upsert_frame
+from landmove.schema import create_table, coerce_frame, ensure_indexes
+from landmove.loadmeta import source_fingerprint, record_load
+from landmove.district import current
+
+EXCEL_PATH = current("44250").out_dir / "이동정리현황_기간내.xlsx"  # 시군구 설정(기본 44250) 작업 폴더
 DB_USER, DB_PASS = "root", 1234 
 DB_HOST, DB_PORT = "127.0.0.1", 3306
 DB_NAME, TABLE   = "landmove", "land_move"
 
-# 1) 엑셀 로딩
-df = pd.read_excel(EXCEL_PATH, dtype=str).fillna("")
+ap = argparse.ArgumentParser(description="이동정리현황_기간내 → land_move 적재 (MySQL / SQLite)")
+ap.add_argument("--bulk", action="store_true", help="LOAD DATA LOCAL INFILE 대량 적재 (불가하면 다중행 INSERT)")
+ap.add_argument("--upsert", action="store_true", help="자연키+내용 해시 기준 증분 적재 (신규·변경 행만)")
+ap.add_argument("--tombstone", action="store_true", help="--upsert 시 추출본에 없는 행 삭제표시(deleted_at)")
+add_storage_args(ap)
+args = ap.parse_args()
+if args.tombstone and not args.upsert:
+    ap.error("--tombstone 은 --upsert 와 함께 사용")
+
+# 1) 기간내 자료 로딩 (.parquet 우선)
+df = read_table(EXCEL_PATH).fillna("")
 df.columns = [re.sub(r"\s+", "", str(c)) for c in df.columns]  # 컬럼명 공백 제거
+df = coerce_frame(df)  # 면적 → 숫자(빈값 NULL)
 
-# 2) 엔진 (utf8mb4 지정)
-engine = create_engine(
-    f"mysql+pymysql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}?charset=utf8mb4",
-    pool_pre_ping=True,
-    isolation_level="AUTOCOMMIT",
-)
+# 2) 연결 (MySQL: utf8mb4 / utf8mb4_general_ci 세션 고정, SQLite: WAL)
+st = open_storage(resolve_url(args.db_url, args.sqlite, EXCEL_PATH.parent,
+                              mysql_url(DB_USER, DB_PASS, DB_HOST, DB_PORT, DB_NAME)))
+print(f"[INFO] DB: {st.describe()}")
+conn = st.connect(local_infile=args.bulk)
 
-# 3) 세션 문자셋/콜레이션 고정(방어적) - general_ci로 맞춤
-with engine.begin() as conn:
-    conn.execute(text("SET NAMES utf8mb4 COLLATE utf8mb4_general_ci"))
-    conn.execute(text("SET character_set_client = utf8mb4"))
-    conn.execute(text("SET character_set_results = utf8mb4"))
-    conn.execute(text("SET collation_connection = utf8mb4_general_ci"))
+try:
+    # 3) 적재: 테이블 재생성(스키마만) → 행 적재
+    #    --upsert: 테이블이 없을 때만 생성 → 신규·변경 행만 기록
+    #    PNU CHAR(19) / 정리일자 CHAR(8) / 면적 DECIMAL / 그 외 VARCHAR (선행0 보존)
+    create_table(st, conn, TABLE, df, replace=not args.upsert)
+    if args.upsert:
+        upsert_frame(st, conn, TABLE, df, tombstone=args.tombstone, bulk=args.bulk)
+    else:
+        st.load_rows(conn, TABLE, df, bulk=args.bulk)
+    ensure_indexes(st, conn, TABLE)  # 재생성 시 적재 후 인덱스 생성(적재 속도)
+    conn.commit()
 
-# 4) 적재
-dtype_map = {col: String(255) for col in df.columns}  # 모두 VARCHAR로 (선행0 보존)
-df.to_sql(TABLE, engine, if_exists="replace", index=False,
-          dtype=dtype_map, method="multi", chunksize=1000)
+    # 4) 적재 기록(원본 지문) → 12.토지이동흐름도_서비스 캐시 무효화 기준
+    record_load(st, conn, TABLE, EXCEL_PATH, source_fingerprint(EXCEL_PATH), len(df))
+finally:
+    conn.close()
 
 print(f"[OK] {DB_NAME}.{TABLE} 적재 완료")
@@ -7,7 +7,11 @@
 # - 컬럼명에 '소유'가 포함된 컬럼은 소유자연혁(land_own), 나머지는 토지이동연혁(land_his)으로 분리
 # - 분리된 두 DataFrame을 각각:
 #   1) 텍스트 서식으로 엑셀 저장
-#   2) MySQL DB에 적재 (스키마 자동 생성/갱신, 데이터 삽입 전 삭제)
+#   2) DB에 적재 (스키마 자동 생성/갱신, 데이터 삽입 전 삭제) — MySQL 또는 SQLite(landmove.storage)
+# - --bulk: LOAD DATA LOCAL INFILE 대량 적재(불가하면 다중행 INSERT 로 대체), 경로별 rows/sec 출력
+# - --upsert: 전체 삭제 후 재적재 대신 자연키(정리일자/일련번호/이동전·이동후 필지코드/종목) +
+#   행 내용 해시로 신규·변경 행만 기록 (landmove.upsert), --tombstone: 추출본에 없는 행 삭제표시
+#   * land_own 에도 자연키 컬럼을 함께 적재(엑셀 출력은 기존과 동일)
 
 # [입력 파일]
 # - 우선순위:
@@ -19,46 +23,58 @@
 # - ./1.data/out/소유자연혁_split.xlsx
 
 # [출력 DB]
-# - DB: landmove (없으면 생성)
+# - DB: landmove (없으면 생성) / --sqlite: ./1.data/out/landmove.sqlite
 # - Table: land_his (토지이동연혁)
 # - Table: land_own (소유자연혁)
-# - id BIGINT AUTO_INCREMENT PRIMARY KEY 자동 생성
+# - id 자동 증가 기본키 자동 생성 (MySQL BIGINT AUTO_INCREMENT / SQLite INTEGER AUTOINCREMENT)
 # - 컬럼명: 비영문/공백 등은 안전한 이름으로 치환
-# - 타입 추론: 값 길이가 255자 초과면 TEXT, 아니면 VARCHAR(255)
+# - 타입(landmove.schema): 필지코드 CHAR(19), 정리일자 CHAR(8), 면적 DECIMAL(15,2),
+#   그 외 값 길이가 255자 초과면 TEXT, 아니면 VARCHAR(255)
+# - 보조 인덱스: 이동전_필지코드, 이동후_필지코드, 정리일자 (기존 테이블에도 없으면 추가)
 
 # [실행 방법]
 # > python <이파일이름>.py
+# > python <이파일이름>.py --bulk      # LOAD DATA LOCAL INFILE (서버 local_infile=ON 필요)
+# > python <이파일이름>.py --upsert --tombstone   # 증분 적재 + 사라진 행 삭제표시(deleted_at)
+# > python <이파일이름>.py --sqlite    # MySQL 서버 없이 로컬 SQLite(WAL) 파일에 적재
+# > python <이파일이름>.py --db-url sqlite:///C:/work/landmove.sqlite
 
 # [의존성]
 # - pandas
 # - openpyxl
-# - pymysql
+# - pymysql (MySQL 사용 시, SQLite 는 표준 라이브러리 sqlite3)
 
 # [주의]
-# - DB_HOST/PORT/USER/PASS/NAME 은 코드 내 상수 또는 환경변수로 설정
-# - 테이블이 존재할 경우, 없는 컬럼은 자동 추가 (VARCHAR(255))
-# - 데이터 적재 시 기존 행은 모두 삭제 후 새 데이터 삽입
+# - DB_HOST/PORT/USER/PASS/NAME 은 코드 내 상수 또는 환경변수로 설정 (LANDMOVE_DB_URL 이 있으면 우선)
+# - 테이블이 존재할 경우, 없는 컬럼은 자동 추가 (위 타입 규칙), 기존 컬럼 타입은 유지
+# - 데이터 적재 시 기존 행은 모두 삭제 후 새 데이터 삽입 (--upsert 가 아닐 때)
 
 from pathlib import Path
+import argparse
 import glob
 import os
 import re
-from typing import Tuple, List
+import sys
+from typing import Tuple
 
 import pandas as pd
-import pymysql
-from openpyxl import Workbook, load_workbook
-from openpyxl.utils.dataframe import dataframe_to_rows
-from openpyxl.styles import numbers
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # land_data (공통 모듈)
+from landmove.excel import save_text_excel
+from landmove.store import read_table
+from landmove.storage import open_storage, mysql_url, resolve_url, add_storage_args
+from landmove.upsert import upsert_frame, KEY_COLS
+from landmove.schema import mysql_type, create_table, coerce_frame, ensure_indexes
+from landmove.district import current
 
 # ============== 사용자 설정(필요시 수정) ==============
 # 파일 검색 우선순위
+BASE_DIR = current("44250").work_dir  # 시군구 설정(기본 44250) 작업 폴더 (실행 폴더 무관)
 CANDIDATE_PATHS = [
-    Path("./1.data/out/이동정리현황_기간내.xlsx"),
-    Path("./1.data/out/이동정리현황_기간내.xlsx"),
+    BASE_DIR / "1.data" / "out" / "이동정리현황_기간내.xlsx",
 ]
 
-OUT_DIR = Path("./1.data/out")
+OUT_DIR = BASE_DIR / "1.data" / "out"
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 # 출력 파일명
@@ -83,16 +99,16 @@ def find_input_file() -> Path:
             return p
 
     # fallback: 44250 폴더 전체 스캔
-    for p in glob.glob("./1.data/in/*.xlsx"):
+    for p in glob.glob(str(BASE_DIR / "1.data" / "in" / "*.xlsx")):
         if "이동정리현황" in Path(p).name:
             return Path(p)
 
-    raise FileNotFoundError("입력 엑셀을 찾지 못했습니다. ./out 또는 ./1.data/in/ 경로를 확인하세요.")
+    raise FileNotFoundError("입력 엑셀을 찾지 못했습니다. ./1.data/out 또는 ./1.data/in/ 경로를 확인하세요.")
 
 def read_excel_as_text(path: Path) -> pd.DataFrame:
-    """엑셀을 모든 값을 문자열로 읽기 (선행 0 보존). 빈값은 빈문자열로 통일."""
+    """엑셀(.parquet 우선)을 모든 값을 문자열로 읽기 (선행 0 보존). 빈값은 빈문자열로 통일."""
     # dtype=str로 읽더라도 NaN이 생길 수 있어 후처리
-    df = pd.read_excel(path, dtype=str)
+    df = read_table(path)
     df = df.fillna("")  # 결측을 빈문자열로
     # 열 이름 좌우 공백 제거
     df.columns = [str(c).strip() for c in df.columns]
@@ -115,68 +131,21 @@ def split_by_owner_columns(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame
     df_his.reset_index(drop=True, inplace=True)
     return df_his, df_own
 
-def save_excel_text(df: pd.DataFrame, out_path: Path):
-    """openpyxl로 모든 셀을 텍스트 서식(number_format='@')으로 저장."""
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sheet1"
-
-    # 헤더
-    ws.append(list(df.columns))
-
-    # 데이터
-    for _, row in df.iterrows():
-        ws.append([("" if pd.isna(v) else str(v)) for v in row.tolist()])
-
-    # 모든 셀 텍스트 서식 적용
-    for row in ws.iter_rows(min_row=1, max_row=ws.max_row, min_col=1, max_col=ws.max_column):
-        for cell in row:
-            cell.number_format = numbers.FORMAT_TEXT  # "@"
-
-    wb.save(out_path)
-
-def infer_mysql_type(series: pd.Series) -> str:
-    """
-    간단 타입 추론:
-      - 열 전체에서 255자 초과 값이 있는 경우 TEXT
-      - 그 외 VARCHAR(255)
-    모든 값은 문자열로 들어온다고 가정.
-    """
-    max_len = series.astype(str).map(len).max() if len(series) else 0
-    if pd.isna(max_len):
-        max_len = 0
-    return "TEXT" if max_len and max_len > 255 else "VARCHAR(255)"
-
-def ensure_database_and_table(conn, table: str, df: pd.DataFrame):
-    """DB/테이블 생성 보장. PRIMARY KEY는 자동 증가 id 추가."""
-    with conn.cursor() as cur:
-        # DB 생성
-        cur.execute(f"CREATE DATABASE IF NOT EXISTS `{DB_NAME}` CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci;")
-        cur.execute(f"USE `{DB_NAME}`;")
-
-        # 테이블 존재 체크
-        cur.execute("SELECT COUNT(*) FROM information_schema.tables WHERE table_schema=%s AND table_name=%s;", (DB_NAME, table))
-        exists = cur.fetchone()[0] > 0
-
-        if not exists:
-            # 스키마 생성
-            cols_sql: List[str] = ["`id` BIGINT NOT NULL AUTO_INCREMENT"]
-            for col in df.columns:
-                col_name = re.sub(r"[^\w가-힣_]", "_", str(col))  # 안전한 컬럼명으로
-                col_type = infer_mysql_type(df[col])
-                cols_sql.append(f"`{col_name}` {col_type} NULL")
-            cols_sql.append("PRIMARY KEY (`id`)")
-            create_sql = f"CREATE TABLE `{table}` (\n  " + ",\n  ".join(cols_sql) + "\n) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;"
-            cur.execute(create_sql)
-        else:
-            # 존재한다면 컬럼 추가 필요 여부 체크(간단하게 없는 컬럼만 VARCHAR(255)로 추가)
-            cur.execute(f"SHOW COLUMNS FROM `{table}`;")
-            existing_cols = {row[0] for row in cur.fetchall()}
-            for col in df.columns:
-                safe_col = re.sub(r"[^\w가-힣_]", "_", str(col))
+def ensure_database_and_table(st, conn, table: str, df: pd.DataFrame):
+    """테이블 생성 보장(DB 는 연결 시 생성). PRIMARY KEY는 자동 증가 id 추가, PNU/정리일자 보조 인덱스."""
+    safe = df.copy()
+    safe.columns = [re.sub(r"[^\w가-힣_]", "_", str(c)) for c in df.columns]  # 안전한 컬럼명으로
+
+    # 없으면 스키마 생성
+    if not create_table(st, conn, table, safe, with_id=True):
+        # 존재한다면 컬럼 추가 필요 여부 체크(없는 컬럼만 타입 규칙대로 추가)
+        with conn.cursor() as cur:
+            existing_cols = st.columns(cur, table)
+            for safe_col in safe.columns:
                 if safe_col not in existing_cols:
-                    cur.execute(f"ALTER TABLE `{table}` ADD COLUMN `{safe_col}` {infer_mysql_type(df[col])} NULL;")
+                    cur.execute(f"ALTER TABLE `{table}` ADD COLUMN `{safe_col}` {mysql_type(safe_col, safe[safe_col])} NULL;")
 
+    ensure_indexes(st, conn, table)
     conn.commit()
 
 def clear_table(conn, table: str):
@@ -187,8 +156,12 @@ def clear_table(conn, table: str):
     print(f"[RESET] Cleared all rows in {table}")
 
 
-def insert_dataframe(conn, table: str, df: pd.DataFrame):
-    """DataFrame을 INSERT. 기존 데이터는 먼저 삭제."""
+def insert_dataframe(st, conn, table: str, df: pd.DataFrame, bulk: bool = False):
+    """DataFrame 적재. 기존 데이터는 먼저 삭제.
+    - bulk=True : LOAD DATA LOCAL INFILE (불가하면 다중행 INSERT)
+    - bulk=False: 다중행 INSERT
+    - SQLite: executemany (bulk 무관)
+    """
     if df.empty:
         print(f"[INFO] {table}: 비어 있어 적재 생략")
         return
@@ -201,20 +174,41 @@ def insert_dataframe(conn, table: str, df: pd.DataFrame):
     df2 = df.copy()
     df2.columns = safe_cols
 
-    # 문자열 변환
-    df2 = df2.fillna("").astype(str)
-
-    cols_clause = ", ".join([f"`{c}`" for c in df2.columns])
-    placeholders = ", ".join(["%s"] * len(df2.columns))
-    sql = f"INSERT INTO `{table}` ({cols_clause}) VALUES ({placeholders})"
+    # 문자열 변환 (면적은 숫자, 빈값 → NULL)
+    df2 = coerce_frame(df2.fillna("").astype(str))
 
-    with conn.cursor() as cur:
-        cur.executemany(sql, df2.values.tolist())
+    st.load_rows(conn, table, df2, bulk=bulk)
     conn.commit()
-    print(f"[OK] Inserted {len(df2)} rows into {table}")
+
+
+def upsert_dataframe(st, conn, table: str, df: pd.DataFrame, bulk: bool = False, tombstone: bool = False):
+    """DataFrame 증분 적재: 신규·변경 행만 기록, tombstone=True 면 추출본에 없는 행 삭제표시"""
+    if df.empty:
+        print(f"[INFO] {table}: 비어 있어 적재 생략")
+        return
+
+    df2 = df.copy()
+    df2.columns = [re.sub(r"[^\w가-힣_]", "_", str(c)) for c in df.columns]
+    df2 = coerce_frame(df2.fillna("").astype(str))
+
+    try:
+        upsert_frame(st, conn, table, df2, tombstone=tombstone, bulk=bulk)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
 
 
 def main():
+    ap = argparse.ArgumentParser(description="이동정리현황 → 토지이동연혁/소유자연혁 분리 · DB 적재")
+    ap.add_argument("--bulk", action="store_true", help="LOAD DATA LOCAL INFILE 대량 적재 (불가하면 다중행 INSERT)")
+    ap.add_argument("--upsert", action="store_true", help="자연키+내용 해시 기준 증분 적재 (신규·변경 행만)")
+    ap.add_argument("--tombstone", action="store_true", help="--upsert 시 추출본에 없는 행 삭제표시(deleted_at)")
+    add_storage_args(ap)
+    args = ap.parse_args()
+    if args.tombstone and not args.upsert:
+        ap.error("--tombstone 은 --upsert 와 함께 사용")
+
     # 1) 입력 로딩
     in_path = find_input_file()
     print(f"[INFO] 입력 파일: {in_path}")
@@ -227,27 +221,30 @@ def main():
     print(f"[INFO] 소유자연혁(land_own) shape: {df_own.shape}")
 
     # 3) 엑셀 저장(모든 셀 텍스트)
-    save_excel_text(df_his, OUT_XLSX_LAND_HIS)
-    save_excel_text(df_own, OUT_XLSX_LAND_OWN)
+    save_text_excel(df_his, OUT_XLSX_LAND_HIS)
+    save_text_excel(df_own, OUT_XLSX_LAND_OWN)
     print(f"[OK] 저장: {OUT_XLSX_LAND_HIS}")
     print(f"[OK] 저장: {OUT_XLSX_LAND_OWN}")
 
-    # 4) DB 적재
-    conn = pymysql.connect(
-        host=DB_HOST,
-        port=DB_PORT,
-        user=DB_USER,
-        password=DB_PASS,
-        autocommit=False,
-        charset="utf8mb4",
-        cursorclass=pymysql.cursors.Cursor,
-    )
+    # 4) DB 적재 (MySQL: DB 없으면 생성)
+    st = open_storage(resolve_url(args.db_url, args.sqlite, OUT_DIR,
+                                  mysql_url(DB_USER, DB_PASS, DB_HOST, DB_PORT, DB_NAME)))
+    print(f"[INFO] DB: {st.describe()}")
+    conn = st.connect(create_db=True, local_infile=args.bulk)
 
     try:
-        ensure_database_and_table(conn, TABLE_HIS, df_his)
-        ensure_database_and_table(conn, TABLE_OWN, df_own)
-        insert_dataframe(conn, TABLE_HIS, df_his)
-        insert_dataframe(conn, TABLE_OWN, df_own)
+        if args.upsert:
+            # 소유자연혁도 자연키로 갱신할 수 있도록 키 컬럼을 함께 적재
+            df_own_db = pd.concat([df_his[[c for c in KEY_COLS if c in df_his.columns]], df_own], axis=1)
+            ensure_database_and_table(st, conn, TABLE_HIS, df_his)
+            ensure_database_and_table(st, conn, TABLE_OWN, df_own_db)
+            upsert_dataframe(st, conn, TABLE_HIS, df_his, bulk=args.bulk, tombstone=args.tombstone)
+            upsert_dataframe(st, conn, TABLE_OWN, df_own_db, bulk=args.bulk, tombstone=args.tombstone)
+        else:
+            ensure_database_and_table(st, conn, TABLE_HIS, df_his)
+            ensure_database_and_table(st, conn, TABLE_OWN, df_own)
+            insert_dataframe(st, conn, TABLE_HIS, df_his, bulk=args.bulk)
+            insert_dataframe(st, conn, TABLE_OWN, df_own, bulk=args.bulk)
     finally:
         conn.close()
     print("[DONE] 엑셀 분리 + DB 적재 완료")
@@ -0,0 +1,8 @@
+# ==========================================
+#  landmove: 44200/44250 스크립트 공통 모듈
+# ==========================================
+
+# [사용 방법]
+# 각 스크립트에서 land_data 폴더를 sys.path에 추가한 뒤 하위 모듈을 임포트
+#     sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+#     from landmove.normalize import normalize_pnu
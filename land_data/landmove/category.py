@@ -0,0 +1,81 @@
+# ==========================================
+#  토지이동종목 → 코드별 분할 (한 번 훑어 묶음)
+# ==========================================
+
+# [목적]
+# - 종목마다 df[df["토지이동종목"] == 종목] 으로 전체를 다시 훑던 분류를
+#   코드 매핑 1회 + 그룹 1회로 처리 (종목 수와 무관하게 한 번)
+# - 같은 코드의 종목(분할(임야대장)/분할(토지대장) → 20)은 한 시트로
+# - 코드표에 없는 종목(결측 포함)은 버리지 않고 기타(미매핑) 시트로 모음
+
+# [규칙]
+# - 코드 순서 = 코드표(시군구 설정 move_codes)에서 처음 나온 순서, 기타는 맨 뒤
+# - 시트명: <코드>_<종목 앞 4글자> (여러 종목이면 공통 앞부분)
+# - coded=True: 2단계에서 이미 코드로 치환된 자료(map_kind) → 값이 코드면 그대로 그 코드
+#   (코드표에 없는 종목은 2단계가 명칭 그대로 남겨 기타 시트 건수에 이름이 보임)
+# - 기타 시트 건수: 결측·빈 문자열은 모두 (미기재)
+
+# [사용 예]
+# from landmove.category import split_sheets
+# from landmove.excel import save_text_excel_sheets
+# save_text_excel_sheets(split_sheets(df, "토지이동종목", D.move_codes, coded=D.map_kind), out_xlsx)
+
+import os
+
+import numpy as np
+import pandas as pd
+
+OTHER = "기타_미매핑"
+CHUNK_ROWS = 100_000
+MISSING = "(미기재)"
+
+
+def _label(names: list[str]) -> str:
+    if len(names) == 1:
+        return names[0]
+    return os.path.commonprefix(names).rstrip("(") or names[0]
+
+
+def code_groups(values: pd.Series, code_map: dict[str, str], coded: bool = False):
+    """종목 값 → [(코드, 시트명, 행 위치 배열)] (코드표 순서, 기타는 코드 None)"""
+    lookup = dict(code_map)
+    if coded:
+        lookup.update({c: c for c in code_map.values()})
+    order = list(dict.fromkeys(code_map.values()))
+    codes = pd.Categorical(values.astype(object).str.strip().map(lookup), categories=order).codes
+    pos = pd.Series(np.arange(len(codes))).groupby(codes, sort=False).indices
+
+    groups = []
+    for i, code in enumerate(order):
+        names = [n for n, c in code_map.items() if c == code]
+        groups.append((code, f"{code}_{_label(names)[:4]}", pos.get(i, np.empty(0, dtype=np.int64))))
+    groups.append((None, OTHER, pos.get(-1, np.empty(0, dtype=np.int64))))
+    return groups
+
+
+def _chunks(df: pd.DataFrame, pos: np.ndarray, chunk_rows: int):
+    for lo in range(0, len(pos), chunk_rows):
+        yield df.iloc[pos[lo:lo + chunk_rows]]
+
+
+def split_sheets(df: pd.DataFrame, col: str, code_map: dict[str, str], coded: bool = False,
+                 chunk_rows: int = CHUNK_ROWS) -> list:
+    """코드별 [(시트명, 청크 반복자)] — save_text_excel_sheets 에 그대로 넘김
+    - 청크는 시트를 쓸 때 chunk_rows 행씩 잘라 만듦 (그룹 사본을 한꺼번에 두지 않음)
+    - 레코드 없는 코드는 건너뜀, 기타 시트는 미매핑 종목별 건수를 출력
+    """
+    sheets = []
+    for code, sheet, pos in code_groups(df[col], code_map, coded):
+        if len(pos) == 0:
+            if code is not None:
+                print(f"[건너뜀] {sheet} ({code}) → 레코드 없음")
+            continue
+        if code is None:
+            names = df[col].iloc[pos].astype(object).str.strip()
+            counts = names.mask(names.eq("")).fillna(MISSING).value_counts()
+            print(f"[저장됨] {sheet} → {len(pos)}건 ({len(counts)}개 종목: "
+                  + ", ".join(f"{k} {v}건" for k, v in counts.items()) + ")")
+        else:
+            print(f"[저장됨] {sheet} ({code}) → {len(pos)}건")
+        sheets.append((sheet, _chunks(df, pos, chunk_rows)))
+    return sheets
@@ -0,0 +1,256 @@
+# ==========================================
+#  집계 큐브: 이동사유/종목 × 연월 × 행정구역 × 신청구분 (한 번 집계해 저장)
+# ==========================================
+
+# [목적]
+# - 보고용 분할 집계(월별·리별·신청구분별 …)마다 전체 행을 다시 읽어 groupby 하지 않도록
+#   가장 잘게 나눈 셀 단위 집계를 한 번 만들어 결과 옆에 저장
+#   * 측정값: 건수, 필지수(고유 PNU), 면적 합(이동전/이동후 또는 면적)
+# - 이후 롤업/슬라이스(query)는 큐브만 읽음 (행 단위 자료 미사용)
+# - 원본은 연월 파티션(landmove.partition)을 파티션 하나씩 순회 → 셀이 연월을 넘지 않으므로
+#   파티션별 집계를 이어 붙이기만 하면 됨 (전체를 메모리에 올리지 않음)
+# - 원본 서명이 그대로면 다시 만들지 않음
+
+# [저장 구조]  <out>/집계큐브/<이름>.cube/
+# - cells.parquet  : 셀(차원 조합)별 측정값 + _CELL(셀 번호)
+# - pnus.parquet   : (_CELL, 필지코드) 고유 쌍 → 롤업한 필지수를 정확히 계산할 때만 사용
+#   (고유 필지 수는 셀끼리 더할 수 없으므로 — 같은 필지가 여러 달·여러 종목에 나옴)
+# - _manifest.json : 원본 서명, 차원/측정값 구성
+# - <out>/집계큐브/<이름>_집계큐브.xlsx : 셀 표 (사람 확인용)
+
+# [차원]
+# - 이동사유/종목, 연월(YYYYMM, 날짜 없음은 "(미기재)"), 법정동코드(PNU 앞 10자리 = 읍면동+리),
+#   행정구역명(원본에 있을 때), 신청구분(원본에 있을 때). 원본에 없는 차원은 "(미기재)"
+# - 조회용 파생 차원: 연도(연월 앞 4자리), 읍면동코드(법정동코드 앞 8자리)
+
+# [사용 예]
+# from landmove.cube import CubeSpec, ensure_cube, load_cube, query
+# spec = CubeSpec("이동정리현황", kind_col="토지이동종목", date_col="정리일자",
+#                 pnu_cols=["이동후_필지코드", "이동전_필지코드"], area_cols=["이동전_면적", "이동후_면적"],
+#                 name_col="행정구역명", apply_col="신청구분")
+# cube_dir = ensure_cube(P_MOVE_STATUS, spec, OUT_DIR / "집계큐브")
+# cube = load_cube(cube_dir)
+# query(cube, by=["연월", "신청구분"], where={"연월": ("202501", "202506")})
+
+import json
+import os
+import shutil
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from landmove.excel import save_text_excel
+from landmove.partition import YMD_COL, NONE_PART, ensure_partitions, load_manifest
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow 미설치: 큐브 미사용
+    pq = None
+
+MISSING = "(미기재)"
+CELL_COL = "_CELL"
+PNU_COL = "필지코드"
+KIND, YM, DONG, AREA_NAME, APPLY = "이동사유/종목", "연월", "법정동코드", "행정구역명", "신청구분"
+DIMS = [KIND, YM, DONG, AREA_NAME, APPLY]
+COUNT, N_PNU = "건수", "필지수"
+DERIVED = {  # 조회용 파생 차원: 이름 → (원 차원, 앞 자릿수)
+    "연도": (YM, 4),
+    "읍면동코드": (DONG, 8),
+}
+MANIFEST = "_manifest.json"
+
+
+@dataclass
+class CubeSpec:
+    """원본 하나의 큐브 구성 (원본 컬럼명). 없는 컬럼(None)은 해당 차원을 "(미기재)"로"""
+    name: str
+    kind_col: str
+    date_col: str
+    pnu_cols: list[str] = field(default_factory=list)   # 앞 컬럼 우선으로 법정동코드, 전체를 필지수에
+    area_cols: list[str] = field(default_factory=list)  # 합계 측정값 (<컬럼>_합)
+    name_col: str | None = None
+    apply_col: str | None = None
+
+    @property
+    def measures(self) -> list[str]:
+        return [COUNT, N_PNU] + [f"{c}_합" for c in self.area_cols]
+
+    def columns(self) -> list[str]:
+        cols = [self.kind_col, *self.pnu_cols, *self.area_cols, self.name_col, self.apply_col]
+        return list(dict.fromkeys(c for c in cols if c))
+
+
+def cube_dir(root: Path, spec: CubeSpec) -> Path:
+    return Path(root) / f"{spec.name}.cube"
+
+
+def _text(s: pd.Series | None, n: int) -> pd.Series:
+    if s is None:
+        return pd.Series(MISSING, index=range(n), dtype=object)
+    s = s.reset_index(drop=True).astype(object)
+    return s.where(s.notna() & s.astype(str).str.strip().ne(""), MISSING)
+
+
+def _pnu(df: pd.DataFrame, cols: list[str]) -> pd.Series:
+    """앞 컬럼 우선으로 첫 번째 유효 PNU (법정동코드용)"""
+    out = pd.Series(np.nan, index=df.index, dtype=object)
+    for c in cols:
+        out = out.where(out.notna(), df[c].where(df[c].astype(str).str.len().eq(19)))
+    return out
+
+
+def build_cells(df: pd.DataFrame, ym: pd.Series, spec: CubeSpec):
+    """행 자료 → (셀 표, (셀, 필지코드) 고유 쌍). 셀 번호는 0부터 (이어 붙일 때 더함)"""
+    n = len(df)
+    df = df.reset_index(drop=True)
+    dims = pd.DataFrame({
+        KIND: _text(df[spec.kind_col], n),
+        YM: _text(ym, n),
+        DONG: _text(_pnu(df, spec.pnu_cols).str[:10] if spec.pnu_cols else None, n),
+        AREA_NAME: _text(df[spec.name_col] if spec.name_col else None, n),
+        APPLY: _text(df[spec.apply_col] if spec.apply_col else None, n),
+    })
+    codes, uniq = pd.MultiIndex.from_frame(dims).factorize()
+    cells = uniq.to_frame(index=False, name=DIMS)
+    cells[COUNT] = np.bincount(codes, minlength=len(uniq))
+    for c in spec.area_cols:
+        area = pd.to_numeric(df[c], errors="coerce").fillna(0).to_numpy()
+        cells[f"{c}_합"] = np.bincount(codes, weights=area, minlength=len(uniq))
+
+    pairs = pd.concat(
+        [pd.DataFrame({CELL_COL: codes, PNU_COL: df[c].to_numpy()}) for c in spec.pnu_cols],
+        ignore_index=True,
+    ).dropna().drop_duplicates()
+    cells[N_PNU] = np.bincount(pairs[CELL_COL].to_numpy(), minlength=len(uniq))
+    cells.insert(0, CELL_COL, np.arange(len(uniq), dtype=np.int64))
+    return cells[[CELL_COL, *DIMS, *spec.measures]], pairs.astype({CELL_COL: np.int64})
+
+
+def build_cube(parts: Path, spec: CubeSpec):
+    """연월 파티션을 하나씩 집계해 이어 붙임. 반환: (셀 표, 고유 쌍)"""
+    meta = load_manifest(parts)
+    cols = [c for c in spec.columns() if c in meta["columns"]]
+    all_cells, all_pairs, base = [], [], 0
+    for key in meta["parts"]:
+        df = pq.read_table(parts / f"ym={key}.parquet", columns=cols + [YMD_COL]).to_pandas()
+        ym = df[YMD_COL].str[:6] if key != NONE_PART else None
+        cells, pairs = build_cells(df, ym, spec)
+        cells[CELL_COL] += base
+        pairs[CELL_COL] += base
+        base += len(cells)
+        all_cells.append(cells)
+        all_pairs.append(pairs)
+    cells = pd.concat(all_cells, ignore_index=True)
+    pairs = pd.concat(all_pairs, ignore_index=True)
+    return cells, pairs
+
+
+def ensure_cube(xlsx_path: Path, spec: CubeSpec, root: Path) -> Path:
+    """원본 서명·구성이 바뀌었을 때만 큐브를 다시 만들어 저장 (임시 폴더에 쓴 뒤 교체)
+    반환: 큐브 폴더 (pyarrow 가 없으면 None)
+    """
+    if pq is None:
+        return None
+    out_dir = cube_dir(root, spec)
+    parts = ensure_partitions(xlsx_path, spec.date_col)
+    sig = load_manifest(parts)["sig"]
+    meta = _load_meta(out_dir)
+    if meta and meta.get("sig") == sig and meta.get("spec") == asdict(spec):
+        return out_dir
+
+    cells, pairs = build_cube(parts, spec)
+    tmp_dir = out_dir.with_name(out_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+    cells.to_parquet(tmp_dir / "cells.parquet", index=False)
+    pairs.to_parquet(tmp_dir / "pnus.parquet", index=False)
+    meta = {"sig": sig, "spec": asdict(spec), "n_cells": len(cells), "n_rows": int(cells[COUNT].sum())}
+    (tmp_dir / MANIFEST).write_text(json.dumps(meta, ensure_ascii=False, indent=1), encoding="utf-8")
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(tmp_dir, out_dir)
+
+    xlsx = Path(root) / f"{spec.name}_집계큐브.xlsx"
+    save_text_excel(cells.drop(columns=[CELL_COL]), xlsx, sheet_name="집계큐브")
+    print(f"[INFO] 집계 큐브 저장: {out_dir.name} ({len(cells):,}개 셀, {meta['n_rows']:,}행)")
+    return out_dir
+
+
+def _load_meta(out_dir: Path) -> dict | None:
+    path = Path(out_dir) / MANIFEST
+    if not path.is_file():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+# -------------------- 조회 --------------------
+@dataclass
+class Cube:
+    cells: pd.DataFrame
+    pnus_path: Path
+    measures: list[str]
+
+
+def load_cube(out_dir: Path) -> Cube:
+    meta = _load_meta(out_dir)
+    spec = CubeSpec(**meta["spec"])
+    cells = pd.read_parquet(Path(out_dir) / "cells.parquet")
+    return Cube(cells, Path(out_dir) / "pnus.parquet", spec.measures)
+
+
+def _dim(cells: pd.DataFrame, name: str) -> pd.Series:
+    if name in DERIVED:
+        src, width = DERIVED[name]
+        s = cells[src]
+        return s.str[:width].where(s.ne(MISSING), MISSING)
+    if name not in DIMS:
+        raise ValueError(f"차원이 아닙니다: {name} (가능: {DIMS + list(DERIVED)})")
+    return cells[name]
+
+
+def slice_cells(cells: pd.DataFrame, where: dict | None) -> pd.DataFrame:
+    """where: {차원: 값 | [값, ...] | (시작, 끝)} — 튜플은 양끝 포함 범위(문자열 비교)"""
+    mask = np.ones(len(cells), dtype=bool)
+    for name, cond in (where or {}).items():
+        s = _dim(cells, name)
+        if isinstance(cond, tuple):
+            lo, hi = cond
+            m = s.ne(MISSING)
+            if lo is not None:
+                m &= s >= str(lo)
+            if hi is not None:
+                m &= s <= str(hi)
+        elif isinstance(cond, (list, set)):
+            m = s.isin([str(v) for v in cond])
+        else:
+            m = s.eq(str(cond))
+        mask &= m.to_numpy()
+    return cells[mask]
+
+
+def query(cube: Cube, by: list[str] | None = None, where: dict | None = None) -> pd.DataFrame:
+    """큐브 롤업/슬라이스: where 로 셀을 고르고 by 차원으로 합침
+    - 건수·면적 합: 셀 합계 / 필지수: by 가 모든 차원이면 셀 값, 아니면 (셀, 필지코드) 쌍에서 고유 수
+    """
+    by = list(by or [])
+    cells = slice_cells(cube.cells, where)
+    keys = pd.DataFrame({name: _dim(cells, name) for name in by}, index=cells.index)
+    additive = [m for m in cube.measures if m != N_PNU]
+    if by:
+        out = cells[additive].groupby([keys[k] for k in by], sort=True).sum()
+    else:
+        out = pd.DataFrame([cells[additive].sum()]).astype(cells[additive].dtypes)  # 한 행, 측정값 타입 유지(건수 정수)
+
+    if set(by) >= set(DIMS):
+        n_pnu = cells[N_PNU].groupby([keys[k] for k in by], sort=True).sum()
+    else:
+        pairs = pq.read_table(cube.pnus_path, filters=[(CELL_COL, "in", cells[CELL_COL].tolist())]) \
+            .to_pandas() if len(cells) else pd.DataFrame(columns=[CELL_COL, PNU_COL])
+        pairs = pairs.merge(keys.assign(**{CELL_COL: cells[CELL_COL]}), on=CELL_COL)
+        if by:
+            n_pnu = pairs.drop_duplicates([*by, PNU_COL]).groupby(by, sort=True).size()
+        else:
+            n_pnu = pd.Series([pairs[PNU_COL].nunique()])
+    out[N_PNU] = n_pnu.reindex(out.index, fill_value=0).astype(np.int64)
+    return out[cube.measures].reset_index() if by else out[cube.measures].reset_index(drop=True)
@@ -0,0 +1,184 @@
+# ==========================================
+#  스트리밍 중복 제거: 64비트 행 지문 + 디스크 분할(spill)
+# ==========================================
+
+# [목적]
+# - 여러 해·여러 시군구 이력을 한 번에 메모리에 올리지 않고 중복 제거
+# - 키 컬럼 값으로 행 지문(uint64, pandas 해시 — 벡터 연산)을 만들고 (지문, 행 번호)만 보관
+#   * 행 하나당 16바이트 → 보관 행 수가 max_rows 를 넘으면 지문 상위 비트로 나눈
+#     분할 파일(임시 폴더)에 내려 쓰고, 분할별로 따로 정렬해 남길 행을 고름
+# - 남길 행은 비트맵(행당 1비트)으로 표시 → 원본을 한 번 더 순회하며 원래 순서대로 내보냄
+# - 원본파일(landmove.ingest.SOURCE_COL)별 중복(제거) 건수 집계
+
+# [규칙]
+# - 비교 전 문자열 좌우 공백 제거는 배치마다 1회 (결측은 결측 그대로)
+# - keep="first": 처음 나온 행 유지 / keep="last": 마지막 행 유지(추출 시점 순으로 이어 붙인 자료 → 최신 추출본)
+# - 64비트 지문이 같으면 같은 행으로 봄 (충돌 확률 ≈ n²/2⁶⁵, 1억 행에서 약 3×10⁻⁴)
+
+# [사용 예]
+# from landmove.dedupe import dedupe_table
+# res = dedupe_table(src_xlsx, keep="last", tag_col="원본파일")
+# save_table(res.rows(), out_xlsx, sheet_name="토지이동연혁")   # 청크 스트리밍 저장
+# print(res.dup_by_source)                                     # {원본파일: 제거 건수}
+
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from landmove.store import iter_table
+
+BATCH_ROWS = 200_000
+MAX_ROWS = 5_000_000          # 메모리에 둘 (지문, 행 번호) 수 (≈ 80MB)
+PART_BITS = 6                 # 분할 파일 2⁶ = 64개
+_PAIR = np.dtype([("h", "<u8"), ("r", "<u8")])
+
+
+def strip_text(df: pd.DataFrame) -> pd.DataFrame:
+    """문자열 컬럼 좌우 공백 제거 (결측 유지)"""
+    for c in df.columns:
+        if pd.api.types.is_string_dtype(df[c]):
+            df[c] = df[c].str.strip()
+    return df
+
+
+def row_hash(df: pd.DataFrame, cols: list[str]) -> np.ndarray:
+    """키 컬럼 값 → 행 지문(uint64). 결측과 빈 문자열은 서로 다름"""
+    return pd.util.hash_pandas_object(df[cols], index=False).to_numpy(dtype=np.uint64)
+
+
+class _PairBuffer:
+    """(지문, 행 번호) 보관소: max_rows 를 넘으면 지문 상위 비트로 분할해 디스크에 추가 기록"""
+
+    def __init__(self, max_rows: int):
+        self.max_rows = max_rows
+        self.chunks: list[np.ndarray] = []
+        self.n_mem = 0
+        self.tmp_dir: Path | None = None
+
+    def add(self, h: np.ndarray, r: np.ndarray):
+        pairs = np.empty(len(h), dtype=_PAIR)
+        pairs["h"], pairs["r"] = h, r
+        self.chunks.append(pairs)
+        self.n_mem += len(pairs)
+        if self.n_mem > self.max_rows:
+            self._spill()
+
+    def _spill(self):
+        if self.tmp_dir is None:
+            self.tmp_dir = Path(tempfile.mkdtemp(prefix="landmove_dedupe_"))
+            print(f"[INFO] 중복 제거: 메모리 한도({self.max_rows:,}행) 초과 → 분할 파일 {self.tmp_dir}")
+        pairs = np.concatenate(self.chunks)
+        part = pairs["h"] >> np.uint64(64 - PART_BITS)
+        order = np.argsort(part, kind="stable")
+        pairs, part = pairs[order], part[order]
+        bounds = np.searchsorted(part, np.arange((1 << PART_BITS) + 1, dtype=np.uint64))
+        for i in range(1 << PART_BITS):
+            lo, hi = bounds[i], bounds[i + 1]
+            if hi > lo:
+                with open(self.tmp_dir / f"{i:02d}.bin", "ab") as f:
+                    pairs[lo:hi].tofile(f)
+        self.chunks, self.n_mem = [], 0
+
+    def partitions(self):
+        """분할(또는 메모리 전체) 단위로 (지문, 행 번호) 배열 반환"""
+        if self.tmp_dir is None:
+            if self.chunks:
+                yield np.concatenate(self.chunks)
+            return
+        if self.chunks:
+            self._spill()
+        for p in sorted(self.tmp_dir.glob("*.bin")):
+            yield np.fromfile(p, dtype=_PAIR)
+
+    def close(self):
+        if self.tmp_dir is not None:
+            shutil.rmtree(self.tmp_dir, ignore_errors=True)
+            self.tmp_dir = None
+
+
+def _survivors(pairs: np.ndarray, keep: str) -> np.ndarray:
+    """지문마다 남길 행 번호 (keep="first": 가장 앞, "last": 가장 뒤)"""
+    if len(pairs) == 0:
+        return pairs["r"]
+    pairs = np.sort(pairs, order=["h", "r"])
+    h = pairs["h"]
+    if keep == "first":
+        edge = np.r_[True, h[1:] != h[:-1]]
+    else:
+        edge = np.r_[h[1:] != h[:-1], True]
+    return pairs["r"][edge]
+
+
+@dataclass
+class DedupeResult:
+    """중복 제거 결과: rows() 로 남은 행을 청크 단위로 받음"""
+    src: Path
+    keep_mask: np.ndarray            # 행 번호별 유지 여부 (packbits)
+    n_rows: int
+    n_kept: int
+    batch_rows: int = BATCH_ROWS
+    tag_col: str | None = None
+    dup_by_source: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def n_dup(self) -> int:
+        return self.n_rows - self.n_kept
+
+    def rows(self):
+        """원본을 다시 순회하며 남길 행만 원래 순서대로 반환 (공백 제거 포함)"""
+        keep = np.unpackbits(self.keep_mask, count=self.n_rows).astype(bool)
+        start = 0
+        for df in iter_table(self.src, self.batch_rows):
+            m = keep[start:start + len(df)]
+            start += len(df)
+            yield strip_text(df[m].reset_index(drop=True))
+
+
+def dedupe_table(src: Path, key_cols: list[str] | None = None, keep: str = "first",
+                 tag_col: str | None = None, max_rows: int = MAX_ROWS,
+                 batch_rows: int = BATCH_ROWS) -> DedupeResult:
+    """단계 결과(xlsx/.parquet)를 두 번 순회해 중복 제거할 행을 정함
+    - key_cols: 비교 컬럼 (기본: tag_col 을 뺀 전체)
+    - tag_col : 원본파일 컬럼 → 제거된 행의 원본파일별 건수(dup_by_source)
+    """
+    if keep not in ("first", "last"):
+        raise ValueError(f"keep 은 first / last: {keep}")
+    buf = _PairBuffer(max_rows)
+    n = 0
+    try:
+        for df in iter_table(src, batch_rows):
+            if tag_col and tag_col not in df.columns:
+                tag_col = None
+            cols = key_cols or [c for c in df.columns if c != tag_col]
+            missing = [c for c in cols if c not in df.columns]
+            if missing:
+                raise ValueError(f"키 컬럼이 없습니다: {missing} ({Path(src).name})")
+            strip_text(df)
+            buf.add(row_hash(df, cols), np.arange(n, n + len(df), dtype=np.uint64))
+            n += len(df)
+
+        keep_bits = np.zeros(n, dtype=bool)
+        for pairs in buf.partitions():
+            keep_bits[_survivors(pairs, keep)] = True
+    finally:
+        buf.close()
+
+    dup_by_source = {}
+    if tag_col:  # 제거되는 행의 원본파일별 건수 (원본파일 컬럼만 다시 읽음)
+        counts, start = [], 0
+        for df in iter_table(src, batch_rows, columns=[tag_col]):
+            drop = ~keep_bits[start:start + len(df)]
+            start += len(df)
+            counts.append(df.loc[drop, tag_col].fillna("(없음)").value_counts())
+        if counts:
+            total = pd.concat(counts).groupby(level=0).sum()
+            dup_by_source = {str(k): int(v) for k, v in total.items()}
+
+    return DedupeResult(
+        src=Path(src), keep_mask=np.packbits(keep_bits), n_rows=n, n_kept=int(keep_bits.sum()),
+        batch_rows=batch_rows, tag_col=tag_col, dup_by_source=dup_by_source,
+    )
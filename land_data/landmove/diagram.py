@@ -0,0 +1,165 @@
+# ==========================================
+#  DevExpress Diagram XML(XtraSerializer) 스트리밍 기록
+# ==========================================
+
+# [목적]
+# - ElementTree 로 전체 트리를 만든 뒤 indent/minidom 으로 다시 직렬화하지 않고
+#   Item{n} 도형/연결선을 파일 핸들에 순서대로 바로 기록 (레코드 수와 무관한 일정 메모리)
+# - 속성값 엔티티를 직접 제어: 줄바꿈은 &#xD;&#xA; 로 한 번만 인코딩
+#   (기존: 미리 만든 "&#xD;&#xA;" 문자열을 ElementTree 가 "&amp;#xD;..." 로 이중 이스케이프)
+# - 10 / 11 단계 공통 타임라인 배치(좌 지번 → 연결선 + 라벨 → 우 지번)
+
+# [출력 형식]
+# - ElementTree + ET.indent(space="  ") 결과와 같은 들여쓰기/속성 순서, XML 선언 없음
+#   <XtraSerializer version="23.2.3.0">
+#     <Items>
+#       <Item1 ItemKind="DiagramRoot" ...>
+#         <Children>
+#           <Item2 ItemKind="DiagramShape" ... />
+
+# [사용 예]
+# from landmove.diagram import write_diagram
+# def label(r): return "\r\n".join([r["land_move_kind"], r["cre_ymd"], r["owner_name"]])
+# write_diagram(rows, out_path, label)
+
+import io
+import re
+
+# -------- 화면/배치 상수 (대략치) --------
+PAGE_W, PAGE_H   = 800, 600     # 페이지 폭/높이
+JIBUN_W, JIBUN_H = 130, 40      # 지번(좌/우) 박스 크기
+LABEL_W, LABEL_H = 100, 40      # 라벨 박스 크기(연결선 위)
+ARROW_W          = 130          # 좌/우 박스 사이(연결선) 가로 길이
+ROW_Y            = 30           # 첫 행의 Y 좌표(상단 여백)
+START_X          = 0            # 첫 박스의 X 좌표
+LABEL_OFFSET_X   = 10           # 연결선 시작점 대비 라벨 박스의 X 오프셋
+
+SERIALIZER_VERSION = "23.2.3.0"
+INDENT = "  "
+
+_ATTR_ESCAPES = {
+    "&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;",
+    "\r": "&#xD;", "\n": "&#xA;", "\t": "&#x9;",
+}
+_ATTR_RE = re.compile(r'[&<>"\r\n\t]')
+_ILLEGAL_XML = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def escape_attr(value) -> str:
+    """속성값 이스케이프: 특수문자 1회 인코딩, 줄바꿈(CR/LF)·탭은 문자 참조로"""
+    text = _ILLEGAL_XML.sub("", "" if value is None else str(value))
+    return _ATTR_RE.sub(lambda m: _ATTR_ESCAPES[m.group()], text)
+
+
+def extract_ri(name) -> str:
+    """행정구역명에서 '리' 단위만 추출 (문자열이 아니면 빈 문자열, 없으면 원문)"""
+    if not isinstance(name, str):
+        return ""
+    m = re.search(r'([가-힣A-Za-z0-9]+리)', name)
+    return m.group(1) if m else name
+
+
+class DiagramWriter:
+    """XtraSerializer Diagram 을 파일 핸들에 순차 기록
+    - shape()/connector() 호출 순서대로 Item2, Item3 ... 번호 부여
+    - close() 에서 닫는 태그 기록 (도형이 없으면 <Children /> )
+    """
+
+    def __init__(self, fh, page_size=(PAGE_W, PAGE_H)):
+        self.fh = fh
+        self.item_id = 1  # Item1 = DiagramRoot
+        self.page_size = page_size
+        self._opened = False
+
+    def _item(self, **attrs):
+        if not self._opened:
+            self.fh.write(f"{INDENT * 3}<Children>\n")
+            self._opened = True
+        self.item_id += 1
+        body = " ".join(f'{k}="{escape_attr(v)}"' for k, v in attrs.items())
+        self.fh.write(f"{INDENT * 4}<Item{self.item_id} {body} />\n")
+
+    def begin(self):
+        w, h = self.page_size
+        self.fh.write(
+            f'<XtraSerializer version="{SERIALIZER_VERSION}">\n'
+            f"{INDENT}<Items>\n"
+            f'{INDENT * 2}<Item1 ItemKind="DiagramRoot" PageSize="{w},{h}" '
+            f'SelectedStencils="BasicShapes, BasicFlowchartShapes">\n'
+        )
+        return self
+
+    def shape(self, position, size, content, **style):
+        self._item(
+            ItemKind="DiagramShape",
+            Position=f"{position[0]},{position[1]}",
+            Size=f"{size[0]},{size[1]}",
+            **style,
+            Content=content,
+        )
+
+    def connector(self, begin, end):
+        self._item(
+            ItemKind="DiagramConnector",
+            Points="(Empty)",
+            BeginPoint=f"{begin[0]},{begin[1]}",
+            EndPoint=f"{end[0]},{end[1]}",
+        )
+
+    def close(self):
+        if self._opened:
+            self.fh.write(f"{INDENT * 3}</Children>\n")
+        else:
+            self.fh.write(f"{INDENT * 3}<Children />\n")
+        self.fh.write(f"{INDENT * 2}</Item1>\n{INDENT}</Items>\n</XtraSerializer>")
+
+    def __enter__(self):
+        return self.begin()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+
+
+def write_timeline(writer: DiagramWriter, rows, label) -> int:
+    """레코드를 좌→우 타임라인으로 기록 (레코드마다 좌 지번 / 연결선 / 라벨 / 우 지번)
+    - label: 레코드 → 라벨 문자열(줄바꿈은 "\\r\\n")
+    - 반환: 기록한 레코드 수
+    """
+    x, y = START_X, ROW_Y
+    n = 0
+    for r in rows:
+        # 좌/우 박스에 동일 adm_name에서 '리' 단위만 추출
+        jibun = extract_ri(r.get("adm_name", ""))
+        begin = (x + JIBUN_W, y + JIBUN_H // 2)
+        end = (begin[0] + ARROW_W, begin[1])
+
+        writer.shape((x, y), (JIBUN_W, JIBUN_H), jibun)
+        writer.connector(begin, end)
+        writer.shape(
+            (begin[0] + LABEL_OFFSET_X, y - 30),  # 연결선 위에 보이도록 Y를 살짝 올림
+            (LABEL_W, LABEL_H),
+            label(r),
+            FontSize="8",
+            ThemeStyleId="Variant2",
+        )
+        writer.shape((x + JIBUN_W + ARROW_W, y), (JIBUN_W, JIBUN_H), jibun)
+
+        x += JIBUN_W + ARROW_W
+        n += 1
+    return n
+
+
+def write_diagram(rows, out_path, label) -> int:
+    """레코드(반복자 가능) → Diagram XML 파일. 반환: 기록한 레코드 수"""
+    with open(out_path, "w", encoding="utf-8", newline="\n") as fh:
+        with DiagramWriter(fh) as writer:
+            return write_timeline(writer, rows, label)
+
+
+def diagram_text(rows, label) -> str:
+    """레코드 → Diagram XML 문자열 (write_diagram 과 같은 내용, HTTP 응답 등)"""
+    buf = io.StringIO()
+    with DiagramWriter(buf) as writer:
+        write_timeline(writer, rows, label)
+    return buf.getvalue()
@@ -0,0 +1,184 @@
+# ==========================================
+#  시군구별 설정(districts/<코드>.toml) + 공통 단계 구성
+# ==========================================
+
+# [목적]
+# - 44200/44250 스크립트에 박혀 있던 시군구 코드·기간·원본 파일명·삭제 컬럼·종목 코드 매핑을
+#   시군구별 설정 파일 하나로 모음 → 시군 추가 = 설정 파일 추가 (스크립트 복사 없음)
+# - 같은 단계 스크립트(44250 폴더)를 시군구마다 다른 작업 폴더(<work_dir>/1.data)에 실행
+#   * 스크립트는 환경변수 LANDMOVE_DISTRICT(설정 파일 경로)로 대상 시군구를 받음
+#     (없으면 스크립트 기본 시군구 — 기존처럼 단독 실행)
+# - district_stages(): landmove.pipeline 단계 목록 (0.파이프라인_실행 / 0.시군구_일괄실행 공통)
+
+# [설정 파일]  land_data/districts/<코드>.toml
+# - code, name, work_dir(land_data 기준, 생략 시 code)
+# - [period] start, end            : 3단계 기간(YYYYMMDD)
+# - [inputs] land / move / malso   : 1.data/in 기준 glob (여러 파일이면 이름순으로 이어 붙임, 없으면 해당 단계 생략)
+# - [move] drop_cols, jimok_width, map_kind : 2단계 정제 규칙
+# - [move_codes]                   : 토지이동종목 → 코드 (6단계 시트 분류, map_kind=true 면 2단계 치환)
+#   * 공통 코드표 districts/common/move_codes.toml 에 시군구 설정을 덧씌움 (같은 종목은 시군구 우선)
+
+# [사용 예]
+# from landmove.district import current
+# D = current("44250")                      # LANDMOVE_DISTRICT 가 있으면 그 설정
+# src = D.input_files("move")               # [Path, ...]
+# out = D.out_dir / "이동정리현황_기간내.xlsx"
+
+import os
+import tomllib
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from landmove.pipeline import Stage
+
+LAND_DATA = Path(__file__).resolve().parent.parent   # land_data
+CONFIG_DIR = LAND_DATA / "districts"
+SCRIPT_DIR = LAND_DATA / "44250"                      # 공통 단계 스크립트 위치
+COMMON_CODES = CONFIG_DIR / "common" / "move_codes.toml"  # 전 시군구 공통 종목 코드표
+ENV_VAR = "LANDMOVE_DISTRICT"
+
+IN = "1.data/in"
+OUT = "1.data/out"
+
+
+@dataclass
+class District:
+    """시군구 설정 (경로는 절대경로로 풀어 둠)"""
+    code: str
+    name: str
+    work_dir: Path
+    config_path: Path
+    period: tuple[str, str]
+    inputs: dict[str, str] = field(default_factory=dict)
+    drop_cols: list[str] = field(default_factory=list)
+    jimok_width: int = 0         # 지목 코드 자릿수 (0: 코드 그대로, 2: 2자리 0채움)
+    map_kind: bool = False       # True: 2단계에서 토지이동종목을 move_codes 코드로 치환
+    move_codes: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def in_dir(self) -> Path:
+        return self.work_dir / IN
+
+    @property
+    def out_dir(self) -> Path:
+        return self.work_dir / OUT
+
+    @property
+    def config_files(self) -> list[Path]:
+        """이 시군구 결과에 영향을 주는 설정 파일 (시군구 설정 + 공통 코드표)"""
+        return [self.config_path] + ([COMMON_CODES] if COMMON_CODES.is_file() else [])
+
+    def input_files(self, key: str) -> list[Path]:
+        """[inputs] glob → 1.data/in 안의 파일 목록(이름순). 설정이 없으면 빈 목록"""
+        pattern = self.inputs.get(key)
+        if not pattern:
+            return []
+        return sorted(p for p in self.in_dir.glob(pattern) if p.is_file())
+
+    def env(self) -> dict[str, str]:
+        """단계 스크립트에 넘길 환경변수"""
+        return {ENV_VAR: str(self.config_path)}
+
+
+def config_path(code_or_path) -> Path:
+    p = Path(code_or_path)
+    if p.suffix == ".toml":
+        return p.resolve()
+    return CONFIG_DIR / f"{code_or_path}.toml"
+
+
+def _common_codes() -> dict[str, str]:
+    if not COMMON_CODES.is_file():
+        return {}
+    with open(COMMON_CODES, "rb") as f:
+        return {str(k): str(v) for k, v in tomllib.load(f).get("move_codes", {}).items()}
+
+
+def load_district(code_or_path) -> District:
+    """시군구 코드(districts/<코드>.toml) 또는 설정 파일 경로 → District"""
+    path = config_path(code_or_path)
+    if not path.is_file():
+        raise FileNotFoundError(f"시군구 설정 파일이 없습니다: {path}")
+    with open(path, "rb") as f:
+        cfg = tomllib.load(f)
+
+    code = str(cfg["code"])
+    period = cfg.get("period", {})
+    move = cfg.get("move", {})
+    return District(
+        code=code,
+        name=cfg.get("name", code),
+        work_dir=(LAND_DATA / cfg.get("work_dir", code)).resolve(),
+        config_path=path,
+        period=(str(period["start"]), str(period["end"])),
+        inputs=dict(cfg.get("inputs", {})),
+        drop_cols=list(move.get("drop_cols", [])),
+        jimok_width=int(move.get("jimok_width", 0)),
+        map_kind=bool(move.get("map_kind", False)),
+        move_codes={**_common_codes(), **{str(k): str(v) for k, v in cfg.get("move_codes", {}).items()}},
+    )
+
+
+def list_districts() -> list[str]:
+    """설정 파일이 있는 시군구 코드 목록"""
+    return sorted(p.stem for p in CONFIG_DIR.glob("*.toml"))
+
+
+def current(default: str) -> District:
+    """환경변수 LANDMOVE_DISTRICT(설정 파일 경로)가 있으면 그 시군구, 없으면 default"""
+    return load_district(os.environ.get(ENV_VAR) or default)
+
+
+# -------------------- 단계 구성 --------------------
+def district_stages(d: District, period: tuple[str, str] | None = None) -> list[Stage]:
+    """시군구 하나의 단계 목록 (원본 설정이 없는 단계는 제외)
+    - 경로는 d.work_dir 기준, 스크립트는 SCRIPT_DIR 기준
+    - period: 3단계 기간 (기본: 설정 파일 [period])
+    """
+    start, end = period or d.period
+    args = ["--start", start, "--end", end, "--overwrite"]
+
+    def rel(key):
+        return [p.relative_to(d.work_dir).as_posix() for p in d.input_files(key)]
+
+    land, move, malso = rel("land"), rel("move"), rel("malso")
+    cfg = [p.as_posix() for p in d.config_files]  # 설정(삭제 컬럼·종목 코드 등)이 바뀌면 다시 실행
+
+    stages = []
+    if land:
+        stages += [
+            Stage("1", "1.필지코드구성_토지대장.py",
+                  inputs=land + cfg,
+                  outputs=[f"{OUT}/토지(임야)기본_필지코드추가.xlsx"]),
+            Stage("3.land", "3.데이터필터링_기간.py",
+                  inputs=[f"{OUT}/토지(임야)기본_필지코드추가.xlsx", *cfg],
+                  outputs=[f"{OUT}/토지(임야)기본_기간내.xlsx"],
+                  args=["--only", "land", *args]),
+        ]
+    if move:
+        stages += [
+            Stage("2", "2.필지코드구성_이동정리.py",
+                  inputs=move + cfg,
+                  outputs=[f"{OUT}/토지이동정리현황_필지코드추가.xlsx"]),
+            Stage("3.move", "3.데이터필터링_기간.py",
+                  inputs=[f"{OUT}/토지이동정리현황_필지코드추가.xlsx"],
+                  outputs=[f"{OUT}/이동정리현황_기간내.xlsx"],
+                  args=["--only", "move", *args]),
+            Stage("6", "6.데이터검수_정리현황.py",
+                  inputs=[f"{OUT}/이동정리현황_기간내.xlsx", *cfg],
+                  outputs=[f"{OUT}/이동정리현황_종목별.xlsx"]),
+            Stage("8", "8.토지이동흐름도_db저장_all.py",
+                  inputs=[f"{OUT}/이동정리현황_기간내.xlsx"],
+                  optional=True),
+            Stage("9", "9.토지이동흐름도_db저장.py",
+                  inputs=[f"{OUT}/이동정리현황_기간내.xlsx"],
+                  outputs=[f"{OUT}/토지이동연혁_split.xlsx", f"{OUT}/소유자연혁_split.xlsx"],
+                  optional=True),
+        ]
+    if malso:
+        stages.append(
+            Stage("3.malso", "3.데이터필터링_기간.py",
+                  inputs=malso + cfg,
+                  outputs=[f"{OUT}/일반용조서(말소용)_기간내.xlsx"],
+                  args=["--only", "malso", *args]))
+    return stages
@@ -0,0 +1,245 @@
+# ==========================================
+#  텍스트 서식(@) 엑셀 저장 (write-only 스트리밍)
+# ==========================================
+
+# [목적]
+# - 셀마다 ws.cell(...) / number_format 을 지정하고 다시 전체 셀을 훑어
+#   서식·열 너비를 잡던 저장 함수들을 하나로 통일
+# - 행을 순차 기록하는 write-only 방식: 시트 XML을 zip 안으로 바로 스트리밍(일정 메모리)
+# - 텍스트 서식(@, numFmtId=49)은 스타일 1개로 정의해 열(<col>)과 셀이 같은 인덱스를 참조
+# - 열 너비는 셀 스캔 대신 컬럼 문자열 길이(벡터 연산)로 계산
+
+# [비고]
+# - openpyxl 의 셀 단위 직렬화가 저장 시간의 대부분이라 시트 XML은 직접 기록
+#   (결과 파일은 Excel / openpyxl / pandas.read_excel 에서 그대로 열림)
+# - 시트명은 Excel 제한(31자, []:*?/\ 불가)에 맞춰 정리
+# - zip 항목 시각을 고정해 같은 내용이면 같은 파일(바이트) → 단계 실행기 해시 캐시에 유리
+# - 여러 시트(save_text_excel_sheets)도 시트 하나씩 차례로 스트리밍 (시트 자료는 반복자로 받아 필요할 때 생성)
+
+# [사용 예]
+# from landmove.excel import save_text_excel
+# save_text_excel(df, out_path, sheet_name="data")
+# save_text_excel((clean(c) for c in iter_csv(src)), out_path)   # 청크 스트리밍
+# save_text_excel_sheets([("10_등록", df10), ("20_분할", df20)], out_path)
+
+import re
+import zipfile
+from itertools import chain
+from pathlib import Path
+from xml.sax.saxutils import escape, quoteattr
+
+import pandas as pd
+from openpyxl.utils import get_column_letter
+
+from landmove.memory import as_text
+
+MIN_WIDTH, MAX_WIDTH = 10, 80
+TEXT_STYLE = 1  # styles.xml cellXfs 의 1번(@)
+WRITE_ROWS = 20_000  # 시트 XML 을 이 행 수씩 문자열화해 기록 (큰 표도 일정 메모리)
+
+_ZIP_TIME = (1980, 1, 1, 0, 0, 0)
+_ILLEGAL_XML = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+_BAD_SHEET_CHARS = re.compile(r"[\[\]:*?/\\]")
+
+_NS = 'xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+_NS_R = 'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+_SHEET_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"
+
+
+def _content_types(n_sheets: int) -> str:
+    sheets = "".join(
+        f'<Override PartName="/xl/worksheets/sheet{i}.xml" ContentType="{_SHEET_TYPE}"/>'
+        for i in range(1, n_sheets + 1)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        f"{sheets}"
+        '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        "</Types>"
+    )
+
+
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    f'<Relationship Id="rId1" Type="{_REL}/officeDocument" Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+
+
+def _workbook_rels(n_sheets: int) -> str:
+    sheets = "".join(
+        f'<Relationship Id="rId{i}" Type="{_REL}/worksheet" Target="worksheets/sheet{i}.xml"/>'
+        for i in range(1, n_sheets + 1)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        f"{sheets}"
+        f'<Relationship Id="rId{n_sheets + 1}" Type="{_REL}/styles" Target="styles.xml"/>'
+        "</Relationships>"
+    )
+
+
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f"<styleSheet {_NS}>"
+    '<fonts count="1"><font><sz val="11"/><name val="맑은 고딕"/><family val="2"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="49" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    "</styleSheet>"
+)
+
+
+def _sheet_title(name: str) -> str:
+    """Excel 시트명 제한에 맞춤"""
+    title = _BAD_SHEET_CHARS.sub("_", str(name)).strip("'")[:31]
+    return title or "Sheet1"
+
+
+def _text_values(df: pd.DataFrame) -> list[list]:
+    """모든 값을 문자열로, 결측은 None(빈 셀)으로 변환한 행 목록"""
+    values = as_text(df).to_numpy(dtype=object)
+    values[df.isna().to_numpy(dtype=bool)] = None
+    return values.tolist()
+
+
+def _column_widths(df: pd.DataFrame) -> list[int]:
+    """헤더/값 문자열 길이 최댓값 + 2 를 MIN_WIDTH~MAX_WIDTH 범위로 제한"""
+    widths = []
+    for i, col in enumerate(df.columns):
+        s = df.iloc[:, i].dropna()
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            s = pd.Series(s.unique())  # 범주형: 쓰인 값만 한 번씩 (행마다 문자열을 만들지 않음)
+        if not isinstance(s.dtype, pd.StringDtype):
+            s = as_text(s)
+        longest = s.str.len().max() if len(s) else 0
+        longest = max(len(str(col)), 0 if pd.isna(longest) else int(longest))
+        widths.append(max(MIN_WIDTH, min(MAX_WIDTH, longest + 2)))
+    return widths
+
+
+def _zip_entry(name: str) -> zipfile.ZipInfo:
+    """고정 시각 zip 항목"""
+    info = zipfile.ZipInfo(name, date_time=_ZIP_TIME)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    return info
+
+
+def _row_xml(row_idx: int, letters: list[str], values) -> str:
+    cells = []
+    for letter, v in zip(letters, values):
+        if v is None:
+            continue
+        v = escape(_ILLEGAL_XML.sub("", v))
+        cells.append(
+            f'<c r="{letter}{row_idx}" s="{TEXT_STYLE}" t="inlineStr">'
+            f'<is><t xml:space="preserve">{v}</t></is></c>'
+        )
+    return f'<row r="{row_idx}">{"".join(cells)}</row>'
+
+
+def _unique_titles(names: list[str]) -> list[str]:
+    """시트명 정리 후 겹치면 뒤에 _2, _3 … (31자 안에서)"""
+    titles, seen = [], set()
+    for name in names:
+        base = title = _sheet_title(name)
+        n = 1
+        while title.lower() in seen:
+            n += 1
+            suffix = f"_{n}"
+            title = base[:31 - len(suffix)] + suffix
+        seen.add(title.lower())
+        titles.append(title)
+    return titles
+
+
+def _write_sheet(zf: zipfile.ZipFile, entry: str, data, autofit: bool) -> int:
+    """시트 XML 하나를 zip 안으로 스트리밍. 반환: 데이터 행 수"""
+    frames = iter([data]) if isinstance(data, pd.DataFrame) else iter(data)
+    first = next(frames, None)
+    if first is None:
+        first = pd.DataFrame()
+
+    letters = [get_column_letter(i) for i in range(1, len(first.columns) + 1)]
+
+    # 열 단위 서식/너비: 스타일은 열마다 한 번만 지정
+    widths = _column_widths(first) if autofit else [None] * len(letters)
+    cols = []
+    for idx, width in enumerate(widths, 1):
+        size = f' width="{width}" customWidth="1"' if width else ""
+        cols.append(f'<col min="{idx}" max="{idx}" style="{TEXT_STYLE}"{size}/>')
+
+    n_rows = 0
+    with zf.open(_zip_entry(entry), "w", force_zip64=True) as fh:
+        fh.write(
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f"<worksheet {_NS}>".encode("utf-8")
+        )
+        if cols:
+            fh.write(f"<cols>{''.join(cols)}</cols>".encode("utf-8"))
+        fh.write(b"<sheetData>")
+        fh.write(_row_xml(1, letters, [str(c) for c in first.columns]).encode("utf-8"))
+
+        row_idx = 1
+        for df in chain([first], frames):
+            for lo in range(0, len(df), WRITE_ROWS):
+                rows = []
+                for values in _text_values(df.iloc[lo:lo + WRITE_ROWS]):
+                    row_idx += 1
+                    rows.append(_row_xml(row_idx, letters, values))
+                fh.write("".join(rows).encode("utf-8"))
+            n_rows += len(df)
+        fh.write(b"</sheetData></worksheet>")
+    return n_rows
+
+
+def save_text_excel_sheets(sheets, path: Path, autofit: bool = True) -> dict[str, int]:
+    """[(시트명, DataFrame 또는 청크 반복자), ...] 를 시트 하나씩 차례로 텍스트 서식 저장
+    - 시트 자료는 그 시트를 쓸 때 처음 꺼냄 (생성기를 넘기면 시트 하나 분량만 메모리에)
+    - 시트명은 Excel 제한에 맞추고 겹치면 _2, _3 … / 시트가 없으면 빈 Sheet1
+    - 반환: {시트명: 데이터 행 수}
+    """
+    sheets = list(sheets) or [("Sheet1", pd.DataFrame())]
+    titles = _unique_titles([name for name, _ in sheets])
+    entries = "".join(
+        f'<sheet name={quoteattr(title)} sheetId="{i}" r:id="rId{i}"/>'
+        for i, title in enumerate(titles, 1)
+    )
+    workbook = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f"<workbook {_NS} {_NS_R}><sheets>{entries}</sheets></workbook>"
+    )
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    counts = {}
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(_zip_entry("[Content_Types].xml"), _content_types(len(titles)))
+        zf.writestr(_zip_entry("_rels/.rels"), _ROOT_RELS)
+        zf.writestr(_zip_entry("xl/workbook.xml"), workbook)
+        zf.writestr(_zip_entry("xl/_rels/workbook.xml.rels"), _workbook_rels(len(titles)))
+        zf.writestr(_zip_entry("xl/styles.xml"), _STYLES)
+        for i, (title, (_, data)) in enumerate(zip(titles, sheets), 1):
+            counts[title] = _write_sheet(zf, f"xl/worksheets/sheet{i}.xml", data, autofit)
+    return counts
+
+
+def save_text_excel(data, path: Path, sheet_name: str = "Sheet1", autofit: bool = True) -> int:
+    """DataFrame(또는 DataFrame 청크 반복자)을 모든 셀 텍스트 서식으로 저장
+    - 청크 반복자는 첫 청크의 컬럼/열 너비를 기준으로 기록
+    - 반환: 저장한 데이터 행 수(헤더 제외)
+    """
+    counts = save_text_excel_sheets([(sheet_name, data)], path, autofit=autofit)
+    return next(iter(counts.values()))
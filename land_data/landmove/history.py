@@ -0,0 +1,131 @@
+# ==========================================
+#  land_move PNU 이동 이력 조회 (흐름도 XML 공통)
+# ==========================================
+
+# [목적]
+# - 10.토지이동흐름도_xml(단건/일괄)과 12.토지이동흐름도_서비스(HTTP)가 같은 SQL·라벨 규칙 사용
+# - 이력 조건: 이동전_필지코드 = PNU OR 이동후_필지코드 = PNU
+#   → UNION ALL 두 가지로 나눠 이동전/이동후 필지코드 인덱스를 각각 사용 (landmove.schema)
+# - 정렬: 조회 PNU, 정리일자 ASC, 이동전/이동후 필지코드 보조 ASC
+
+# [조회 컬럼(에일리어스)]
+# - bf_pnu(이동전_필지코드), af_pnu(이동후_필지코드), land_move_kind(토지이동종목),
+#   cre_ymd(정리일자), owner_name(현재_소유자명), adm_name(행정구역명)
+
+# [사용 예]
+# from landmove.history import fetch_rows, label_content
+# rows = fetch_rows(st, conn, "4425031524100010003")    # st: landmove.storage, conn: st.connect()
+# write_diagram(rows, out_path, label_content)
+
+import re
+from itertools import groupby
+from typing import Any, Dict, List
+
+import pymysql
+
+from landmove.storage import q as _q
+from landmove.upsert import live_filter
+
+TABLE = "land_move"
+
+# 조회 컬럼(에일리어스 통일) — 단건/일괄 공통
+SELECT_COLS = """
+        m.`이동전_필지코드`   AS bf_pnu,
+        m.`이동후_필지코드`   AS af_pnu,
+        m.`토지이동종목`     AS land_move_kind,
+        m.`정리일자`         AS cre_ymd,
+        m.`현재_소유자명`     AS owner_name,
+        m.`행정구역명`       AS adm_name"""
+
+# 단건 조회용 FROM 절 (파라미터 PNU 1개)
+ONE_PNU = "(SELECT %s AS pnu) q"
+
+
+def period_pnus(table: str = TABLE) -> str:
+    """기간 내 이동 필지(이동전/이동후 PNU) FROM 절 — 정리일자 인덱스 범위 조회, 파라미터 (start, end, start, end)"""
+    return f"""(
+        SELECT `이동전_필지코드` AS pnu FROM {_q(table)}
+        WHERE `정리일자` BETWEEN %s AND %s AND `이동전_필지코드` <> ''
+        UNION
+        SELECT `이동후_필지코드` FROM {_q(table)}
+        WHERE `정리일자` BETWEEN %s AND %s AND `이동후_필지코드` <> ''
+    ) q"""
+
+
+def lineage_sql(st, src_bf: str, src_af: str, live: str = "", table: str = TABLE) -> str:
+    """PNU 이력 조회 SQL (이동전 = PNU / 이동후 = PNU 를 UNION ALL 로 나눠 각 인덱스 사용)
+    - src_bf, src_af: 조회 PNU를 내는 FROM 절(별칭 q, 컬럼 pnu). 임시 테이블은 한 쿼리에서
+      두 번 열 수 없어 가지마다 따로 지정
+    - 이동전·이동후가 모두 PNU 인 행은 첫 가지에서만 나옴 → 기존 OR 조건과 같은 결과
+    - live: 삭제표시 제외 조건(live_filter)
+    - NULL 안전 비교는 백엔드 연산자(MySQL <=>, SQLite IS)
+    """
+    return f"""
+    SELECT q.pnu AS query_pnu, {SELECT_COLS}
+    FROM {src_bf}
+    JOIN {_q(table)} m
+      ON m.`이동전_필지코드` = q.pnu {live}
+    UNION ALL
+    SELECT q.pnu AS query_pnu, {SELECT_COLS}
+    FROM {src_af}
+    JOIN {_q(table)} m
+      ON m.`이동후_필지코드` = q.pnu AND NOT (m.`이동전_필지코드` {st.null_eq} q.pnu) {live}
+    ORDER BY query_pnu, cre_ymd ASC, bf_pnu ASC, af_pnu ASC
+    """
+
+
+def group_by_pnu(rows: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """query_pnu 순으로 정렬된 조회 결과를 PNU별 레코드 목록으로 묶음"""
+    return {
+        pnu: [{k: v for k, v in r.items() if k != "query_pnu"} for r in grp]
+        for pnu, grp in groupby(rows, key=lambda r: r["query_pnu"])
+    }
+
+
+def pnu_sql(st, live: str = "", table: str = TABLE) -> str:
+    """단건 조회 SQL (파라미터 (pnu, pnu)) — 반복 조회 시 한 번 만들어 fetch_rows(sql=...) 로 재사용"""
+    return lineage_sql(st, ONE_PNU, ONE_PNU, live, table)
+
+
+def fetch_rows(st, conn, pnu: str, live: str | None = None, table: str = TABLE,
+               sql: str | None = None) -> List[Dict[str, Any]]:
+    """입력 PNU와 관련된 이동 이력 레코드 조회
+    - 반환: Dict 목록 (컬럼 에일리어싱으로 통일)
+    - 증분 적재(8 --upsert --tombstone)로 삭제표시된 행은 제외
+    - live: 미리 구한 live_filter 결과(반복 조회 시 컬럼 조회 생략)
+    - sql: 미리 만든 pnu_sql 결과(주면 live·table 은 쓰지 않음)
+    """
+    with conn.cursor(pymysql.cursors.DictCursor) as cur:
+        if sql is None:
+            if live is None:
+                live = live_filter(st, cur, table)
+            sql = pnu_sql(st, live, table)
+        cur.execute(sql, (pnu, pnu))
+        return group_by_pnu(cur.fetchall()).get(pnu, [])
+
+
+# -------------------- 라벨 --------------------
+def fmt_date8(d: str) -> str:
+    """정리일자 포맷 정규화
+    - 숫자만 남기고 길이 8(YYYYMMDD)이면 그대로 반환
+    - 그 외는 정제된 숫자열 그대로 반환(불완전 값 보존)
+    """
+    if not isinstance(d, str):
+        return ""
+    d = re.sub(r'\D', '', d)
+    if len(d) == 8:
+        return d
+    return d
+
+
+def label_content(r: Dict[str, Any]) -> str:
+    """라벨 텍스트(3행)
+    - 1행: 토지이동종목
+    - 2행: 정리일자(YYYYMMDD)
+    - 3행: 현재_소유자명
+    - 줄바꿈은 CRLF 문자로 연결 → 저장 시 DevExpress XML 의 &#xD;&#xA; 로 기록
+    """
+    line1 = r.get("land_move_kind") or ""
+    line2 = fmt_date8(r.get("cre_ymd", ""))
+    line3 = r.get("owner_name") or ""
+    return "\r\n".join([line1, line2, line3])
@@ -0,0 +1,146 @@
+# ==========================================
+#  CSV 수집: 인코딩 1회 판별 + 청크 단위 문자열 로딩
+# ==========================================
+
+# [목적]
+# - 새올/KRAS 추출 CSV(cp949/utf-8)를 인코딩별로 전체 재파싱하지 않도록
+#   파일 앞부분(최대 SAMPLE_BYTES)만 읽어 인코딩을 한 번에 판별
+# - 판별된 인코딩으로 dtype=str 청크 반복자를 반환 → 큰 도 단위 자료도 일정 메모리로 처리
+# - 월/반기별 추출본 여러 개: 파일명의 (YYYY_MM) 태그로 찾아(glob + 기간) 프로세스 풀에서 동시 파싱,
+#   pd.concat 한 번으로 합침. 행마다 원본 파일명(SOURCE_COL) 기록 → 중복 제거 시 최신 추출본 우선
+# - 메모리 절감 모드(landmove.memory): read_csv_text 는 청크마다 Arrow 문자열로 바꿔 이어 붙임
+#   (파일 전체를 object 문자열로 들고 있는 순간이 없도록)
+
+# [사용 예]
+# from landmove.ingest import iter_csv, read_csv_text
+# for chunk in iter_csv(path, chunksize=100_000):   # 청크 단위 처리
+#     ...
+# df = read_csv_text(path)                          # 전체를 한 번에(단일 파싱)
+# pnus = read_pnu_list("pnu목록.txt")               # 일괄 조회용 PNU 목록
+# files = discover_extracts(in_dir, "토지이동정리현황(소유권포함)(*).csv", since="202401")
+# df = read_csv_many(files, jobs=4)                 # 원본파일 컬럼 포함, 추출 시점 순
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import codecs
+import os
+import re
+
+import pandas as pd
+
+from landmove.normalize import normalize_pnu
+from landmove.memory import enabled as memory_mode, arrow_strings
+
+ENCODINGS = ("utf-8-sig", "utf-8", "cp949")
+SAMPLE_BYTES = 1 << 20        # 인코딩 판별용 샘플 크기(1MB)
+CHUNK_ROWS = 100_000          # 기본 청크 행 수
+SOURCE_COL = "원본파일"        # read_csv_many: 행별 원본 파일명
+_PERIOD_RE = re.compile(r"(\d{4})[_\-.]?(\d{2})\)?[^\d]*$")  # ...(YYYY_MM).csv
+
+
+def detect_encoding(path: Path, encodings=ENCODINGS, sample_bytes: int = SAMPLE_BYTES) -> str:
+    """파일 앞부분 바이트만 읽어 인코딩 판별
+    - UTF-8 BOM이 있으면 utf-8-sig
+    - 샘플이 모두 ASCII면 비ASCII 바이트가 나올 때까지 다음 블록을 이어서 확인
+    - 후보 순서대로 샘플 디코딩을 시도해 처음 성공한 인코딩 반환
+    """
+    with open(path, "rb") as f:
+        sample = f.read(sample_bytes)
+        while sample.isascii():
+            block = f.read(sample_bytes)
+            if not block:
+                break
+            sample = block  # 비ASCII가 처음 나온 블록만 판별에 사용
+
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+
+    for enc in encodings:
+        try:
+            # 샘플 끝에서 잘린 멀티바이트 문자는 오류로 보지 않음(final=False)
+            codecs.getincrementaldecoder(enc)().decode(sample, final=False)
+            return enc
+        except (UnicodeDecodeError, LookupError):
+            continue
+    raise UnicodeError(f"CSV 인코딩 판별 실패: {path} (후보={list(encodings)})")
+
+
+def iter_csv(path: Path, chunksize: int = CHUNK_ROWS, encoding: str | None = None, **kwargs):
+    """CSV를 dtype=str DataFrame 청크로 순차 반환 (선행 0 보존)"""
+    enc = encoding or detect_encoding(path)
+    kwargs.setdefault("dtype", str)
+    with pd.read_csv(path, encoding=enc, chunksize=chunksize, **kwargs) as reader:
+        yield from reader
+
+
+def read_csv_text(path: Path, encoding: str | None = None, **kwargs) -> pd.DataFrame:
+    """CSV 전체를 dtype=str로 한 번만 파싱해 반환 (절감 모드: 청크별 Arrow 문자열)"""
+    enc = encoding or detect_encoding(path)
+    kwargs.setdefault("dtype", str)
+    if memory_mode():
+        frames = [arrow_strings(c) for c in iter_csv(path, encoding=enc, **kwargs)]
+        df = pd.concat(frames, ignore_index=True) if frames else pd.read_csv(path, encoding=enc, nrows=0, **kwargs)
+    else:
+        df = pd.read_csv(path, encoding=enc, **kwargs)
+    print(f"[INFO] {Path(path).name} → 인코딩 {enc} (shape={df.shape})")
+    return df
+
+
+def read_pnu_list(path: Path) -> list[str]:
+    """PNU 목록 파일(한 줄에 1개, 숫자 외 문자 무시) → 정규화 PNU 목록(중복 제거, 순서 유지)"""
+    lines = Path(path).read_text(encoding=detect_encoding(path)).splitlines()
+    pnus = [p for p in normalize_pnu(lines) if p]
+    return list(dict.fromkeys(pnus))
+
+
+# -------------------- 추출본 여러 개 --------------------
+def extract_period(path) -> str:
+    """파일명 끝의 추출 시점 태그 → "YYYYMM" (예: ...(2024_07).csv → "202407", 없으면 "")"""
+    m = _PERIOD_RE.search(Path(path).stem)
+    return m.group(1) + m.group(2) if m else ""
+
+
+def discover_extracts(in_dir, pattern: str, since: str | None = None, until: str | None = None) -> list[Path]:
+    """in_dir 안에서 pattern(glob)에 맞는 추출본 목록 (추출 시점 → 파일명 순)
+    - since / until: "YYYYMM"(또는 YYYYMMDD 앞 6자리) 범위, 양끝 포함
+      * 범위를 주면 시점 태그가 없는 파일은 제외
+    """
+    since, until = (since or "")[:6], (until or "")[:6]
+    files = []
+    for p in Path(in_dir).glob(pattern):
+        if not p.is_file():
+            continue
+        ym = extract_period(p)
+        if (since or until) and not ym:
+            continue
+        if (since and ym < since) or (until and ym > until):
+            continue
+        files.append(p)
+    return sorted(files, key=lambda p: (extract_period(p), p.name))
+
+
+def _read_tagged(path: Path, tag_col: str | None, kwargs: dict) -> pd.DataFrame:
+    df = read_csv_text(path, **kwargs)
+    if tag_col:
+        df[tag_col] = Path(path).name
+    return df
+
+
+def read_csv_many(paths, jobs: int | None = None, tag_col: str | None = SOURCE_COL, **kwargs) -> pd.DataFrame:
+    """CSV 여러 개를 프로세스 풀에서 동시에 파싱 → 한 번의 concat (입력 순서 유지)
+    - tag_col: 행마다 원본 파일명을 기록할 컬럼 (None 이면 생략)
+    - jobs: 동시 파싱 프로세스 수 (기본: CPU 수, 파일 1개면 현재 프로세스에서)
+    - 스크립트에서 호출할 때는 if __name__ == "__main__": 안에서 (Windows spawn)
+    """
+    paths = [Path(p) for p in paths]
+    if not paths:
+        raise FileNotFoundError("읽을 CSV가 없습니다.")
+    workers = min(len(paths), jobs or os.cpu_count() or 1)
+    if workers <= 1:
+        frames = [_read_tagged(p, tag_col, kwargs) for p in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            frames = list(pool.map(_read_tagged, paths, [tag_col] * len(paths), [kwargs] * len(paths)))
+    df = pd.concat(frames, ignore_index=True, copy=False)
+    print(f"[INFO] CSV {len(paths)}개 병합 (프로세스 {workers}) → shape={df.shape}")
+    return df
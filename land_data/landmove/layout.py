@@ -0,0 +1,309 @@
+# ==========================================
+#  원본 레이아웃(컬럼 구성) 등록부: 표준 컬럼명 ↔ 실제 헤더 + 형식
+# ==========================================
+
+# [목적]
+# - 스크립트마다 따로 두던 컬럼 자동 탐색(find_col 부분일치 / _find_first_col / pick_column)을
+#   알려진 원본 구성의 선언 하나로 대체 → "원인"·"부" 같은 느슨한 키워드가 엉뚱한 컬럼에
+#   걸리는 일 없이 정확한 헤더 이름으로만 매칭
+# - 헤더 목록의 지문(튜플) → 레이아웃을 사전에서 바로 찾음 (처음 보는 헤더만 식별 후 캐시)
+# - 단계에 필요한 표준 컬럼만 골라 읽기(usecols / parquet columns) → 파싱 시간·메모리 절감
+
+# [등록된 레이아웃]
+# - 토지(임야)기본         : 원본 CSV(22개 컬럼)
+# - 토지(임야)기본_필지코드 : 1단계 결과(필지코드(19자리) 추가, 구성 컬럼 제거) 및 기간내/기간외
+# - 일반용조서(말소용)     : 원본 CSV 및 기간내/기간외
+# - 토지이동정리현황       : 원본 CSV(소유자등록번호 유무 두 가지)
+# - 토지이동정리현황_필지코드 : 2단계/44200 정제 결과 및 기간내/기간외 (삭제 컬럼은 시군구마다 다름)
+
+# [표준 컬럼명]  (레이아웃이 달라도 같은 의미는 같은 이름)
+# - 필지코드, 이동전_필지코드, 이동후_필지코드, 이동사유(대장 토지이동사유), 이동종목(정리현황 토지이동종목),
+#   이동일자(토지이동일자/정리일자), 면적, 이동전_면적, 이동후_면적, 소유구분, 소유권변동원인, …
+
+# [형식]
+# - text(기본): 문자열 그대로 (코드 컬럼도 선행 0 보존을 위해 text) / pnu: 19자리 필지코드 /
+#   date8: YYYYMMDD / area: 면적(숫자) / price: 공시지가·전년지가 등(원, 숫자)
+#   * 읽을 때는 모두 문자열(dtype=str)로 읽음 — 형식은 필요한 곳에서 kinds() 로 참고
+#     (schema: pnu → CHAR(19), date8 → CHAR(8), area → DECIMAL / memory.compact: area·price → 숫자 후보)
+
+# [사용 예]
+# from landmove.layout import resolve, read_source
+# lay = resolve(table_columns(path))          # 헤더 → 레이아웃 (지문 캐시)
+# date_col = lay.col("이동일자")               # 표준명 → 실제 헤더 (없으면 None)
+# df = read_source(path, ["이동전_필지코드", "이동후_필지코드", "이동종목"])  # 필요한 컬럼만
+# iter_csv(src, usecols=usecols_without([src], drop_cols))                   # 삭제할 컬럼은 읽지 않음
+# kinds(df.columns)                           # 실제 헤더 → 형식 (부분 컬럼 표도 헤더 이름으로)
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pandas as pd
+
+from landmove.ingest import detect_encoding, read_csv_text, SOURCE_COL
+from landmove.store import read_table, table_columns
+
+TEXT, PNU, DATE8, AREA, PRICE = "text", "pnu", "date8", "area", "price"
+
+
+@dataclass(frozen=True)
+class Layout:
+    """원본 구성 하나: 표준명 → (실제 헤더, 형식). keys: 이 헤더가 모두 있으면 이 레이아웃"""
+    name: str
+    fields: dict[str, tuple[str, str]]
+    keys: tuple[str, ...]
+    headers: tuple[tuple[str, ...], ...] = ()   # 알려진 전체 헤더(순서 포함) → 지문 사전에 미리 등록
+
+
+@dataclass
+class Resolved:
+    """헤더 목록에 맞춘 레이아웃: 실제로 있는 컬럼만 매핑"""
+    layout: Layout
+    columns: list[str]                                      # 실제 헤더 (원래 순서)
+    mapping: dict[str, str] = field(default_factory=dict)   # 표준명 → 실제 헤더
+
+    @property
+    def name(self) -> str:
+        return self.layout.name
+
+    def col(self, *names: str) -> str | None:
+        """표준명(여러 개면 앞에서부터) → 실제 헤더, 없으면 None"""
+        for n in names:
+            if n in self.mapping:
+                return self.mapping[n]
+        return None
+
+    def require(self, *names: str) -> list[str]:
+        missing = [n for n in names if n not in self.mapping]
+        if missing:
+            raise ValueError(f"[오류] {self.name}: 필수 컬럼이 없습니다 {missing} (현재 열: {self.columns})")
+        return [self.mapping[n] for n in names]
+
+    def kind(self, name: str) -> str:
+        """표준명 → 형식 (레이아웃에 없으면 text)"""
+        return self.layout.fields.get(name, ("", TEXT))[1]
+
+    def kinds(self) -> dict[str, str]:
+        """실제 헤더 → 형식 (원래 열 순서, 레이아웃에 없는 헤더는 text)"""
+        by_col = {self.mapping[n]: k for n, (_, k) in self.layout.fields.items() if n in self.mapping}
+        return {c: by_col.get(c, TEXT) for c in self.columns}
+
+
+def _f(header: str, kind: str = TEXT) -> tuple[str, str]:
+    return header, kind
+
+
+# -------------------- 레이아웃 선언 --------------------
+_LAND_COMMON = {
+    "지목": _f("지목"),
+    "면적": _f("면적", AREA),
+    "축척": _f("축척"),
+    "도호": _f("도호"),
+    "등급": _f("등급"),
+    "이동사유": _f("토지이동사유"),
+    "이동일자": _f("토지이동일자", DATE8),
+    "소유구분": _f("소유구분"),
+    "소유자명": _f("소유자명"),
+    "등록번호": _f("등록번호"),
+    "소유자주소": _f("소유자주소"),
+    "소유권변동원인": _f("소유권변동원인"),
+    "소유권변동일자": _f("소유권변동일자", DATE8),
+    "공유인수": _f("공유인수"),
+    "대장대조필": _f("대장대조필"),
+    "공시지가": _f("개별공시지가(원)", PRICE),
+    "기준일": _f("기준일"),
+}
+
+LAND = Layout(
+    "토지(임야)기본",
+    fields={
+        "행정구역코드": _f("행정구역코드"),
+        "토지소재코드": _f("토지소재코드"),
+        "대장구분": _f("대장구분"),
+        "본번": _f("본번"),
+        "부번": _f("부번"),
+        **_LAND_COMMON,
+    },
+    keys=("행정구역코드", "토지소재코드", "본번", "부번"),
+    headers=((
+        "행정구역코드", "토지소재코드", "대장구분", "본번", "부번", "지목", "면적", "축척", "도호", "등급",
+        "토지이동사유", "토지이동일자", "소유구분", "소유자명", "등록번호", "소유자주소",
+        "소유권변동원인", "소유권변동일자", "공유인수", "대장대조필", "개별공시지가(원)", "기준일",
+    ),),
+)
+
+LAND_PNU = Layout(
+    "토지(임야)기본_필지코드",
+    fields={"필지코드": _f("필지코드(19자리)", PNU), **_LAND_COMMON},
+    keys=("필지코드(19자리)", "토지이동사유"),
+)
+
+MALSO = Layout(
+    "일반용조서(말소용)",
+    fields={
+        "필지코드": _f("PNU", PNU),
+        "토지코드": _f("토지코드"),
+        "대장구분": _f("대장구분"),
+        "본번": _f("본번"),
+        "부번": _f("부번"),
+        "지목": _f("지목"),
+        "면적": _f("면적", AREA),
+        "등급": _f("토지등급"),
+        "기수등급": _f("기수등급"),
+        "축척": _f("축척"),
+        "도호": _f("도호"),
+        "공시지가": _f("개별공시지가", PRICE),
+        "이동사유": _f("토지이동사유코드"),
+        "이동일자": _f("토지이동일자", DATE8),
+        "소유자명": _f("성명"),
+        "소유구분": _f("소유구분"),
+        "등록번호": _f("등록번호"),
+        "소유자주소": _f("주소"),
+        "소유권변동원인": _f("소유권변동코드"),
+        "소유권변동일자": _f("소유권변동일자", DATE8),
+        "공유인수": _f("공유인수"),
+    },
+    keys=("PNU", "토지이동사유코드"),
+    headers=((
+        "PNU", "토지코드", "대장구분", "본번", "부번", "지목", "면적", "토지등급", "기수등급", "축척", "도호",
+        "개별공시지가", "토지이동사유코드", "토지이동일자", "성명", "소유구분", "등록번호", "주소",
+        "소유권변동코드", "소유권변동일자", "공유인수",
+    ),),
+)
+
+_MOVE_COMMON = {
+    "이동종목": _f("토지이동종목"),
+    "일련번호": _f("일련번호"),
+    "이동일자": _f("정리일자", DATE8),
+    "신청구분": _f("신청구분"),
+    "행정구역명": _f("행정구역명"),
+    "이동전_지목": _f("이동전_지목"),
+    "이동전_면적": _f("이동전_면적", AREA),
+    "이동후_지목": _f("이동후_지목"),
+    "이동후_면적": _f("이동후_면적", AREA),
+    "이동전지번수": _f("이동전지번수"),
+    "이동후지번수": _f("이동후지번수"),
+    "소유구분": _f("현재_소유구분"),
+    "소유자명": _f("현재_소유자명"),
+    "등록번호": _f("현재_소유자등록번호"),
+    "소유자주소": _f("현재_소유자주소"),
+    "신청_소유구분": _f("신청_소유구분"),
+    "신청_소유자명": _f("신청_소유자명"),
+    "신청_소유자등록번호": _f("신청_소유자등록번호"),
+    "신청_소유자주소": _f("신청_소유자주소"),
+    "원본파일": _f(SOURCE_COL),
+}
+_PRICE = ("공시지가", "공시지가_수시", "전년지가", "전년지가_수시", "2년전지가", "2년전지가_수시",
+          "3년전지가", "3년전지가_수시", "4년전지가", "4년전지가_수시")
+_MOVE_HEAD = ("토지이동종목", "일련번호", "정리일자", "신청구분", "행정구역명", "지역코드", "대장구분",
+              "이동전_지번", "이동전_지목", "이동전_면적", "이동후_지번", "이동후_지목", "이동후_면적",
+              "이동전지번수", "이동후지번수")
+
+MOVE = Layout(
+    "토지이동정리현황",
+    fields={
+        **_MOVE_COMMON,
+        "지역코드": _f("지역코드"),
+        "대장구분": _f("대장구분"),
+        "이동전_지번": _f("이동전_지번"),
+        "이동후_지번": _f("이동후_지번"),
+        **{c: _f(c, PRICE) for c in _PRICE},
+    },
+    keys=("토지이동종목", "지역코드", "이동전_지번", "이동후_지번"),
+    headers=(
+        _MOVE_HEAD + ("현재_소유구분", "현재_소유자명", "현재_소유자등록번호", "현재_소유자주소",
+                      "신청_소유구분", "신청_소유자명", "신청_소유자등록번호", "신청_소유자주소") + _PRICE,
+        _MOVE_HEAD + ("현재_소유구분", "현재_소유자명", "현재_소유자주소",
+                      "신청_소유구분", "신청_소유자명", "신청_소유자주소") + _PRICE,
+    ),
+)
+
+MOVE_PNU = Layout(
+    "토지이동정리현황_필지코드",
+    fields={
+        "이동전_필지코드": _f("이동전_필지코드", PNU),
+        "이동후_필지코드": _f("이동후_필지코드", PNU),
+        **_MOVE_COMMON,
+        **{c: _f(c, PRICE) for c in _PRICE},
+    },
+    keys=("이동전_필지코드", "이동후_필지코드", "토지이동종목"),
+)
+
+LAYOUTS = [MOVE_PNU, MOVE, LAND_PNU, LAND, MALSO]   # 식별 순서 (구체적인 것부터)
+
+
+# -------------------- 식별 --------------------
+_BY_HEADER: dict[tuple[str, ...], Layout] = {h: lay for lay in LAYOUTS for h in lay.headers}
+_KIND_BY_HEADER: dict[str, str] = {h: k for lay in LAYOUTS for h, k in lay.fields.values()}  # 헤더 이름별 형식
+_CACHE: dict[tuple[str, ...], Resolved] = {}
+
+
+def _identify(headers: tuple[str, ...]) -> Layout | None:
+    present = set(headers)
+    for lay in LAYOUTS:
+        if present.issuperset(lay.keys):
+            return lay
+    return None
+
+
+def resolve(columns, layout: Layout | None = None) -> Resolved:
+    """헤더 목록 → Resolved. 지문(헤더 튜플)이 알려져 있으면 사전 조회 한 번, 처음 보면 keys 로 식별 후 캐시
+    - layout 을 주면 식별 없이 그 레이아웃으로 매핑
+    """
+    raw = tuple(str(c) for c in columns)
+    key = raw if layout is None else raw + ("\0" + layout.name,)
+    hit = _CACHE.get(key)
+    if hit is not None:
+        return hit
+    headers = tuple(c.strip() for c in raw)
+    lay = layout or _BY_HEADER.get(headers) or _identify(headers)
+    if lay is None:
+        raise ValueError(f"[오류] 알 수 없는 원본 구성입니다 (등록된 레이아웃: {[x.name for x in LAYOUTS]})\n"
+                         f"현재 열: {list(raw)}")
+    actual = dict(zip(headers, raw))  # 앞뒤 공백을 뺀 이름 → 실제 헤더
+    mapping = {n: actual[h] for n, (h, _) in lay.fields.items() if h in actual}
+    res = _CACHE[key] = Resolved(lay, list(raw), mapping)
+    return res
+
+
+def kinds(columns) -> dict[str, str]:
+    """헤더 목록 → {실제 헤더: 형식}
+    - 등록된 레이아웃으로 식별되면 그 선언, 아니면(일부 컬럼만 남긴 표 등) 등록된 헤더 이름별 형식
+    """
+    columns = list(columns)
+    try:
+        return resolve(columns).kinds()
+    except ValueError:
+        return {str(c): _KIND_BY_HEADER.get(str(c).strip(), TEXT) for c in columns}
+
+
+# -------------------- 읽기 --------------------
+def source_columns(path: Path) -> list[str]:
+    """원본 CSV(머리행만) 또는 단계 결과(.parquet 스키마/xlsx 머리행)의 컬럼명"""
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        return [str(c) for c in pd.read_csv(path, encoding=detect_encoding(path), nrows=0).columns]
+    return table_columns(path)
+
+
+def usecols_without(paths, skip) -> callable:
+    """여러 원본 헤더에서 skip 을 뺀 컬럼만 읽는 usecols (읽자마자 삭제할 컬럼은 파싱하지 않음)
+    - frozenset 멤버십 → 프로세스 풀(read_csv_many)로 넘길 수 있음, 열 순서는 파일 그대로
+    """
+    skip = set(skip)
+    return frozenset(c for p in paths for c in source_columns(p) if c not in skip).__contains__
+
+
+def read_source(path: Path, fields: list[str] | None = None, layout: Layout | None = None) -> pd.DataFrame:
+    """원본 CSV/단계 결과를 표준명 fields 에 해당하는 컬럼만 읽음 (fields=None 이면 전체)
+    - 컬럼명은 실제 헤더 그대로, 원래 열 순서 유지 / 모든 값 문자열
+    - 레이아웃에 없는 표준명은 무시 (필수 컬럼은 resolve(...).require 로 확인)
+    """
+    path = Path(path)
+    res = resolve(source_columns(path), layout)
+    usecols = None
+    if fields is not None:
+        wanted = {res.mapping[f] for f in fields if f in res.mapping}
+        usecols = [c for c in res.columns if c in wanted]
+    if path.suffix.lower() == ".csv":
+        return read_csv_text(path, usecols=usecols) if usecols is not None else read_csv_text(path)
+    return read_table(path, columns=usecols)
@@ -0,0 +1,239 @@
+# ==========================================
+#  필지 연계 그래프 (CSR + union-find)
+# ==========================================
+
+# [목적]
+# - BFS 깊이마다 모든 파일·모든 PNU 컬럼을 isin 으로 다시 스캔하지 않도록
+#   PNU 역색인(pnuindex.postings)에서 PNU ↔ 행 이분 그래프를 한 번만 구축
+# - 같은 행에 함께 나온 PNU(이동전/이동후 등)는 서로 연결된 것으로 봄
+# - union-find 로 PNU마다 연계 ID(컴포넌트) 부여
+# - hop(연결 깊이)은 조회 시 CSR 배열 위에서 벡터 연산 BFS로 계산
+# - 구축 결과는 .npz 로 저장, 색인 원본 지문이 같으면 그대로 재사용
+# - PNU 는 정수 키(landmove.pnukey)로 보관·탐색 → 문자열은 조회 결과(expand, 노드/간선 목록)에서만
+
+# [hop 규칙]  (기존 7.데이터검수_전체.bfs_expand 와 동일)
+# - 시작 PNU의 hop = 0, hop d 인 PNU가 들어 있는 행의 hop = d (최소값)
+# - hop d 행에서 새로 발견된 PNU의 hop = d + 1
+# - max_depth 가 주어지면 hop <= max_depth 인 행까지만 탐색
+
+# [사용 예]
+# from landmove.lineage import load_graph
+# graph = load_graph(conn, BASE_DIR / ".pnu_graph.npz", TARGET_COLS)
+# row_hops, pnus = graph.expand("4425031524100010003")
+# nodes, edges = graph.node_edge_lists()
+
+import hashlib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from landmove.pnukey import NONE, encode, decode, from_sql
+
+GRAPH_FORMAT = 2  # 저장 형식이 바뀌면 올려서 기존 .npz 무효화 (2: PNU 정수 키)
+
+
+def _gather(ptr: np.ndarray, idx: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+    """CSR 에서 nodes 각각의 이웃을 한 배열로 모음"""
+    starts = ptr[nodes]
+    lens = ptr[nodes + 1] - starts
+    total = int(lens.sum())
+    if total == 0:
+        return idx[:0]
+    offs = np.repeat(starts - (np.cumsum(lens) - lens), lens) + np.arange(total)
+    return idx[offs]
+
+
+def _csr(src: np.ndarray, dst: np.ndarray, n_src: int) -> tuple[np.ndarray, np.ndarray]:
+    order = np.argsort(src, kind="stable")
+    ptr = np.zeros(n_src + 1, dtype=np.int64)
+    np.add.at(ptr, src + 1, 1)
+    return np.cumsum(ptr), dst[order]
+
+
+def _union_find(n: int, row_ptr: np.ndarray, row_pnus: np.ndarray) -> np.ndarray:
+    """행마다 그 행의 PNU들을 하나로 묶어 PNU별 연계 ID(0부터 연속) 반환"""
+    parent = list(range(n))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]  # 경로 절반 압축
+            x = parent[x]
+        return x
+
+    ptr = row_ptr.tolist()
+    pnus = row_pnus.tolist()
+    for r in range(len(ptr) - 1):
+        a, b = ptr[r], ptr[r + 1]
+        if b - a < 2:
+            continue
+        root = find(pnus[a])
+        for p in pnus[a + 1:b]:
+            q = find(p)
+            if q != root:
+                if q < root:
+                    root, q = q, root
+                parent[q] = root
+
+    roots = np.fromiter((find(x) for x in range(n)), dtype=np.int64, count=n)
+    _, comp = np.unique(roots, return_inverse=True)
+    return comp.astype(np.int64)
+
+
+class PnuGraph:
+    """PNU ↔ 행 이분 그래프 (CSR 양방향) + PNU별 연계 ID"""
+
+    def __init__(self, pnus, sources, row_src, row_id, p_ptr, p_rows, r_ptr, r_pnus, comp, version=""):
+        self.pnus = pnus          # 정렬된 PNU 정수 키 배열 (PNU 번호 = 위치)
+        self.sources = sources    # 원본명 배열
+        self.row_src = row_src    # 행 번호 → 원본 번호
+        self.row_id = row_id      # 행 번호 → 원본 내 행 위치
+        self.p_ptr, self.p_rows = p_ptr, p_rows  # PNU → 행
+        self.r_ptr, self.r_pnus = r_ptr, r_pnus  # 행 → PNU (컬럼 순서)
+        self.comp = comp          # PNU → 연계 ID
+        self.version = version
+
+    # -------------------- 구축/저장 --------------------
+    @classmethod
+    def from_postings(cls, postings: pd.DataFrame, col_order: list[str], version: str = "") -> "PnuGraph":
+        """postings(pnu: 색인 정수, source, row_id, col) → 그래프"""
+        rank = {c: i for i, c in enumerate(col_order)}
+        post = postings.assign(_rank=postings["col"].map(rank).fillna(len(rank)))
+        post = post.sort_values(["source", "row_id", "_rank"], kind="stable")
+        post = post.drop_duplicates(["source", "row_id", "pnu"])
+
+        pnus, p_code = np.unique(from_sql(post["pnu"].to_numpy()), return_inverse=True)
+        sources, s_code = np.unique(post["source"].to_numpy(dtype=str), return_inverse=True)
+        rid = post["row_id"].to_numpy(dtype=np.int64)
+
+        # 행 번호: (원본, 행 위치) 순서대로 0부터
+        key = np.stack([s_code, rid], axis=1)
+        row_keys, r_code = np.unique(key, axis=0, return_inverse=True)
+        r_code = r_code.reshape(-1)
+
+        p_ptr, p_rows = _csr(p_code, r_code, len(pnus))
+        r_ptr, r_pnus = _csr(r_code, p_code, len(row_keys))  # 행 안에서는 컬럼 순서 유지
+        comp = _union_find(len(pnus), r_ptr, r_pnus)
+        return cls(pnus, sources, row_keys[:, 0], row_keys[:, 1], p_ptr, p_rows, r_ptr, r_pnus, comp, version)
+
+    def save(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez(
+                f, pnus=self.pnus, sources=self.sources, row_src=self.row_src, row_id=self.row_id,
+                p_ptr=self.p_ptr, p_rows=self.p_rows, r_ptr=self.r_ptr, r_pnus=self.r_pnus,
+                comp=self.comp, version=np.array(self.version),
+            )
+
+    @classmethod
+    def load(cls, path: Path) -> "PnuGraph":
+        with np.load(path, allow_pickle=False) as z:
+            return cls(
+                z["pnus"], z["sources"], z["row_src"], z["row_id"],
+                z["p_ptr"], z["p_rows"], z["r_ptr"], z["r_pnus"], z["comp"], str(z["version"]),
+            )
+
+    # -------------------- 조회 --------------------
+    def pnu_index(self, pnu: str) -> int:
+        """PNU 번호(없으면 -1)"""
+        key = encode(pnu)
+        if key == NONE:
+            return -1
+        i = int(np.searchsorted(self.pnus, key))
+        return i if i < len(self.pnus) and self.pnus[i] == key else -1
+
+    def component_of(self, pnu: str) -> list[str]:
+        """같은 연계 ID 의 PNU 전체(정렬)"""
+        i = self.pnu_index(pnu)
+        if i < 0:
+            return [pnu]
+        return decode(self.pnus[self.comp == self.comp[i]]).tolist()
+
+    def expand(self, pnu: str, max_depth: int | None = None) -> tuple[dict[str, dict[int, int]], dict[str, int]]:
+        """시작 PNU에서 hop 별 확장
+        - 반환: ({원본명: {행 위치: hop}}, {발견 PNU: hop})
+        """
+        row_hops = {str(s): {} for s in self.sources}
+        start = self.pnu_index(pnu)
+        if start < 0:
+            return row_hops, {pnu: 0}
+
+        dist_p = np.full(len(self.pnus), -1, dtype=np.int64)
+        dist_r = np.full(len(self.row_id), -1, dtype=np.int64)
+        dist_p[start] = 0
+        frontier = np.array([start], dtype=np.int64)
+        depth = 0
+        while frontier.size and (max_depth is None or depth <= max_depth):
+            rows = np.unique(_gather(self.p_ptr, self.p_rows, frontier))
+            rows = rows[dist_r[rows] < 0]
+            dist_r[rows] = depth
+            nxt = np.unique(_gather(self.r_ptr, self.r_pnus, rows))
+            nxt = nxt[dist_p[nxt] < 0]
+            dist_p[nxt] = depth + 1
+            frontier = nxt
+            depth += 1
+
+        hit = np.flatnonzero(dist_r >= 0)
+        for r in hit.tolist():
+            row_hops[str(self.sources[self.row_src[r]])][int(self.row_id[r])] = int(dist_r[r])
+        found = np.flatnonzero(dist_p >= 0)
+        return row_hops, dict(zip(decode(self.pnus[found]).tolist(), dist_p[found].tolist()))
+
+    # -------------------- 일괄 --------------------
+    def node_edge_lists(self) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """전체 연계 구성
+        - 노드: PNU, 연계ID, 연계_PNU수
+        - 간선: 행마다 첫 PNU(컬럼 순서 기준) → 나머지 PNU, 원본/행 위치 포함
+        """
+        sizes = np.bincount(self.comp) if len(self.comp) else np.zeros(0, dtype=np.int64)
+        nodes = pd.DataFrame({
+            "PNU": decode(self.pnus),
+            "연계ID": self.comp,
+            "연계_PNU수": sizes[self.comp],
+        }).sort_values(["연계ID", "PNU"], kind="stable")
+
+        lens = np.diff(self.r_ptr)
+        multi = np.flatnonzero(lens >= 2)
+        heads = self.r_pnus[self.r_ptr[multi]]
+        n_tail = lens[multi] - 1
+        tail_rows = np.repeat(multi, n_tail)
+        tail_pos = np.repeat(self.r_ptr[multi] + 1 - (np.cumsum(n_tail) - n_tail), n_tail) + np.arange(int(n_tail.sum()))
+        a = np.repeat(heads, n_tail)
+        b = self.r_pnus[tail_pos]
+        edges = pd.DataFrame({
+            "PNU_A": decode(self.pnus[a]),
+            "PNU_B": decode(self.pnus[b]),
+            "연계ID": self.comp[a],
+            "원본": self.sources[self.row_src[tail_rows]],
+            "행위치": self.row_id[tail_rows],
+        }).sort_values(["연계ID", "원본", "행위치"], kind="stable")
+        return nodes.reset_index(drop=True), edges.reset_index(drop=True)
+
+
+# -------------------- 색인 연동 --------------------
+def graph_version(conn, col_order: list[str]) -> str:
+    """그래프 버전: 색인된 원본 지문 + 컬럼 순서 + 형식 번호"""
+    h = hashlib.sha256(f"{GRAPH_FORMAT}|{'|'.join(col_order)}".encode())
+    for name, digest in conn.execute("SELECT name, digest FROM sources ORDER BY name"):
+        h.update(f"|{name}={digest}".encode())
+    return h.hexdigest()
+
+
+def load_graph(conn, cache_path: Path, col_order: list[str]) -> PnuGraph:
+    """저장된 그래프가 현재 색인과 같은 버전이면 로딩, 아니면 postings 로 재구축·저장"""
+    cache_path = Path(cache_path)
+    version = graph_version(conn, col_order)
+    if cache_path.exists():
+        try:
+            graph = PnuGraph.load(cache_path)
+            if graph.version == version:
+                return graph
+        except (OSError, KeyError, ValueError):
+            pass  # 손상/구버전 → 재구축
+
+    postings = pd.read_sql_query("SELECT pnu, source, row_id, col FROM postings", conn)
+    graph = PnuGraph.from_postings(postings, col_order, version)
+    graph.save(cache_path)
+    print(f"[INFO] 연계 그래프 구축: PNU {len(graph.pnus):,} / 행 {len(graph.row_id):,} / 연계 {len(np.unique(graph.comp)):,}")
+    return graph
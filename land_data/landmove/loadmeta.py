@@ -0,0 +1,92 @@
+# ==========================================
+#  DB 적재 이력(적재한 원본 지문) — 같은 원본이면 재적재 생략
+# ==========================================
+
+# [목적]
+# - 테이블별로 마지막에 적재한 원본 파일의 지문(sha256)·행 수·적재 시각을 메타 테이블에 기록
+# - 다음 실행에서 원본 지문이 같고 테이블이 남아 있으면 엑셀 재로딩/DROP·CREATE 를 건너뜀
+#   (예: 11.토지이동흐름도_파이프라인 --pnu 를 PNU 10개에 실행해도 업로드는 1회)
+# - 지문 대상은 read_table 이 실제로 읽는 파일(.parquet 우선, 없으면 xlsx)
+# - load_fingerprint(): 마지막 적재 기록 → 조회 결과 캐시 무효화 키
+
+# [메타 테이블]  (적재 대상과 같은 DB)
+# - _load_meta(table_name PK, source, digest CHAR(64), n_rows, loaded_at DATETIME)
+
+# [사용 예]
+# from landmove.loadmeta import source_fingerprint, is_loaded, record_load
+# digest = source_fingerprint(excel_path)
+# if not is_loaded(st, conn, table, digest):          # st: landmove.storage, conn: st.connect()
+#     ... 업로드 ...
+#     record_load(st, conn, table, excel_path, digest, len(df))
+
+import hashlib
+from pathlib import Path
+
+from landmove.storage import q as _q
+from landmove.store import table_source
+
+META_TABLE = "_load_meta"
+_META_COLS = ["table_name", "source", "digest", "n_rows", "loaded_at"]
+
+
+def source_fingerprint(path) -> str:
+    """read_table 이 읽을 파일 내용의 sha256 (hex)"""
+    with open(table_source(Path(path)), "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _ensure_meta(st, cur):
+    cur.execute(f"""
+        CREATE TABLE IF NOT EXISTS {_q(META_TABLE)} (
+            `table_name` VARCHAR(64) NOT NULL PRIMARY KEY,
+            `source`     VARCHAR(512) NOT NULL,
+            `digest`     CHAR(64) NOT NULL,
+            `n_rows`     BIGINT NOT NULL,
+            `loaded_at`  DATETIME NOT NULL
+        ){st.table_options}
+    """)
+
+
+def last_load(st, conn, table: str) -> dict | None:
+    """마지막 적재 기록 {"source", "digest", "n_rows", "loaded_at"} (없으면 None)"""
+    with conn.cursor() as cur:
+        _ensure_meta(st, cur)
+        cur.execute(
+            f"SELECT `source`, `digest`, `n_rows`, `loaded_at` FROM {_q(META_TABLE)} WHERE `table_name` = %s",
+            (table,),
+        )
+        row = cur.fetchone()
+    conn.commit()
+    if row is None:
+        return None
+    return row if isinstance(row, dict) else dict(zip(_META_COLS[1:], row))
+
+
+def is_loaded(st, conn, table: str, digest: str) -> bool:
+    """같은 지문으로 적재한 기록이 있고 테이블도 남아 있으면 True"""
+    meta = last_load(st, conn, table)
+    if not meta or meta["digest"] != digest:
+        return False
+    with conn.cursor() as cur:
+        return st.table_exists(cur, table)
+
+
+def record_load(st, conn, table: str, source, digest: str, n_rows: int):
+    """적재 완료 기록(테이블별 1행, 덮어씀) + 커밋"""
+    with conn.cursor() as cur:
+        _ensure_meta(st, cur)
+        cur.execute(
+            f"INSERT INTO {_q(META_TABLE)} ({', '.join(_q(c) for c in _META_COLS)}) "
+            f"VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP) {st.upsert_clause('table_name', _META_COLS)}",
+            (table, str(source), digest, int(n_rows)),
+        )
+    conn.commit()
+
+
+def load_fingerprint(st, conn, table: str) -> str:
+    """테이블 내용 버전 문자열(마지막 적재 기록 digest@loaded_at, 기록 없으면 "-")
+    - 적재 스크립트(8 / 11)를 거친 변경만 반영. information_schema UPDATE_TIME 은
+      MySQL 8 에서 통계 캐시(information_schema_stats_expiry, 기본 1일) 때문에 쓰지 않음
+    """
+    meta = last_load(st, conn, table)
+    return f"{meta['digest']}@{meta['loaded_at']}" if meta else "-"
@@ -0,0 +1,216 @@
+# ==========================================
+#  메모리 절감 모드: 범주형 · Arrow 문자열 · 숫자 면적/지가
+# ==========================================
+
+# [목적]
+# - 모든 값을 dtype=str(object)로 들고 다니면 지목·소유구분·토지이동종목·신청구분·행정구역명처럼
+#   몇 가지 값이 수백만 번 반복되는 컬럼도 셀마다 파이썬 문자열 객체를 따로 가짐
+#   → 도 단위 자료는 object 컬럼만으로 메모리가 큰 장비가 필요
+# - 환경변수 LANDMOVE_MEMORY=1 일 때만(opt-in) 자료를 작은 형식으로 들고 다님
+#   * 읽기(store.read_table / iter_table / partition / ingest.read_csv_text): 문자열을 Arrow 문자열로
+#     (파이썬 객체를 만들지 않음, 결측은 NaN 그대로)
+#   * compact(): 반복이 많은 컬럼은 범주형(category), 면적·지가는 숫자(Float64), 나머지는 Arrow 문자열
+# - 단계별 최대 메모리(프로세스 최대 RSS)를 종료 시 출력(track) → 모드 끄고/켜고 비교
+
+# [규칙]
+# - 값은 바뀌지 않음: 숫자 변환은 다시 문자열로 쓸 때(as_text) 원래 표기와 모두 같을 때만
+#   ("33" → 33 → "33", "3280.8" 그대로 / "0012"·"1,234" 같은 값이 하나라도 있으면 문자열 유지)
+# - 코드 컬럼(필지코드·지목·소유구분 등)은 숫자로 바꾸지 않음 → 선행 0 보존 (범주형/Arrow 문자열)
+# - 숫자 후보: 레이아웃 등록부(landmove.layout.kinds) 형식이 area(면적)·price(공시지가 등)인 컬럼
+#   (schema 의 면적 판정과 같은 선언)
+# - 엑셀/parquet/색인 저장은 as_text() 로 문자열화, 날짜 파티션은 to_plain() → 모드와 무관하게 같은 결과 파일
+# - pyarrow 가 없으면 범주형·숫자 변환만 적용
+
+# [사용 예]
+# > set LANDMOVE_MEMORY=1  (또는 python 0.파이프라인_실행.py --low-memory)
+# from landmove.memory import compact, track
+# track()                                   # 종료 시 "[메모리] <스크립트>: 최대 ..." 출력
+# df = compact(read_table(path), label=path.name)
+
+import atexit
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow 미설치: 범주형·숫자 변환만
+    pa = None
+
+ENV_VAR = "LANDMOVE_MEMORY"
+CATEGORY_RATIO = 0.5              # 고유값 수 ≤ 값 수 × 비율 이면 범주형
+NUMBER_DTYPE = "Float64"          # 숫자로 줄인 컬럼 (as_text 가 원래 표기로 되돌릴 대상)
+
+
+def _string_dtype():
+    if pa is None:
+        return None
+    try:
+        return pd.StringDtype("pyarrow", na_value=np.nan)   # 결측 NaN, 비교 결과 bool (object 와 같은 동작)
+    except TypeError:  # pandas 2.3 이전
+        return pd.StringDtype("pyarrow_numpy")
+
+
+STRING_DTYPE = _string_dtype()
+
+
+def enabled() -> bool:
+    """LANDMOVE_MEMORY 가 비어 있지 않고 "0" 이 아니면 절감 모드"""
+    return os.environ.get(ENV_VAR, "") not in ("", "0")
+
+
+# -------------------- 변환 --------------------
+def arrow_frame(table) -> pd.DataFrame:
+    """Arrow Table/RecordBatch → DataFrame (결측은 NaN)
+    - 절감 모드: 문자열을 Arrow 문자열 그대로 (파이썬 객체를 만들지 않음)
+    """
+    if enabled() and STRING_DTYPE is not None:
+        if any(pa.types.is_null(f.type) for f in table.schema):  # 값이 모두 비어 있는 컬럼도 문자열(NaN)로
+            table = table.cast(pa.schema([f.with_type(pa.string()) if pa.types.is_null(f.type) else f
+                                          for f in table.schema]))
+        return table.to_pandas(types_mapper={pa.string(): STRING_DTYPE, pa.large_string(): STRING_DTYPE}.get)
+    df = table.to_pandas()
+    return df.mask(df.isna())  # null(None) → NaN (read_excel 과 동일)
+
+
+def arrow_strings(df: pd.DataFrame) -> pd.DataFrame:
+    """object 문자열 컬럼 → Arrow 문자열 (pyarrow 가 없으면 그대로)"""
+    if STRING_DTYPE is None:
+        return df
+    for i, t in enumerate(df.dtypes):
+        if t == object:
+            df.isetitem(i, df.iloc[:, i].astype(STRING_DTYPE))
+    return df
+
+
+def _is_text(s: pd.Series) -> bool:
+    return s.dtype == object or isinstance(s.dtype, pd.StringDtype)
+
+
+def _as_number(s: pd.Series):
+    """면적/지가 문자열 → Float64. 다시 문자열로 썼을 때 원래 값과 모두 같을 때만 (아니면 None)
+    - 판정·변환은 고유값 단위 (행마다 문자열/숫자 객체를 만들지 않음)
+    """
+    cat = s.astype("category")
+    names = pd.Series(cat.cat.categories.astype(object))
+    num = pd.to_numeric(names, errors="coerce").astype(NUMBER_DTYPE)
+    if num.isna().any() or not (as_text(num).to_numpy() == names.to_numpy()).all():
+        return None
+    codes = cat.cat.codes.to_numpy()
+    values = np.full(len(codes), np.nan)
+    has = codes >= 0
+    values[has] = num.to_numpy(dtype="float64")[codes[has]]
+    return pd.Series(pd.array(values, dtype=NUMBER_DTYPE), index=s.index, name=s.name)
+
+
+def compact(df: pd.DataFrame, label: str | None = None) -> pd.DataFrame:
+    """절감 모드면 컬럼을 작은 형식으로 바꿔 반환 (제자리 변환, 꺼져 있으면 그대로)
+    - 면적/지가 → Float64 (무손실일 때만) / 반복 많은 문자열 → category / 나머지 → Arrow 문자열
+    - label: 주면 변환 전후 표 크기 출력
+    """
+    if not enabled():
+        return df
+    from landmove.layout import AREA, PRICE, kinds  # layout → store → memory 순환 import 회피
+
+    before = frame_mb(df) if label else 0
+    col_kinds = kinds(df.columns)
+    for i, c in enumerate(df.columns):
+        s = df.iloc[:, i]
+        if not _is_text(s):
+            continue
+        if col_kinds.get(str(c)) in (AREA, PRICE):
+            num = _as_number(s)
+            if num is not None:
+                df.isetitem(i, num)
+                continue
+        n_values = int(s.count())
+        if n_values and s.nunique() <= n_values * CATEGORY_RATIO:
+            df.isetitem(i, s.astype("category"))
+        elif STRING_DTYPE is not None and s.dtype == object:
+            df.isetitem(i, s.astype(STRING_DTYPE))
+    if label:
+        print(f"[메모리] {label}: {before:,.1f}MB → {frame_mb(df):,.1f}MB ({len(df):,}행)")
+    return df
+
+
+def as_text(data):
+    """Series/DataFrame → 문자열 (결측 자리는 호출 측에서 isna 로 가림)
+    - compact 가 숫자로 줄인 컬럼(Float64)은 원래 표기로 ("33.0" → "33")
+    """
+    if isinstance(data, pd.DataFrame):
+        out = data.astype(str)
+        for i, t in enumerate(data.dtypes):
+            if t == NUMBER_DTYPE:
+                out.isetitem(i, as_text(data.iloc[:, i]))
+        return out
+    out = data.astype(str)
+    if data.dtype == NUMBER_DTYPE:
+        out = out.str.removesuffix(".0")
+    return out
+
+
+def to_plain(df: pd.DataFrame) -> pd.DataFrame:
+    """범주형/숫자(Float64)/Arrow 문자열 컬럼 → 문자열(object, 결측 NaN) — 중간 파일 형식을 모드와 무관하게"""
+    cols = [i for i, t in enumerate(df.dtypes)
+            if isinstance(t, (pd.CategoricalDtype, pd.StringDtype)) or t == NUMBER_DTYPE]
+    if not cols:
+        return df
+    df = df.copy(deep=False)
+    for i in cols:
+        s = df.iloc[:, i]
+        df.isetitem(i, as_text(s).astype(object).where(s.notna(), np.nan))
+    return df
+
+
+# -------------------- 측정 --------------------
+def frame_mb(df: pd.DataFrame) -> float:
+    """표 크기(MB, 문자열 객체 포함)"""
+    return df.memory_usage(deep=True).sum() / 2**20
+
+
+def _peak_windows() -> int | None:
+    import ctypes
+    from ctypes import wintypes
+
+    class _Counters(ctypes.Structure):
+        _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+    counters = _Counters()
+    counters.cb = ctypes.sizeof(counters)
+    kernel32 = ctypes.windll.kernel32
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    ok = ctypes.windll.psapi.GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters),
+                                                  counters.cb)
+    return counters.PeakWorkingSetSize if ok else None
+
+
+def peak_rss() -> int | None:
+    """현재 프로세스 최대 메모리(bytes). 알 수 없으면 None"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        try:
+            return _peak_windows()
+        except (AttributeError, OSError):
+            return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024   # Linux: KB
+
+
+def _report(stage: str):
+    peak = peak_rss()
+    mode = "절감 모드" if enabled() else "기본 모드"
+    shown = "알 수 없음" if peak is None else f"{peak / 2**20:,.1f}MB"
+    print(f"[메모리] {stage}: 최대 {shown} ({mode})")
+
+
+def track(stage: str | None = None):
+    """종료 시 최대 메모리 출력 등록 (stage 생략 시 스크립트 이름)"""
+    atexit.register(_report, stage or Path(sys.argv[0]).stem)
@@ -0,0 +1,142 @@
+# ==========================================
+#  공통 정규화 커널 (PNU · 지번 · 날짜 · 코드)
+# ==========================================
+
+# [목적]
+# - 행 단위 apply/map/리스트 컴프리헨션 대신 컬럼(Series) 단위로 한 번에 정규화
+# - 기존 스크립트의 digits_only / mk_pnu / make_pnu / to2digits / norm_date8 /
+#   _normalize_yyyymmdd / normalize_pnu 와 동일한 결과를 반환
+
+# [입력/출력]
+# - Series(또는 리스트)를 넣으면 같은 인덱스의 문자열 Series 반환
+# - 문자열 하나를 넣으면 문자열 하나 반환 (예: 사용자 입력 PNU)
+# - 결측(None/NaN)은 빈 문자열로 취급
+# - 범주형을 넣으면 범주(고유값)만 변환 (메모리 절감 모드: 행마다 새 문자열을 만들지 않음, 값은 동일)
+#   * 코드 정제(code_only / code2 / map_codes)는 범주형으로, digits_only / zfill 은 문자열(object)로 반환
+
+# [사용 예]
+# from landmove.normalize import make_pnu, code_only, yyyymmdd
+# df["이동전_필지코드"] = make_pnu(df["지역코드"], df["대장구분"], df["이동전_지번"])
+# df["이동전_지목"]     = code_only(df["이동전_지목"])        # "05-임야" → "05"
+# df["_YMD"]            = yyyymmdd(df["정리일자"])
+
+import numpy as np
+import pandas as pd
+
+PNU_LEN = 19  # 지역코드(10) + 대장구분(1) + 본번(4) + 부번(4)
+
+
+# -------------------- 내부 유틸 --------------------
+def _as_series(values) -> tuple[pd.Series, bool]:
+    """입력을 Series로 통일. (Series, 스칼라 입력 여부) 반환"""
+    if isinstance(values, pd.Series):
+        return values, False
+    if pd.api.types.is_list_like(values):
+        return pd.Series(list(values), dtype=object), False
+    return pd.Series([values], dtype=object), True
+
+
+def _result(s: pd.Series, scalar: bool):
+    return s.iat[0] if scalar else s
+
+
+def _text(s: pd.Series) -> pd.Series:
+    """결측은 빈 문자열, 나머지는 str 변환 (범주형은 값으로 풀어서)"""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        s = s.astype(object)
+    return s.fillna("").astype(str)
+
+
+def _per_category(fn, s: pd.Series) -> pd.Series:
+    """범주형: 범주(고유값)와 결측("")만 fn 으로 변환해 같은 모양의 범주형으로 펼침"""
+    cats = pd.Series(list(s.cat.categories) + [""], dtype=object)
+    res = pd.Categorical(fn(cats))
+    codes = s.cat.codes.to_numpy()
+    codes = np.where(codes < 0, len(cats) - 1, codes)
+    return pd.Series(pd.Categorical.from_codes(res.codes[codes], res.categories), index=s.index, name=s.name)
+
+
+# -------------------- 숫자/자릿수 --------------------
+def digits_only(values):
+    """숫자만 남기기 (예: "0407-0029" → "04070029")"""
+    s, scalar = _as_series(values)
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return _per_category(digits_only, s).astype(object)
+    return _result(_text(s).str.replace(r"\D", "", regex=True), scalar)
+
+
+def zfill(values, width: int):
+    """숫자만 남긴 뒤 width 자리로 앞쪽 0 채움"""
+    s, scalar = _as_series(values)
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return _per_category(lambda v: zfill(v, width), s).astype(object)
+    return _result(digits_only(s).str.zfill(width), scalar)
+
+
+# -------------------- PNU --------------------
+def make_pnu(region, ledger, jibun):
+    """지역코드(10) + 대장구분(1) + 지번(본번4+부번4) → 19자리 필지코드
+    - 지번은 "0407-0029" / "04070029" 형태 모두 허용
+    - 대장구분은 앞뒤 공백 제거 후 첫 글자만 사용
+    """
+    reg, scalar = _as_series(region)
+    led, _ = _as_series(ledger)
+    jbn, _ = _as_series(jibun)
+    led = _text(led).str.strip().str[:1].str.zfill(1)
+    return _result(zfill(reg, 10) + led + zfill(jbn, 8), scalar)
+
+
+def normalize_pnu(values):
+    """숫자만 남기고 19자리 zfill. 숫자가 없으면 빈 문자열"""
+    s, scalar = _as_series(values)
+    d = digits_only(s)
+    return _result(d.str.zfill(PNU_LEN).where(d != "", ""), scalar)
+
+
+# -------------------- 날짜 --------------------
+def yyyymmdd(values, strict: bool = False):
+    """날짜 문자열에서 숫자만 추출해 YYYYMMDD 반환
+    - strict=False: 8자리 이상이면 앞 8자리, 부족하면 빈 문자열
+    - strict=True : 정확히 8자리일 때만 사용, 그 외는 빈 문자열
+    """
+    s, scalar = _as_series(values)
+    d = digits_only(s)
+    n = d.str.len()
+    ok = n.eq(8) if strict else n.ge(8)
+    return _result(d.str[:8].where(ok, ""), scalar)
+
+
+# -------------------- 코드("NN-명칭") --------------------
+def code_only(values):
+    """코드+명칭("NN-명칭")에서 코드만 추출 (예: "08-대" → "08", "1 - 토지대장" → "1")
+    - "NN-" 접두가 없으면 숫자만 남김 (예: "02" → "02", "-" → "")
+    """
+    s, scalar = _as_series(values)
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return _per_category(code_only, s)
+    t = _text(s)
+    code = t.str.extract(r"^\s*(\d+)\s*-", expand=False)
+    return _result(code.fillna(digits_only(t)), scalar)
+
+
+def code2(values):
+    """코드를 2자리로 맞춤 (예: "5-군유지" → "05"). 코드가 없으면 빈 문자열"""
+    s, scalar = _as_series(values)
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return _per_category(code2, s)
+    d = code_only(s)
+    return _result(d.str.zfill(2).str[-2:].where(d != "", ""), scalar)
+
+
+def map_codes(values, mapping: dict, keep_unmapped: bool = False):
+    """명칭 → 코드 매핑. 매핑에 없으면 숫자만 남김
+    (keep_unmapped=True 면 매핑도 숫자도 없는 값은 원래 명칭(앞뒤 공백 제거) 유지)"""
+    s, scalar = _as_series(values)
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return _per_category(lambda v: map_codes(v, mapping, keep_unmapped), s)
+    t = _text(s)
+    name = t.str.strip()
+    out = name.map(mapping).fillna(digits_only(t))
+    if keep_unmapped:
+        out = out.where(out.ne(""), name)
+    return _result(out, scalar)
@@ -0,0 +1,198 @@
+# ==========================================
+#  날짜 파티션 저장(연월별 .parquet) + 기간 조회 시 파티션만 골라 읽기
+# ==========================================
+
+# [목적]
+# - 이동정리/대장 자료를 정리일자·토지이동일자 연월(YYYYMM)별 파일로 나눠 저장
+#   (파티션 안은 날짜순 정렬) → 기간 조회 때 전체 이력을 읽어 행마다 날짜를 다시 정규화하지 않음
+# - 기간 조회: 기간 안쪽 파티션은 통째로, 경계(시작/종료 월) 파티션만 이진 탐색으로 잘라 읽음
+#   * 기간외 자료가 필요할 때만 나머지 파티션을 읽음 (건수는 매니페스트에서 바로)
+# - 원본(단계 결과 .parquet/xlsx 또는 CSV 목록) 서명이 바뀌었을 때만 파티션을 다시 만듦
+
+# [저장 구조]  <이름>.parts/
+# - ym=YYYYMM.parquet : 해당 연월 행 (+ _YMD 정규화 날짜, _ROW 원래 행 번호), _YMD → _ROW 순 정렬
+# - ym=none.parquet   : 날짜가 없거나 8자리가 안 되는 행 (항상 기간외)
+# - _manifest.json    : 원본 서명, 날짜 컬럼, 파티션별 행 수
+
+# [규칙]
+# - 반환 자료는 원래 행 순서(_ROW) 그대로 → 전체를 읽어 거르던 결과와 같음
+# - pyarrow 가 없으면 파티션 없이 메모리에서 바로 분리(split_frame)
+
+# [사용 예]
+# from landmove.partition import period_split
+# in_df, out_df, n_out = period_split(P_MOVE_STATUS, "정리일자", "20250101", "20250630")
+# (CSV 원본 등 직접 만든 자료) write_partitions(df, "정리일자", parts, sig) → read_period(parts, s, e)
+
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from landmove.normalize import yyyymmdd
+from landmove.memory import enabled as memory_mode, arrow_frame, compact, to_plain
+from landmove.store import read_table, table_source
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow 미설치: 파티션 없이 메모리에서 분리
+    pa = pc = pq = None
+
+YMD_COL = "_YMD"
+ROW_COL = "_ROW"
+NONE_PART = "none"
+MANIFEST = "_manifest.json"
+
+
+def parts_dir(path: Path) -> Path:
+    """단계 결과(xlsx) 경로 → 파티션 폴더 (<이름>.parts)"""
+    return Path(path).with_suffix(".parts")
+
+
+def source_sig(paths) -> list:
+    """원본 서명: [파일명, 크기, 수정시각(ns)] 목록 (내용 해시 대신 — 매 실행 전체를 읽지 않도록)"""
+    sig = []
+    for p in paths:
+        st = Path(p).stat()
+        sig.append([Path(p).name, st.st_size, st.st_mtime_ns])
+    return sig
+
+
+def split_frame(df: pd.DataFrame, date_col: str, start: str, end: str, strict: bool = False):
+    """메모리 자료를 기간내/기간외로 분리 (복사 없이 마스크 1회). 반환: (기간내, 기간외)"""
+    ymd = yyyymmdd(df[date_col], strict=strict)
+    in_mask = ((ymd >= start) & (ymd <= end)).to_numpy()
+    return df[in_mask], df[~in_mask]
+
+
+# -------------------- 저장 --------------------
+def load_manifest(out_dir: Path) -> dict | None:
+    path = Path(out_dir) / MANIFEST
+    if not path.is_file():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def is_current(out_dir: Path, sig: list, date_col: str) -> bool:
+    """파티션이 같은 원본 서명·날짜 컬럼으로 만들어졌으면 True"""
+    meta = load_manifest(out_dir)
+    return bool(meta) and meta.get("sig") == sig and meta.get("date_col") == date_col
+
+
+def write_partitions(df: pd.DataFrame, date_col: str, out_dir: Path, sig: list, strict: bool = False) -> dict:
+    """df 를 연월 파티션으로 저장 (임시 폴더에 쓴 뒤 교체). 반환: 매니페스트"""
+    out_dir = Path(out_dir)
+    tmp_dir = out_dir.with_name(out_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+
+    df = df.reset_index(drop=True)
+    df[YMD_COL] = yyyymmdd(df[date_col], strict=strict)
+    df[ROW_COL] = np.arange(len(df), dtype=np.int64)
+    ym = df[YMD_COL].str[:6].where(df[YMD_COL].str.len().eq(8), NONE_PART)
+
+    counts = {}
+    for key, part in df.groupby(ym, sort=True):
+        part = part.sort_values([YMD_COL, ROW_COL], kind="stable")
+        pq.write_table(pa.Table.from_pandas(to_plain(part), preserve_index=False), tmp_dir / f"ym={key}.parquet")
+        counts[key] = len(part)
+    df.drop(columns=[YMD_COL, ROW_COL], inplace=True)
+
+    meta = {"sig": sig, "date_col": date_col, "strict": strict, "n_rows": len(df),
+            "columns": [str(c) for c in df.columns], "parts": counts}
+    (tmp_dir / MANIFEST).write_text(json.dumps(meta, ensure_ascii=False, indent=1), encoding="utf-8")
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(tmp_dir, out_dir)
+    print(f"[INFO] 파티션 저장: {out_dir.name} ({len(counts)}개 연월, {len(df):,}행)")
+    return meta
+
+
+def ensure_partitions(xlsx_path: Path, date_col: str, strict: bool = False) -> Path:
+    """단계 결과의 파티션이 최신인지 확인하고, 원본이 바뀌었으면 한 번 읽어 다시 만듦"""
+    src = table_source(xlsx_path)
+    out_dir = parts_dir(xlsx_path)
+    sig = source_sig([src])
+    if not is_current(out_dir, sig, date_col):
+        write_partitions(compact(read_table(xlsx_path)), date_col, out_dir, sig, strict=strict)
+    return out_dir
+
+
+# -------------------- 조회 --------------------
+def _read_part(out_dir: Path, key: str):
+    """파티션 하나 (기본: DataFrame, 절감 모드: Arrow Table 그대로 → _restore 에서 한 번에 변환)"""
+    table = pq.read_table(out_dir / f"ym={key}.parquet")
+    return table if memory_mode() else arrow_frame(table)  # null → NaN (read_table 과 동일)
+
+
+def _rows(part, lo: int, hi: int | None = None):
+    """파티션 조각의 [lo, hi) 행 (DataFrame / Arrow Table 공통)"""
+    if isinstance(part, pd.DataFrame):
+        return part.iloc[lo:hi]
+    return part.slice(lo, None if hi is None else hi - lo)
+
+
+def _restore(parts: list, columns: list[str]) -> pd.DataFrame:
+    """파티션 조각 → 원래 행 순서, 내부 컬럼 제거
+    - 절감 모드: 이어 붙이기·정렬을 Arrow 에서 한 번, 변환도 한 번 (Arrow 문자열은 단계마다 복사되므로)
+    """
+    if not parts:
+        return pd.DataFrame(columns=columns)
+    if isinstance(parts[0], pd.DataFrame):
+        df = pd.concat(parts, ignore_index=True)
+        df = df.sort_values(ROW_COL, kind="stable").drop(columns=[YMD_COL, ROW_COL])
+        return df.reset_index(drop=True)
+    table = pa.concat_tables(parts, promote_options="default")  # 값이 모두 빈 컬럼(null) 조각 포함
+    order = pc.sort_indices(table[ROW_COL])
+    table = table.drop_columns([YMD_COL, ROW_COL])
+    cols = [arrow_frame(table.select([i]).take(order)) for i in range(table.num_columns)]  # 컬럼씩 (사본 1개)
+    return pd.concat(cols, axis=1)
+
+
+def read_period(out_dir: Path, start: str, end: str, outside: bool = True):
+    """기간 [start, end] 행만 파티션에서 읽음
+    - 기간 안쪽 연월: 통째로 / 시작·종료 연월: _YMD 이진 탐색으로 잘라냄 / 나머지: 읽지 않음
+    - outside=True 면 기간외 자료도 반환 (아니면 None, 건수만)
+    - 반환: (기간내 df, 기간외 df | None, 기간외 건수)
+    """
+    out_dir = Path(out_dir)
+    meta = load_manifest(out_dir)
+    s_ym, e_ym = start[:6], end[:6]
+    ins, outs = [], []
+    n_in = 0
+    for key in meta["parts"]:
+        inner = key != NONE_PART and s_ym <= key <= e_ym
+        if not inner and not outside:
+            continue
+        part = _read_part(out_dir, key)
+        if not inner:
+            outs.append(part)
+            continue
+        if s_ym < key < e_ym:
+            ins.append(part)
+            n_in += len(part)
+            continue
+        ymd = pd.Series(part[YMD_COL])
+        lo = int(ymd.searchsorted(start, side="left"))
+        hi = int(ymd.searchsorted(end, side="right"))
+        ins.append(_rows(part, lo, hi))
+        n_in += hi - lo
+        if outside:
+            outs += [_rows(part, 0, lo), _rows(part, hi)]
+    n_out = meta["n_rows"] - n_in
+    cols = meta["columns"]
+    return _restore(ins, cols), (_restore(outs, cols) if outside else None), n_out
+
+
+def period_split(xlsx_path: Path, date_col: str, start: str, end: str,
+                 outside: bool = True, strict: bool = False):
+    """단계 결과를 기간내/기간외로 나눔 (파티션 사용, pyarrow 가 없으면 전체를 읽어 분리)
+    반환: (기간내 df, 기간외 df | None, 기간외 건수)
+    """
+    if pq is None:
+        in_df, out_df = split_frame(read_table(xlsx_path), date_col, start, end, strict=strict)
+        return in_df, (out_df if outside else None), len(out_df)
+    return read_period(ensure_partitions(xlsx_path, date_col, strict=strict), start, end, outside)
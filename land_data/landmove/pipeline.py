@@ -0,0 +1,292 @@
+# ==========================================
+#  단계 실행기: 선언형 DAG + 내용 해시 캐시
+# ==========================================
+
+# [목적]
+# - 번호 스크립트(1~11)를 단계(Stage)로 선언: 스크립트 / 입력 / 출력 / 인자
+# - 단계의 지문(fingerprint) = 스크립트·공통 모듈 코드 + 입력 파일 내용(sha256) + 인자
+#   → 직전 실행과 지문이 같고 출력이 모두 있으면 건너뜀
+# - 다른 단계의 출력을 입력으로 쓰면 선행 단계로 보고 순서를 정함
+#   서로 의존하지 않는 단계(가지)는 동시에 실행
+# - 선행 단계가 다시 돌아도 출력 내용이 같으면 후행 단계는 건너뜀
+
+# [규칙]
+# - 경로는 base_dir(예: 44250 폴더) 기준 상대경로, 실행 폴더와 무관
+# - 스크립트는 script_dir 기준 (기본 base_dir). 시군구별 작업 폴더에 같은 스크립트를 실행할 때
+#   base_dir=작업 폴더, script_dir=44250, env=시군구 설정 (landmove.district)
+# - xlsx 출력은 같은 이름의 .parquet(store.save_table)까지 함께 해시
+# - 파일 해시는 (크기, 수정시각)이 그대로면 상태 파일에 저장된 값을 재사용
+# - 상태 파일(JSON): 단계별 지문 / 파일 해시 캐시
+# - 단계 로그: <log_dir>/<단계명>.log (동시 실행 시 콘솔 출력이 섞이지 않도록)
+
+# [사용 예]
+# from landmove.pipeline import Stage, run_pipeline
+# STAGES = [
+#     Stage("1", "1.필지코드구성_토지대장.py",
+#           inputs=["1.data/in/토지(임야)기본(전체)(지방세용).csv"],
+#           outputs=["1.data/out/토지(임야)기본_필지코드추가.xlsx"]),
+#     ...
+# ]
+# run_pipeline(STAGES, BASE_DIR, jobs=4)
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from landmove.store import artifact_path
+
+LIB_DIR = Path(__file__).resolve().parent      # landmove (코드 변경 시 전체 재실행)
+STATE_FILE = ".pipeline_state.json"
+
+
+@dataclass
+class Stage:
+    """실행 단계 선언 (경로는 base_dir 기준)"""
+    name: str
+    script: str
+    inputs: list[str] = field(default_factory=list)
+    outputs: list[str] = field(default_factory=list)
+    args: list[str] = field(default_factory=list)
+    optional: bool = False  # True: 대상으로 지정했을 때만 실행 (DB 적재 등)
+
+
+# -------------------- 해시 --------------------
+class _Hasher:
+    """(크기, 수정시각) 기준 파일 해시 캐시"""
+
+    def __init__(self, cache: dict):
+        self.cache = cache
+
+    def file(self, path: Path) -> str | None:
+        if not path.is_file():
+            return None
+        st = path.stat()
+        key = str(path)
+        hit = self.cache.get(key)
+        if hit and hit[0] == st.st_size and hit[1] == st.st_mtime_ns:
+            return hit[2]
+        with open(path, "rb") as f:
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+        self.cache[key] = [st.st_size, st.st_mtime_ns, digest]
+        return digest
+
+    def artifact(self, path: Path) -> str | None:
+        """파일 + (xlsx 이면) 같은 이름 .parquet 해시"""
+        parts = [self.file(path)]
+        if path.suffix == ".xlsx":
+            parts.append(self.file(artifact_path(path)))
+        if all(p is None for p in parts):
+            return None
+        return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+
+
+def _code_files(script_dir: Path, stage: Stage) -> list[Path]:
+    lib = [p for p in sorted(LIB_DIR.glob("*.py")) if p.name != "pipeline.py"]
+    return [script_dir / stage.script] + lib
+
+
+def fingerprint(stage: Stage, base_dir: Path, hasher: _Hasher, script_dir: Path | None = None) -> str:
+    """단계 지문: 코드 + 입력 내용 + 인자"""
+    payload = {
+        "code": [hasher.file(p) for p in _code_files(script_dir or base_dir, stage)],
+        "inputs": {p: hasher.artifact(base_dir / p) for p in stage.inputs},
+        "args": stage.args,
+    }
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False, sort_keys=True).encode()).hexdigest()
+
+
+# -------------------- 그래프 --------------------
+def build_graph(stages: list[Stage]) -> dict[str, set[str]]:
+    """단계명 → 선행 단계명 집합 (출력 경로가 입력에 있으면 선행)"""
+    producer = {}
+    for st in stages:
+        for out in st.outputs:
+            if out in producer:
+                raise ValueError(f"출력 경로 중복: {out} ({producer[out]}, {st.name})")
+            producer[out] = st.name
+    deps = {st.name: {producer[p] for p in st.inputs if p in producer} - {st.name} for st in stages}
+
+    # 순환 검사
+    state = {}
+    def visit(n):
+        if state.get(n) == 1:
+            raise ValueError(f"단계 순환 의존: {n}")
+        if state.get(n) == 2:
+            return
+        state[n] = 1
+        for d in deps[n]:
+            visit(d)
+        state[n] = 2
+    for n in deps:
+        visit(n)
+    return deps
+
+
+def select_stages(stages: list[Stage], deps: dict[str, set[str]], targets: list[str] | None) -> list[Stage]:
+    """대상 단계 + 모든 선행 단계. 대상이 없으면 optional 이 아닌 전체"""
+    by_name = {st.name: st for st in stages}
+    if not targets:
+        wanted = [st.name for st in stages if not st.optional]
+    else:
+        unknown = [t for t in targets if t not in by_name]
+        if unknown:
+            raise ValueError(f"알 수 없는 단계: {unknown} (가능: {list(by_name)})")
+        wanted = list(targets)
+
+    picked = set()
+    stack = list(wanted)
+    while stack:
+        n = stack.pop()
+        if n not in picked:
+            picked.add(n)
+            stack.extend(deps[n])
+    return [st for st in stages if st.name in picked]
+
+
+# -------------------- 실행 --------------------
+def _run_script(stage: Stage, base_dir: Path, log_path: Path, script_dir: Path, extra_env: dict) -> int:
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    env = dict(os.environ, PYTHONIOENCODING="utf-8", **extra_env)
+    with open(log_path, "w", encoding="utf-8") as log:
+        proc = subprocess.run(
+            [sys.executable, str(script_dir / stage.script), *stage.args],
+            cwd=base_dir, stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT, env=env,
+        )
+    return proc.returncode
+
+
+def _log_tail(log_path: Path, n: int = 15) -> str:
+    try:
+        lines = log_path.read_text(encoding="utf-8", errors="replace").splitlines()
+    except OSError:
+        return ""
+    return "\n".join("    " + line for line in lines[-n:])
+
+
+def run_pipeline(stages: list[Stage], base_dir: Path, targets: list[str] | None = None,
+                 jobs: int | None = None, force: bool = False, dry_run: bool = False,
+                 state_path: Path | None = None, log_dir: Path | None = None,
+                 script_dir: Path | None = None, env: dict | None = None) -> bool:
+    """변경된 단계만 의존 순서대로 실행 (독립 단계는 동시 실행)
+    - force  : 지문과 무관하게 선택된 단계를 모두 실행
+    - dry_run: 실행 없이 실행/건너뜀 여부만 출력 (선행 단계가 실행될 단계는 '실행 예정')
+    - script_dir / env: 스크립트 위치(기본 base_dir) / 단계 프로세스에 추가할 환경변수
+    - 반환   : 실패 단계가 없으면 True
+    """
+    base_dir = Path(base_dir).resolve()
+    script_dir = Path(script_dir or base_dir).resolve()
+    env = env or {}
+    state_path = Path(state_path or base_dir / "1.data" / "out" / STATE_FILE)
+    log_dir = Path(log_dir or base_dir / "1.data" / "out" / "log")
+
+    state = {"stages": {}, "files": {}}
+    if state_path.exists():
+        state.update(json.loads(state_path.read_text(encoding="utf-8")))
+    hasher = _Hasher(state["files"])
+
+    deps = build_graph(stages)
+    selected = select_stages(stages, deps, targets)
+    names = {st.name for st in selected}
+    deps = {n: deps[n] & names for n in names}
+
+    def save_state():
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, state_path)
+
+    def is_fresh(st: Stage, fp: str) -> bool:
+        if force:
+            return False
+        prev = state["stages"].get(st.name, {})
+        return prev.get("fingerprint") == fp and all(hasher.artifact(base_dir / p) for p in st.outputs)
+
+    print(f"[INFO] 대상 단계: {', '.join(st.name for st in selected)}")
+
+    if dry_run:
+        dirty = set()
+        for n in _topo_order(selected, deps):
+            st = next(s for s in selected if s.name == n)
+            if deps[n] & dirty or not is_fresh(st, fingerprint(st, base_dir, hasher, script_dir)):
+                dirty.add(n)
+                print(f"  [실행 예정] {n}: {st.script} {' '.join(st.args)}")
+            else:
+                print(f"  [건너뜀]    {n}")
+        save_state()  # 해시 캐시만 갱신
+        return True
+
+    done, failed, blocked = set(), set(), set()
+    pending = {st.name: st for st in selected}
+    running = {}
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        while pending or running:
+            for n in list(pending):
+                if deps[n] & (failed | blocked):
+                    blocked.add(n)
+                    del pending[n]
+                    print(f"[중단] {n}: 선행 단계 실패")
+                    continue
+                if not deps[n] <= done:
+                    continue
+                st = pending.pop(n)
+                missing = [p for p in st.inputs if not (base_dir / p).exists()]
+                if missing:
+                    failed.add(n)
+                    print(f"[오류] {n}: 입력 파일 없음 {missing}")
+                    continue
+                fp = fingerprint(st, base_dir, hasher, script_dir)
+                if is_fresh(st, fp):
+                    done.add(n)
+                    print(f"[건너뜀] {n}: 변경 없음")
+                    continue
+                print(f"[실행] {n}: {st.script} {' '.join(st.args)}")
+                running[pool.submit(_run_script, st, base_dir, log_dir / f"{n}.log", script_dir, env)] = (st, fp)
+
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                st, fp = running.pop(fut)
+                log_path = log_dir / f"{st.name}.log"
+                try:
+                    code = fut.result()
+                except OSError as e:
+                    code = f"{type(e).__name__}: {e}"
+                lost = [p for p in st.outputs if hasher.artifact(base_dir / p) is None]
+                if code != 0 or lost:
+                    failed.add(st.name)
+                    state["stages"].pop(st.name, None)
+                    reason = f"종료코드 {code}" if code != 0 else f"출력 없음 {lost}"
+                    print(f"[실패] {st.name}: {reason} (로그: {log_path})")
+                    print(_log_tail(log_path))
+                else:
+                    done.add(st.name)
+                    state["stages"][st.name] = {"fingerprint": fp}
+                    print(f"[OK] {st.name} 완료 (로그: {log_path})")
+                save_state()
+
+    save_state()
+    if failed or blocked:
+        print(f"[결과] 실패 {sorted(failed)} / 중단 {sorted(blocked)}")
+        return False
+    print("[결과] 모든 단계 최신 상태")
+    return True
+
+
+def _topo_order(selected: list[Stage], deps: dict[str, set[str]]) -> list[str]:
+    order, seen = [], set()
+    def visit(n):
+        if n in seen:
+            return
+        seen.add(n)
+        for d in sorted(deps[n]):
+            visit(d)
+        order.append(n)
+    for st in selected:
+        visit(st.name)
+    return order
@@ -0,0 +1,198 @@
+# ==========================================
+#  PNU 역색인 (SQLite, 데이터 버전별 1회 구축)
+# ==========================================
+
+# [목적]
+# - 검색할 때마다 엑셀 전체를 다시 읽고 PNU 컬럼을 정규화·스캔하지 않도록
+#   정규화 PNU → (원본 파일, 행 번호, 컬럼) 색인을 디스크에 저장
+# - 원본별 지문(읽을 파일의 sha256 + 색인 컬럼 + 저장 형식)이 바뀐 원본만 다시 색인
+# - 매칭 행 내용도 함께 저장 → 조회 시 원본 파일을 열지 않음
+# - PNU 수천 건을 한 번에 조회(임시 테이블 JOIN), 결과는 원본별 DataFrame
+
+# [테이블]
+# - sources : 원본명, 지문, 컬럼 목록, 색인 컬럼, 행 수
+# - rows    : (원본명, 행 번호) → 행 값(JSON 배열). PNU가 하나라도 있는 행만 저장
+# - postings: (PNU, 원본명, 행 번호, 컬럼)  ← PNU 기준 정렬(기본키)
+#   * PNU 는 정수 키(landmove.pnukey, SQLite 정수)로 저장·조인 → 조회 결과에서만 19자리 문자열
+#   * 19자리 PNU 가 아닌 값(숫자 없음, 19자리 초과)은 색인하지 않음
+# - 저장 형식(INDEX_VERSION)이 바뀌면 DB 를 비우고 다시 만듦 (PRAGMA user_version)
+
+# [사용 예]
+# from landmove.pnuindex import open_index, refresh_index, lookup
+# conn = open_index(BASE_DIR / ".pnu_index.sqlite")
+# refresh_index(conn, {"이동정리현황_기간내.xlsx": path, ...}, ["이동전_필지코드", ...], loader)
+# found = lookup(conn, ["4425031524100010003", ...])   # {원본명: DataFrame}
+# rows  = fetch_rows(conn, "이동정리현황_기간내.xlsx", [0, 5, 7])
+
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from landmove.pnukey import NONE, encode, decode, to_sql, from_sql
+from landmove.store import table_source
+from landmove.memory import as_text
+
+PNU_COL = "검색_PNU"     # 조회 결과: 매칭된 (정규화) PNU
+MATCH_COL = "매칭_컬럼"  # 조회 결과: 매칭된 컬럼명(여러 개면 ", " 로 연결)
+INDEX_VERSION = 3         # 저장 형식 (2: 결측은 null, 3: PNU 정수 키). 바뀌면 전체 재색인
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    name     TEXT PRIMARY KEY,
+    digest   TEXT NOT NULL,
+    columns  TEXT NOT NULL,
+    pnu_cols TEXT NOT NULL,
+    n_rows   INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rows (
+    source TEXT NOT NULL,
+    row_id INTEGER NOT NULL,
+    data   TEXT NOT NULL,
+    PRIMARY KEY (source, row_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS postings (
+    pnu    INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    row_id INTEGER NOT NULL,
+    col    TEXT NOT NULL,
+    PRIMARY KEY (pnu, source, row_id, col)
+) WITHOUT ROWID;
+"""
+
+
+def open_index(db_path: Path) -> sqlite3.Connection:
+    """색인 DB 열기(없으면 생성)"""
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    if conn.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:  # 형식이 다르면 비우고 새로
+        conn.executescript("DROP TABLE IF EXISTS sources; DROP TABLE IF EXISTS rows; DROP TABLE IF EXISTS postings;")
+        conn.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def source_digest(path: Path, pnu_cols: list[str]) -> str:
+    """원본 지문: read_table 이 읽을 파일 내용 + 색인 대상 컬럼"""
+    h = hashlib.sha256()
+    src = table_source(path)
+    with open(src, "rb") as f:
+        h.update(hashlib.file_digest(f, "sha256").digest())
+    h.update(json.dumps([src.suffix, pnu_cols, INDEX_VERSION], ensure_ascii=False).encode())
+    return h.hexdigest()
+
+
+def _index_source(conn: sqlite3.Connection, name: str, df: pd.DataFrame, pnu_cols: list[str], digest: str):
+    cols = [c for c in pnu_cols if c in df.columns]
+    postings = []
+    row_ids = set()
+    for c in cols:
+        keys = encode(df[c])
+        pos = (keys != NONE).nonzero()[0]
+        row_ids.update(pos.tolist())
+        postings.extend(zip(to_sql(keys[pos]).tolist(), [name] * len(pos), pos.tolist(), [c] * len(pos)))
+
+    values = as_text(df).astype(object).where(df.notna(), None).to_numpy()
+    rows = [(name, i, json.dumps(values[i].tolist(), ensure_ascii=False)) for i in sorted(row_ids)]
+
+    with conn:
+        conn.execute("DELETE FROM postings WHERE source = ?", (name,))
+        conn.execute("DELETE FROM rows WHERE source = ?", (name,))
+        conn.execute("DELETE FROM sources WHERE name = ?", (name,))
+        conn.executemany("INSERT OR IGNORE INTO postings VALUES (?, ?, ?, ?)", postings)
+        conn.executemany("INSERT INTO rows VALUES (?, ?, ?)", rows)
+        conn.execute(
+            "INSERT INTO sources VALUES (?, ?, ?, ?, ?)",
+            (name, digest, json.dumps([str(c) for c in df.columns], ensure_ascii=False),
+             json.dumps(cols, ensure_ascii=False), len(df)),
+        )
+
+
+def refresh_index(conn: sqlite3.Connection, sources: dict[str, Path], pnu_cols: list[str], loader) -> list[str]:
+    """지문이 바뀐(또는 새) 원본만 다시 색인, 사라진 원본은 색인에서 제거
+    - sources: {원본명: 엑셀 경로}  (없는 파일은 제외하고 넘김)
+    - loader : 경로 → DataFrame (스크립트의 로딩 규칙을 그대로 사용)
+    - 반환   : 다시 색인한 원본명 목록
+    """
+    known = dict(conn.execute("SELECT name, digest FROM sources"))
+    rebuilt = []
+    for name, path in sources.items():
+        digest = source_digest(path, pnu_cols)
+        if known.get(name) == digest:
+            continue
+        _index_source(conn, name, loader(path), pnu_cols, digest)
+        rebuilt.append(name)
+
+    with conn:
+        for name in set(known) - set(sources):
+            conn.execute("DELETE FROM postings WHERE source = ?", (name,))
+            conn.execute("DELETE FROM rows WHERE source = ?", (name,))
+            conn.execute("DELETE FROM sources WHERE name = ?", (name,))
+    return rebuilt
+
+
+def source_info(conn: sqlite3.Connection) -> dict[str, dict]:
+    """{원본명: {"columns", "pnu_cols", "n_rows"}}"""
+    return {
+        name: {"columns": json.loads(cols), "pnu_cols": json.loads(pnu_cols), "n_rows": n}
+        for name, cols, pnu_cols, n in conn.execute("SELECT name, columns, pnu_cols, n_rows FROM sources")
+    }
+
+
+def lookup(conn: sqlite3.Connection, pnus) -> dict[str, pd.DataFrame]:
+    """PNU 목록 일괄 조회 → {원본명: 매칭 행 DataFrame}
+    - 입력 PNU는 정수 키로 (normalize_pnu 와 같은 정규화, PNU 가 아닌 값 제외)
+    - 결과 행 순서는 원본 행 순서, PNU_COL / MATCH_COL 컬럼 추가
+    - 같은 행이 여러 PNU와 매칭되면 PNU마다 한 행씩
+    """
+    keys = np.unique(encode(pd.Series(list(pnus), dtype=object)))
+    info = source_info(conn)
+
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS query_pnu (pnu INTEGER PRIMARY KEY)")
+    conn.execute("DELETE FROM query_pnu")
+    conn.executemany("INSERT INTO query_pnu VALUES (?)", [(k,) for k in to_sql(keys[keys != NONE]).tolist()])
+    cur = conn.execute(
+        """
+        SELECT p.source, p.row_id, p.pnu, group_concat(p.col, ', '), r.data
+        FROM query_pnu q
+        JOIN postings p ON p.pnu = q.pnu
+        JOIN rows r ON r.source = p.source AND r.row_id = p.row_id
+        GROUP BY p.source, p.row_id, p.pnu
+        ORDER BY p.source, p.row_id, p.pnu
+        """
+    )
+
+    grouped: dict[str, list] = {}
+    for source, row_id, pnu, cols, data in cur:
+        grouped.setdefault(source, []).append((json.loads(data), pnu, cols))
+
+    result = {}
+    for source, meta in info.items():
+        hits = grouped.get(source, [])
+        df = pd.DataFrame([h[0] for h in hits], columns=meta["columns"], dtype=object)
+        df[PNU_COL] = decode(from_sql([h[1] for h in hits]))  # 문자열은 결과에서만
+        df[MATCH_COL] = pd.Series([h[2] for h in hits], dtype=object)
+        result[source] = df
+    return result
+
+
+def fetch_rows(conn: sqlite3.Connection, source: str, row_ids) -> pd.DataFrame:
+    """원본의 지정 행(행 위치 목록)을 색인에서 꺼냄. index = 행 위치"""
+    columns = json.loads(conn.execute("SELECT columns FROM sources WHERE name = ?", (source,)).fetchone()[0])
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS query_row (row_id INTEGER PRIMARY KEY)")
+    conn.execute("DELETE FROM query_row")
+    conn.executemany("INSERT INTO query_row VALUES (?)", [(int(r),) for r in row_ids])
+    cur = conn.execute(
+        "SELECT r.row_id, r.data FROM query_row q JOIN rows r ON r.source = ? AND r.row_id = q.row_id "
+        "ORDER BY r.row_id",
+        (source,),
+    )
+    ids, data = [], []
+    for row_id, values in cur:
+        ids.append(row_id)
+        data.append(json.loads(values))
+    return pd.DataFrame(data, columns=columns, index=ids, dtype=object)
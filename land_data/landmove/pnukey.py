@@ -0,0 +1,127 @@
+# ==========================================
+#  PNU 정수 키 (19자리 PNU → uint64 하나)
+# ==========================================
+
+# [목적]
+# - 19자리 PNU 를 파이썬 문자열 객체로 들고 다니며 비교·해시·정렬하지 않도록
+#   부호 없는 64비트 정수 하나로 표현 (19자리 십진수 최댓값 < 2^64)
+# - PNU 색인(pnuindex)·연계 그래프(lineage)는 정수 키로 저장·조인, 문자열은 결과를 내보낼 때만(decode)
+# - 키 값 = PNU 숫자 그대로 → 정수 순서 = 19자리 문자열 순서, 필드는 자릿수 나눗셈으로 바로 추출
+
+# [구성]  PNU = 지역코드(10: 시군구 5 + 읍면동 3 + 리 2) + 대장구분(1) + 본번(4) + 부번(4)
+# - 시군구   = key // 10^14            (시도 2 + 시군구 3)
+# - 읍면동   = key // 10^11 % 1000
+# - 리       = key // 10^9  % 100
+# - 대장구분 = key // 10^8  % 10
+# - 본번     = key // 10^4  % 10000
+# - 부번     = key % 10000
+
+# [규칙]
+# - encode: normalize_pnu 와 같은 정규화(숫자만 남겨 19자리 zfill) 후 정수로
+#   * 숫자가 없거나 19자리를 넘는 값(PNU 아님)은 NONE
+#   * 같은 값은 한 번만 정규화 (고유값 단위, 범주형/Arrow 문자열도 그대로)
+# - NONE = 2^64-1 (19자리 PNU 로는 나올 수 없는 값) → decode 하면 빈 문자열
+# - SQLite 는 부호 있는 64비트만 저장 → to_sql / from_sql (최상위 비트 반전: 순서·같음 비교 그대로)
+
+# [사용 예]
+# from landmove.pnukey import encode, decode, fields, NONE
+# keys = encode(df["이동후_필지코드"])                 # np.uint64 배열
+# hit  = np.isin(keys, encode(["4425031524100010003"]))
+# decode(keys[:3])                                    # → ["4425031524100010003", ...]
+# fields(keys)                                        # → DataFrame(시군구, 읍면동, 리, 대장구분, 본번, 부번)
+
+import numpy as np
+import pandas as pd
+
+from landmove.normalize import PNU_LEN, normalize_pnu
+
+NONE = np.uint64(2**64 - 1)
+_SIGN = np.uint64(2**63)  # SQLite 저장용 최상위 비트
+
+
+def _pow(n: int) -> np.uint64:
+    return np.uint64(10**n)
+
+
+# -------------------- 변환 --------------------
+def encode(values):
+    """PNU(문자열 Series/리스트/하나) → uint64 키 배열 (하나를 넣으면 키 하나)"""
+    if isinstance(values, str) or not pd.api.types.is_list_like(values):
+        return encode([values])[0]
+    codes, uniq = pd.factorize(pd.Series(values) if not isinstance(values, pd.Series) else values)
+    norm = normalize_pnu(pd.Series(np.asarray(uniq, dtype=object), dtype=object))
+    ok = norm.str.len().eq(PNU_LEN).to_numpy()
+    head = norm.str[:10].where(ok, "0").astype(np.int64).to_numpy().astype(np.uint64)
+    tail = norm.str[10:].where(ok, "0").astype(np.int64).to_numpy().astype(np.uint64)
+    uniq_keys = np.where(ok, head * _pow(9) + tail, NONE)
+
+    keys = np.full(len(codes), NONE, dtype=np.uint64)
+    has = codes >= 0
+    keys[has] = uniq_keys[codes[has]]
+    return keys
+
+
+def decode(keys) -> np.ndarray:
+    """uint64 키 → 19자리 PNU 문자열 배열(object). NONE 은 빈 문자열"""
+    keys = np.asarray(keys, dtype=np.uint64)
+    text = pd.Series(keys).astype(str).str.zfill(PNU_LEN).to_numpy(dtype=object)
+    text[keys == NONE] = ""
+    return text
+
+
+def to_sql(keys) -> np.ndarray:
+    """uint64 키 → SQLite 정수(int64). 순서 보존"""
+    return (np.asarray(keys, dtype=np.uint64) ^ _SIGN).view(np.int64)
+
+
+def from_sql(values) -> np.ndarray:
+    """SQLite 정수(int64) → uint64 키"""
+    return np.asarray(values, dtype=np.int64).view(np.uint64) ^ _SIGN
+
+
+# -------------------- 필드 --------------------
+def _digits(keys, shift: int, width: int) -> np.ndarray:
+    keys = np.asarray(keys, dtype=np.uint64)
+    return ((keys // _pow(shift)) % _pow(width)).astype(np.int64)
+
+
+def sigungu(keys) -> np.ndarray:
+    """시군구 코드(5자리: 시도 2 + 시군구 3)"""
+    return _digits(keys, 14, 5)
+
+
+def eupmyeondong(keys) -> np.ndarray:
+    """읍면동 코드(3자리)"""
+    return _digits(keys, 11, 3)
+
+
+def ri(keys) -> np.ndarray:
+    """리 코드(2자리)"""
+    return _digits(keys, 9, 2)
+
+
+def ledger(keys) -> np.ndarray:
+    """대장구분(1자리)"""
+    return _digits(keys, 8, 1)
+
+
+def bonbun(keys) -> np.ndarray:
+    """본번(4자리)"""
+    return _digits(keys, 4, 4)
+
+
+def bubun(keys) -> np.ndarray:
+    """부번(4자리)"""
+    return _digits(keys, 0, 4)
+
+
+def fields(keys) -> pd.DataFrame:
+    """키 → 필드별 정수 표 (NONE 행은 의미 없는 값 — 호출 측에서 keys != NONE 으로 거름)"""
+    return pd.DataFrame({
+        "시군구": sigungu(keys),
+        "읍면동": eupmyeondong(keys),
+        "리": ri(keys),
+        "대장구분": ledger(keys),
+        "본번": bonbun(keys),
+        "부번": bubun(keys),
+    })
@@ -0,0 +1,97 @@
+# ==========================================
+#  land_move / land_his / land_own 테이블 스키마 (컬럼 타입 + 보조 인덱스)
+# ==========================================
+
+# [목적]
+# - 모든 컬럼을 VARCHAR(255)/TEXT 로 만들던 것을 컬럼 의미에 맞는 타입으로 생성
+#   * 필지코드(PNU)  : CHAR(19)
+#   * 정리일자        : CHAR(8)  (YYYYMMDD 문자열 그대로 → 기간 BETWEEN/정렬 동일, 변환 불필요)
+#   * 면적           : DECIMAL(15,2)
+#   * 그 외          : VARCHAR(255), 255자 초과 값이 있으면 TEXT
+# - 이동전/이동후 필지코드, 정리일자에 보조 인덱스 생성
+#   → PNU 이력 조회(UNION ALL, 인덱스 2개 각각 사용)가 테이블 크기와 무관하게 일정
+# - 같은 타입 선언을 SQLite 백엔드에도 사용 (CHAR/VARCHAR → TEXT, DECIMAL → NUMERIC 친화도)
+# - 컬럼 타입·면적 숫자화는 레이아웃 등록부 landmove.layout.kinds 의 형식(pnu/date8/area)으로 판정
+
+# [사용 예]
+# from landmove.schema import create_table, coerce_frame, ensure_indexes
+# df = coerce_frame(df)                                       # 면적 숫자화(빈값 → NULL)
+# create_table(st, conn, TABLE, df, replace=True)             # st: landmove.storage, conn: st.connect()
+# ensure_indexes(st, conn, TABLE)
+
+# [비고]
+# - 이미 있는 테이블의 컬럼 타입은 바꾸지 않음(인덱스만 추가). 타입을 적용하려면 테이블 재생성
+
+import pandas as pd
+
+from landmove.layout import PNU, DATE8, AREA, kinds
+from landmove.storage import q as _q
+
+_TYPES = {PNU: "CHAR(19)", DATE8: "CHAR(8)", AREA: "DECIMAL(15,2)"}  # 레이아웃 형식 → 컬럼 타입
+
+# 보조 인덱스: (인덱스명, 컬럼)
+INDEXES = [
+    ("idx_bf_pnu", "이동전_필지코드"),
+    ("idx_af_pnu", "이동후_필지코드"),
+    ("idx_cre_ymd", "정리일자"),
+]
+_PREFIX_LEN = {"이동전_필지코드": 19, "이동후_필지코드": 19, "정리일자": 8}  # TEXT 컬럼(구 테이블) 인덱스 길이
+
+
+def _max_len(series: pd.Series) -> int:
+    if not len(series):
+        return 0
+    n = series.dropna().astype(str).map(len).max()
+    return 0 if pd.isna(n) else int(n)
+
+
+def mysql_type(col: str, series: pd.Series, kind: str | None = None) -> str:
+    """컬럼명/값 → MySQL 컬럼 타입 (kind: 레이아웃 형식, 없으면 kinds([col]) 로 판정)"""
+    kind = kind or kinds([col])[col]
+    if kind in _TYPES:
+        return _TYPES[kind]
+    return "TEXT" if _max_len(series) > 255 else "VARCHAR(255)"
+
+
+def create_table(st, conn, table: str, df: pd.DataFrame, replace: bool = False, with_id: bool = False) -> bool:
+    """df 컬럼 기준 테이블 생성(mysql_type). replace=True 면 DROP 후 재생성, 아니면 없을 때만
+    - with_id: 자동 증가 id 기본키 컬럼 추가
+    - 반환: 새로 만들었으면 True
+    """
+    with conn.cursor() as cur:
+        if replace:
+            cur.execute(f"DROP TABLE IF EXISTS {_q(table)}")
+        elif st.table_exists(cur, table):
+            return False
+        cols = [st.id_column] if with_id else []
+        col_kinds = kinds(df.columns)
+        cols += [f"{_q(c)} {mysql_type(c, df[c], col_kinds[c])} NULL" for c in df.columns]
+        cur.execute(f"CREATE TABLE {_q(table)} (\n  " + ",\n  ".join(cols) + f"\n){st.table_options}")
+    return True
+
+
+def coerce_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """적재 전 값 정리: 면적 컬럼은 숫자(쉼표 제거, 빈값/비숫자 → NULL)"""
+    out = df.copy()
+    for c, kind in kinds(out.columns).items():
+        if kind == AREA:
+            s = out[c].astype("string").str.replace(",", "", regex=False).str.strip()
+            out[c] = pd.to_numeric(s, errors="coerce").astype(object).where(lambda v: v.notna(), None)
+    return out
+
+
+def ensure_indexes(st, conn, table: str) -> list[str]:
+    """INDEXES 중 테이블에 컬럼이 있고 아직 없는 인덱스만 생성. 반환: 생성한 인덱스명"""
+    with conn.cursor() as cur:
+        cols = st.columns(cur, table)  # 컬럼명 → 타입
+        existing = st.indexes(cur, table)
+        todo = [(name, col) for name, col in INDEXES if col in cols and name not in existing]
+        if todo:
+            # TEXT 컬럼(구 테이블)은 앞부분 길이 인덱스(MySQL)
+            st.add_indexes(cur, table, [
+                (name, col, _PREFIX_LEN[col] if "text" in cols[col] or "blob" in cols[col] else None)
+                for name, col in todo
+            ])
+    if todo:
+        print(f"[INFO] {table}: 인덱스 생성 {[n for n, _ in todo]}")
+    return [n for n, _ in todo]
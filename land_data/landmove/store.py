@@ -0,0 +1,122 @@
+# ==========================================
+#  단계 간 중간 산출물: Parquet(열 저장) + xlsx(사람용)
+# ==========================================
+
+# [목적]
+# - 각 단계 결과를 xlsx(사람 확인용)와 함께 같은 이름의 .parquet 로도 저장
+# - 다음 단계는 openpyxl 로 xlsx 를 다시 파싱하지 않고 .parquet 를 바로 읽음
+# - 모든 컬럼은 문자열(string)로 저장 → 선행 0 보존, 결측은 NaN 그대로
+
+# [규칙]
+# - 산출물 경로: <xlsx 경로>.with_suffix(".parquet")
+#   예) 1.data/out/이동정리현황_기간내.xlsx → 1.data/out/이동정리현황_기간내.parquet
+# - read_table(): .parquet 가 있고 xlsx 보다 오래되지 않았으면 .parquet,
+#   아니면(손으로 고친 xlsx 등) xlsx 를 dtype=str 로 읽음
+# - pyarrow 가 없으면 xlsx 만 저장/사용
+# - 메모리 절감 모드(landmove.memory, LANDMOVE_MEMORY=1): .parquet 문자열을 Arrow 문자열 그대로 읽음
+
+# [사용 예]
+# from landmove.store import save_table, read_table
+# save_table(df, OUT_DIR / "이동정리현황_기간내.xlsx", sheet_name="기간_데이터")
+# df = read_table(BASE_DIR / "이동정리현황_기간내.xlsx")
+# for chunk in iter_table(path, batch_rows=200_000): ...   # 큰 결과를 일정 메모리로 순회
+
+import os
+from itertools import chain
+from pathlib import Path
+
+import pandas as pd
+
+from landmove.excel import save_text_excel
+from landmove.memory import arrow_frame, as_text
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow 미설치: xlsx 만 사용
+    pa = pq = None
+
+WRITE_ROWS = 100_000  # .parquet 를 이 행 수씩 문자열화해 기록 (행 그룹 단위, 큰 표도 일정 메모리)
+
+
+def artifact_path(xlsx_path: Path) -> Path:
+    """xlsx 경로에 대응하는 .parquet 경로"""
+    return Path(xlsx_path).with_suffix(".parquet")
+
+
+def _text_table(df: pd.DataFrame, schema=None):
+    """모든 컬럼을 문자열(결측은 null)로 Arrow Table 변환"""
+    cols = [str(c) for c in df.columns]
+    if schema is None:
+        schema = pa.schema([(c, pa.string()) for c in cols])
+    arrays = []
+    for i in range(len(cols)):
+        s = df.iloc[:, i]
+        arrays.append(pa.array(as_text(s).where(s.notna(), None), type=pa.string()))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def _tee_parquet(data, xlsx_path: Path):
+    """DataFrame(또는 청크 반복자)을 .parquet 로 기록하면서 청크를 그대로 다시 내보냄
+    (엑셀 저장과 한 번의 순회로 처리)
+    """
+    path = artifact_path(xlsx_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    frames = iter([data]) if isinstance(data, pd.DataFrame) else iter(data)
+    first = next(frames, None)
+    if first is None:
+        first = pd.DataFrame()
+    schema = _text_table(first.iloc[:0]).schema
+    with pq.ParquetWriter(path, schema) as writer:
+        for df in chain([first], frames):
+            for lo in range(0, len(df), WRITE_ROWS):
+                writer.write_table(_text_table(df.iloc[lo:lo + WRITE_ROWS], schema))
+            yield df
+
+
+def save_table(data, xlsx_path: Path, sheet_name: str = "Sheet1", excel_path: Path | None = None) -> int:
+    """단계 결과 저장: xlsx(텍스트 서식) + .parquet
+    - excel_path: xlsx 만 다른 이름으로 저장할 때(예: 파일 잠금 대비 타임스탬프)
+    - 반환: 저장한 행 수
+    """
+    if pq is None:
+        return save_text_excel(data, excel_path or xlsx_path, sheet_name=sheet_name)
+    n_rows = save_text_excel(_tee_parquet(data, xlsx_path), excel_path or xlsx_path, sheet_name=sheet_name)
+    os.utime(artifact_path(xlsx_path))  # xlsx 보다 나중 시각으로 → read_table 이 .parquet 사용
+    return n_rows
+
+
+def table_source(xlsx_path: Path) -> Path:
+    """read_table 이 실제로 읽을 파일(.parquet 또는 xlsx)"""
+    xlsx_path = Path(xlsx_path)
+    pq_path = artifact_path(xlsx_path)
+    use_parquet = pq is not None and pq_path.exists() and (
+        not xlsx_path.exists() or pq_path.stat().st_mtime >= xlsx_path.stat().st_mtime
+    )
+    return pq_path if use_parquet else xlsx_path
+
+
+def table_columns(xlsx_path: Path) -> list[str]:
+    """단계 결과의 컬럼명만 읽음 (.parquet 는 스키마, xlsx 는 머리행)"""
+    src = table_source(xlsx_path)
+    if src.suffix == ".parquet":
+        return pq.read_schema(src).names
+    return [str(c) for c in pd.read_excel(src, dtype=str, nrows=0).columns]
+
+
+def read_table(xlsx_path: Path, columns: list[str] | None = None) -> pd.DataFrame:
+    """단계 결과 로딩: 최신 .parquet 우선, 없으면 xlsx(dtype=str)"""
+    src = table_source(xlsx_path)
+    if src.suffix == ".parquet":
+        return arrow_frame(pq.read_table(src, columns=columns))  # null → NaN (read_excel 과 동일)
+    return pd.read_excel(src, dtype=str, usecols=columns)
+
+
+def iter_table(xlsx_path: Path, batch_rows: int = 200_000, columns: list[str] | None = None):
+    """단계 결과를 batch_rows 행 단위 DataFrame 으로 순회 (.parquet 우선, xlsx 는 한 번에 읽음)"""
+    src = table_source(xlsx_path)
+    if src.suffix != ".parquet":
+        yield pd.read_excel(src, dtype=str, usecols=columns)
+        return
+    for batch in pq.ParquetFile(src).iter_batches(batch_size=batch_rows, columns=columns):
+        yield arrow_frame(batch)
@@ -0,0 +1,147 @@
+# ==========================================
+#  DB 증분 적재(upsert): 자연키 + 행 내용 해시
+# ==========================================
+
+# [목적]
+# - 매번 DELETE / DROP 후 전체 재적재하지 않고, 신규·변경 행만 기록
+#   (월 갱신 시 실제로 바뀌는 행은 수 % 수준 → 나머지 행과 인덱스는 그대로)
+# - 자연키(KEY_COLS) → row_key, 행 전체 내용 → row_hash 로 비교
+#   * 신규 키: INSERT / 해시가 다른 키: UPDATE (id 유지) / 같은 해시: 건너뜀
+# - 새 추출본에 없는 기존 행은 선택적으로 삭제표시(deleted_at = 적재 시각)
+#   * 삭제표시된 키가 다시 나타나면 되살림(deleted_at = NULL)
+
+# [테이블에 추가되는 컬럼]
+# - row_key    CHAR(32) UNIQUE  : 자연키 해시 (VARCHAR(255) 여러 개 복합 UNIQUE 는 인덱스 길이 제한 초과)
+# - row_hash   CHAR(32)         : 행 내용 해시
+# - deleted_at DATETIME NULL    : 삭제표시 시각 (조회 시 live_filter 로 제외)
+
+# [사용 예]
+# from landmove.upsert import upsert_frame
+# upsert_frame(st, conn, "land_move", df, tombstone=True, bulk=True)   # st: landmove.storage, conn: st.connect()
+
+# [비고]
+# - 전체 재적재(row_key 없는) 행이 남아 있으면 첫 증분 적재 때 한 번 정리 후 다시 적재
+# - 추출본 안에서 키가 겹치는 행은 마지막 행만 사용(건수 경고)
+# - MySQL: ON DUPLICATE KEY UPDATE / SQLite: ON CONFLICT(row_key) DO UPDATE (st.upsert_clause)
+
+import hashlib
+
+import pandas as pd
+
+from landmove.storage import q as _q
+
+# 자연키: 정리일자 + 일련번호 + 이동전/이동후 필지코드 (+ 토지이동종목)
+#  * 같은 일련번호·필지에 종목만 다른 이동(예: 지목변경/합병)이 함께 정리되는 경우가 있어 종목까지 포함
+KEY_COLS = ["정리일자", "일련번호", "이동전_필지코드", "이동후_필지코드", "토지이동종목"]
+
+KEY_COL = "row_key"
+HASH_COL = "row_hash"
+TOMBSTONE_COL = "deleted_at"
+META_COLS = [KEY_COL, HASH_COL, TOMBSTONE_COL]
+
+_SEP = "\x1f"  # 값 구분자(단위 구분 문자)
+_NULL = "\x00"
+
+
+def row_digest(df: pd.DataFrame, cols: list[str]) -> pd.Series:
+    """지정 컬럼 값을 이어 붙인 128bit 해시(hex 32자)"""
+    parts = df[cols].astype(object).where(df[cols].notna(), _NULL).astype(str)
+    joined = parts.iloc[:, 0].str.cat([parts[c] for c in cols[1:]], sep=_SEP) if len(cols) > 1 else parts.iloc[:, 0]
+    return pd.Series(
+        [hashlib.blake2b(s.encode("utf-8"), digest_size=16).hexdigest() for s in joined],
+        index=df.index, dtype=object,
+    )
+
+
+def prepare(df: pd.DataFrame, key_cols: list[str] = KEY_COLS) -> pd.DataFrame:
+    """row_key / row_hash 컬럼 추가 (추출본 안의 중복 키는 마지막 행만)"""
+    missing = [c for c in key_cols if c not in df.columns]
+    if missing:
+        raise ValueError(f"자연키 컬럼이 없습니다: {missing}")
+    data_cols = [c for c in df.columns if c not in META_COLS]
+    out = df[data_cols].copy()
+    out[KEY_COL] = row_digest(out, key_cols)
+    out[HASH_COL] = row_digest(out, data_cols)
+    dup = out.duplicated(KEY_COL, keep="last")
+    if dup.any():
+        print(f"[WARN] 자연키 중복 {int(dup.sum()):,}행 → 마지막 행만 사용 (키: {key_cols})")
+        out = out.loc[~dup]
+    return out
+
+
+def ensure_upsert_columns(st, conn, table: str):
+    """row_key / row_hash / deleted_at 컬럼과 UNIQUE 인덱스 보장, row_key 없는(전체 재적재) 행 정리"""
+    with conn.cursor() as cur:
+        existing = st.columns(cur, table)
+        if KEY_COL not in existing:
+            cur.execute(f"ALTER TABLE {_q(table)} ADD COLUMN {_q(KEY_COL)} CHAR(32) NULL")
+            st.create_index(cur, table, f"uk_{table}_row_key", KEY_COL, unique=True)
+        if HASH_COL not in existing:
+            cur.execute(f"ALTER TABLE {_q(table)} ADD COLUMN {_q(HASH_COL)} CHAR(32) NULL")
+        if TOMBSTONE_COL not in existing:
+            cur.execute(f"ALTER TABLE {_q(table)} ADD COLUMN {_q(TOMBSTONE_COL)} DATETIME NULL")
+        n = cur.execute(f"DELETE FROM {_q(table)} WHERE {_q(KEY_COL)} IS NULL")
+        if n:
+            print(f"[INFO] {table}: 전체 재적재 방식의 기존 {n:,}행 정리 (이번 1회 전체 적재)")
+
+
+def upsert_frame(st, conn, table: str, df: pd.DataFrame, key_cols: list[str] = KEY_COLS,
+                 tombstone: bool = False, bulk: bool = False) -> dict[str, int]:
+    """신규·변경 행만 기록 (+ 선택: 추출본에 없는 행 삭제표시). 커밋은 호출하는 쪽에서
+    - 반환: {"신규", "변경", "동일", "미포함", "삭제표시"} 건수
+    """
+    data = prepare(df, key_cols)
+    ensure_upsert_columns(st, conn, table)
+
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT {_q(KEY_COL)}, {_q(HASH_COL)}, {_q(TOMBSTONE_COL)} IS NOT NULL FROM {_q(table)}")
+        known = {k: (h, bool(dead)) for k, h, dead in cur.fetchall()}
+
+    prev = data[KEY_COL].map(lambda k: known.get(k, (None, False)))
+    is_new = data[KEY_COL].map(lambda k: k not in known)
+    is_changed = ~is_new & pd.Series([h != nh or dead for (h, dead), nh in zip(prev, data[HASH_COL])], index=data.index)
+    write = data.loc[is_new | is_changed]
+
+    if len(write):
+        cols = list(write.columns)
+        stage = f"_stage_{table}"
+        col_list = ", ".join(_q(c) for c in cols)
+        with conn.cursor() as cur:
+            st.create_temp_like(cur, stage, table)
+        st.load_rows(conn, stage, write, bulk=bulk)
+        with conn.cursor() as cur:
+            # WHERE 1: SQLite 에서 SELECT 뒤 ON CONFLICT 를 JOIN ... ON 으로 해석하지 않도록
+            cur.execute(
+                f"INSERT INTO {_q(table)} ({col_list}, {_q(TOMBSTONE_COL)}) "
+                f"SELECT {col_list}, NULL FROM {_q(stage)} WHERE 1 "
+                f"{st.upsert_clause(KEY_COL, cols + [TOMBSTONE_COL])}"
+            )
+            st.drop_temp(cur, stage)
+
+    live_keys = set(data[KEY_COL])
+    gone = [k for k, (_, dead) in known.items() if not dead and k not in live_keys]
+    marked = 0
+    if tombstone and gone:
+        with conn.cursor() as cur:
+            for start in range(0, len(gone), 1000):
+                keys = gone[start:start + 1000]
+                marked += cur.execute(
+                    f"UPDATE {_q(table)} SET {_q(TOMBSTONE_COL)} = CURRENT_TIMESTAMP "
+                    f"WHERE {_q(KEY_COL)} IN ({', '.join(['%s'] * len(keys))})",
+                    keys,
+                )
+
+    stats = {
+        "신규": int(is_new.sum()),
+        "변경": int(is_changed.sum()),
+        "동일": int(len(data) - len(write)),
+        "미포함": len(gone),
+        "삭제표시": marked,
+    }
+    print(f"[OK] {table} 증분 적재: " + " / ".join(f"{k} {v:,}" for k, v in stats.items()))
+    return stats
+
+
+def live_filter(st, cur, table: str, alias: str = "m") -> str:
+    """삭제표시 컬럼이 있으면 조회 조건 "AND <alias>.deleted_at IS NULL", 없으면 빈 문자열"""
+    return f"AND {alias}.{_q(TOMBSTONE_COL)} IS NULL" if TOMBSTONE_COL in st.columns(cur, table) else ""